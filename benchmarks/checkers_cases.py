@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from checkers import King, Man
+from engine import CheckersEngine
+from field import GameField
+from main import GameController
+
+from harness import Benchmark
+
+#: Figure classes by layout symbol; upper case is white, lower case is black.
+SYMBOLS = {"m": Man, "k": King}
+
+#: Representative positions, rank 8 first.
+POSITIONS = {
+    "start": [
+        ".m.m.m.m",
+        "m.m.m.m.",
+        ".m.m.m.m",
+        "........",
+        "........",
+        "M.M.M.M.",
+        ".M.M.M.M",
+        "M.M.M.M.",
+    ],
+    "middlegame": [
+        ".m.m...m",
+        "......m.",
+        ".m.m.m..",
+        "..m.....",
+        ".M.K.k..",
+        "..M.M...",
+        ".M...M.M",
+        "M...M...",
+    ],
+    "endgame": [
+        "........",
+        "......k.",
+        "........",
+        "..m.....",
+        "...K....",
+        "........",
+        ".....M..",
+        "........",
+    ],
+}
+
+#: Figure placements measured by the move generation benchmarks: (figure class, position, square).
+MOVE_CASES = [
+    (Man, "start", "c3"),
+    (Man, "middlegame", "c3"),
+    (Man, "middlegame", "b4"),
+    (King, "middlegame", "d4"),
+    (King, "endgame", "d4"),
+]
+
+
+def board_from_layout(rows: list[str]) -> GameField:
+    """Builds a board from a layout of 8 strings, rank 8 first.
+
+    Args:
+        rows (list[str]): The layout; '.' is an empty square, letters are figures from SYMBOLS.
+
+    Returns:
+        GameField: A new board with the given figures.
+    """
+    data = {col: [None] * 8 for col in "abcdefgh"}
+    for rank, line in enumerate(reversed(rows)):
+        for col, symbol in zip("abcdefgh", line):
+            if symbol == ".":
+                continue
+            color = "white" if symbol.isupper() else "black"
+            data[col][rank] = SYMBOLS[symbol.lower()](color)
+    return GameField(data)
+
+
+def build_cases() -> list[Benchmark]:
+    """Return the checkers benchmarks."""
+    cases = []
+    boards = {name: board_from_layout(rows) for name, rows in POSITIONS.items()}
+    board = boards["middlegame"]
+
+    cases.append(Benchmark("checkers.field.get_figure", lambda: board.get_figure("d4")))
+    man = Man("white")
+    cases.append(Benchmark("checkers.field.set_figure", lambda: board.set_figure("a5", man),
+                           setup=lambda: board.remove_figure("a5")))
+    board.remove_figure("a5")
+
+    for figure_class, position, square in MOVE_CASES:
+        case_board = boards[position]
+        figure = case_board.get_figure(square)
+        assert isinstance(figure, figure_class), f"{square} in {position} is not a {figure_class.__name__}"
+        cases.append(Benchmark(
+            f"checkers.get_available_moves.{figure_class.__name__}.{position}.{square}",
+            lambda figure=figure, square=square, case_board=case_board:
+                figure.get_available_moves(square, case_board),
+            quiet=True))
+
+    for position, case_board in boards.items():
+        cases.append(Benchmark(f"checkers.field.get_legal_moves.{position}",
+                               lambda case_board=case_board: case_board.get_legal_moves("white")))
+
+    for position in POSITIONS:
+        controller = GameController(boards[position])
+        cases.append(Benchmark(f"checkers.check_end_game.{position}", controller.check_end_game))
+
+    for position in ("start", "middlegame"):
+        cases.append(Benchmark(f"checkers.engine.search.depth4.{position}",
+                               lambda case_board=boards[position]:
+                                   CheckersEngine(time_limit=60, max_depth=4).search(case_board, "white")))
+
+    cases.append(Benchmark("checkers.render.print_field", board.print_field, quiet=True))
+    return cases
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from engine import ChessEngine
+from evaluation import static_exchange
+from fen import parse_fen
+from mate import MateSolver
+from mcts import rollout
+from field import GameField
+from hex_field import HexGameField
+from figures import *
+from main import GameController, Player
+from pawns import PawnHashTable, evaluate_pawn_structure
+
+from harness import Benchmark
+
+#: Figure classes by layout symbol; upper case is white, lower case is black.
+SYMBOLS = {
+    "k": King, "q": Queen, "r": Rook, "b": Bishop, "n": Knight, "p": Pawn,
+    "l": Balloon, "t": Tank, "x": PEKKA,
+}
+
+#: Representative positions, rank 8 first.
+POSITIONS = {
+    "start": [
+        "rnbqkbnr",
+        "pppppppp",
+        "........",
+        "........",
+        "........",
+        "........",
+        "PPPPPPPP",
+        "RNBQKBNR",
+    ],
+    "middlegame": [
+        "r..q.rk.",
+        "pp..bppp",
+        "..n.pn..",
+        "..pp....",
+        "...P.B..",
+        "..PBPN..",
+        "PP.N.PPP",
+        "R..QK..R",
+    ],
+    "open": [
+        "....k...",
+        "........",
+        "........",
+        "...QRBN.",
+        "...KP...",
+        "........",
+        "........",
+        "........",
+    ],
+    "author": [
+        "rlbqkbnr",
+        "ppptxppp",
+        "........",
+        "........",
+        "........",
+        "........",
+        "PPPTXPPP",
+        "RLBQKBNR",
+    ],
+    "author_middlegame": [
+        "r.bqkb.r",
+        "pp...ppp",
+        "..p.....",
+        "...tx...",
+        "..L.T...",
+        "...X....",
+        "PP...PPP",
+        "R.BQKB.R",
+    ],
+}
+
+#: Figure placements measured by the move generation benchmarks: (figure class, position, square).
+MOVE_CASES = [
+    (Pawn, "start", "e2"),
+    (Pawn, "middlegame", "d4"),
+    (Knight, "start", "g1"),
+    (Knight, "open", "g5"),
+    (Bishop, "middlegame", "d3"),
+    (Bishop, "open", "f5"),
+    (Rook, "middlegame", "a1"),
+    (Rook, "open", "e5"),
+    (Queen, "middlegame", "d1"),
+    (Queen, "open", "d5"),
+    (King, "middlegame", "e1"),
+    (King, "open", "d4"),
+    (Balloon, "author", "b1"),
+    (Balloon, "author_middlegame", "c4"),
+    (Tank, "author", "d2"),
+    (Tank, "author_middlegame", "e4"),
+    (PEKKA, "author", "e2"),
+    (PEKKA, "author_middlegame", "d3"),
+]
+
+
+def board_from_layout(rows: list[str]) -> GameField:
+    """Builds a board from a layout of 8 strings, rank 8 first.
+
+    Args:
+        rows (list[str]): The layout; '.' is an empty square, letters are figures from SYMBOLS.
+
+    Returns:
+        GameField: A new board with the given figures.
+    """
+    data = {col: [None] * 8 for col in "abcdefgh"}
+    for rank, line in enumerate(reversed(rows)):
+        for col, symbol in zip("abcdefgh", line):
+            if symbol == ".":
+                continue
+            color = "white" if symbol.isupper() else "black"
+            data[col][rank] = SYMBOLS[symbol.lower()](color)
+    return GameField(data)
+
+
+def build_cases() -> list[Benchmark]:
+    """Return the chess benchmarks."""
+    cases = []
+    boards = {name: board_from_layout(rows) for name, rows in POSITIONS.items()}
+    board = boards["middlegame"]
+
+    cases.append(Benchmark("chess.field.get_figure", lambda: board.get_figure("e4")))
+    knight = Knight("white")
+    cases.append(Benchmark("chess.field.set_figure", lambda: board.set_figure("a3", knight),
+                           setup=lambda: board.remove_figure("a3")))
+    board.remove_figure("a3")
+
+    for figure_class, position, square in MOVE_CASES:
+        case_board = boards[position]
+        figure = case_board.get_figure(square)
+        assert isinstance(figure, figure_class), f"{square} in {position} is not a {figure_class.__name__}"
+        cases.append(Benchmark(
+            f"chess.get_available_moves.{figure_class.__name__}.{position}.{square}",
+            lambda figure=figure, square=square, case_board=case_board:
+                figure.get_available_moves(square, case_board)))
+
+    for position in ("start", "middlegame", "author_middlegame"):
+        case_board = boards[position]
+        cases.append(Benchmark(f"chess.field.attackers_of.{position}",
+                               lambda case_board=case_board: case_board.attackers_of("e4", "black")))
+
+    cases.append(Benchmark("chess.evaluation.static_exchange.middlegame",
+                           lambda: static_exchange(board, "c5", "white")))
+
+    for position in ("start", "middlegame", "author_middlegame"):
+        controller = GameController(boards[position], (Player("white", "white"), Player("black", "black")))
+        cases.append(Benchmark(f"chess.find_dangered_figures.{position}",
+                               lambda controller=controller: controller.find_dangered_figures(controller.players[0])))
+
+    pawn_table = PawnHashTable()
+    for position in ("middlegame", "author_middlegame"):
+        case_board = boards[position]
+        cases.append(Benchmark(f"chess.pawns.evaluate_pawn_structure.{position}",
+                               lambda case_board=case_board: evaluate_pawn_structure(case_board.data)))
+        cases.append(Benchmark(f"chess.pawns.probe_hit.{position}",
+                               lambda case_board=case_board: pawn_table.probe(case_board)))
+
+    for position in ("middlegame", "author_middlegame"):
+        cases.append(Benchmark(f"chess.engine.search.depth3.{position}",
+                               lambda case_board=boards[position]:
+                                   ChessEngine(time_limit=60, max_depth=3).search(case_board, "white")))
+
+    for position in ("middlegame", "author_middlegame"):
+        raw = boards[position].snapshot().to_bytes()
+        cases.append(Benchmark(f"chess.mcts.rollout.{position}",
+                               lambda raw=raw: rollout(raw, "white", 40, 1)))
+
+    mate_board, mate_side = parse_fen("4k3/8/8/8/8/8/1R6/R3K3 w - - 0 1")
+    cases.append(Benchmark("chess.mate.solve.rook_ladder_mate2",
+                           lambda: MateSolver().solve(mate_board, mate_side, 2)))
+
+    try:
+        from nnue import NNUEEvaluator, NNUEWeights
+    except ImportError:
+        pass
+    else:
+        evaluator = NNUEEvaluator(NNUEWeights.random())
+        nnue_board = board_from_layout(POSITIONS["middlegame"])
+        evaluator.attach(nnue_board)
+        nnue_knight = nnue_board.get_figure("f3")
+        cases.append(Benchmark("chess.nnue.evaluate.middlegame", lambda: evaluator.evaluate(nnue_board, "white")))
+        cases.append(Benchmark("chess.nnue.incremental_move.middlegame",
+                               lambda: (nnue_board.remove_figure("f3"), nnue_board.set_figure("g5", nnue_knight),
+                                        nnue_board.remove_figure("g5"), nnue_board.set_figure("f3", nnue_knight))))
+
+    hex_board = HexGameField()
+    hex_board.remove_figure("f5")
+    for square in ("e1", "f3", "d1", "g1", "e4"):
+        figure = hex_board.get_figure(square)
+        cases.append(Benchmark(f"chess.hex.get_available_moves.{type(figure).__name__}.{square}",
+                               lambda figure=figure, square=square: figure.get_available_moves(square, hex_board)))
+
+    rook = board.get_figure("a1")
+    cases.append(Benchmark("chess.render.print_field", board.print_field, quiet=True))
+    cases.append(Benchmark("chess.render.print_field_with_hints",
+                           lambda: board.print_field_with_hints(rook, "a1"), quiet=True))
+    cases.append(Benchmark("chess.render.print_dangered_field",
+                           lambda: board.print_dangered_field(["c3", "d4", "f3"]), quiet=True))
+    return cases
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+
+class Benchmark:
+    """A single named micro-benchmark.
+
+    Attributes:
+        name (str): The unique benchmark name (e.g. 'chess.get_available_moves.Rook.open').
+        func (Callable[[], object]): The function to measure, called without arguments.
+        setup (Callable[[], None] | None): Optional function called before every sample.
+        quiet (bool): If True, the standard output of the function is suppressed.
+    """
+
+    def __init__(self, name: str, func: Callable[[], object], setup: Callable[[], None] = None,
+                 quiet: bool = False):
+        """Initializes a Benchmark.
+
+        Args:
+            name (str): The unique benchmark name.
+            func (Callable[[], object]): The function to measure.
+            setup (Callable[[], None], optional): A function called before every sample. Defaults to None.
+            quiet (bool, optional): Suppress the standard output of the function. Defaults to False.
+        """
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.quiet = quiet
+
+
+class BenchmarkResult:
+    """Timing samples of one benchmark.
+
+    Attributes:
+        name (str): The benchmark name.
+        number (int): How many calls were timed per sample.
+        samples (list[float]): The mean duration of one call in every sample, in seconds.
+    """
+
+    def __init__(self, name: str, number: int, samples: list[float]):
+        """Initializes a BenchmarkResult.
+
+        Args:
+            name (str): The benchmark name.
+            number (int): Calls per sample.
+            samples (list[float]): Per-call durations in seconds.
+        """
+        self.name = name
+        self.number = number
+        self.samples = samples
+
+    @property
+    def median(self) -> float:
+        """Return the median per-call duration in seconds."""
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the result."""
+        return {"number": self.number, "samples": self.samples}
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int = 15, min_time: float = 0.02) -> BenchmarkResult:
+    """Measures a benchmark.
+
+    The number of calls per sample is calibrated so that one sample takes at least min_time seconds,
+    then repeat samples are collected.
+
+    Args:
+        benchmark (Benchmark): The benchmark to run.
+        repeat (int, optional): The number of samples. Defaults to 15.
+        min_time (float, optional): The minimal duration of one sample in seconds. Defaults to 0.02.
+
+    Returns:
+        BenchmarkResult: The collected samples.
+    """
+    output = io.StringIO()
+    redirect = contextlib.redirect_stdout(output) if benchmark.quiet else contextlib.nullcontext()
+    with redirect:
+        number = 1
+        while True:
+            elapsed = _time_sample(benchmark, number)
+            if elapsed >= min_time:
+                break
+            number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+        samples = []
+        for _ in range(repeat):
+            samples.append(_time_sample(benchmark, number) / number)
+            output.seek(0)
+            output.truncate()
+    return BenchmarkResult(benchmark.name, number, samples)
+
+
+def _time_sample(benchmark: Benchmark, number: int) -> float:
+    if benchmark.setup is not None:
+        benchmark.setup()
+    func = benchmark.func
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def save_baseline(path: str, results: list[BenchmarkResult]):
+    """Writes benchmark results to a JSON baseline file.
+
+    Args:
+        path (str): The output file path.
+        results (list[BenchmarkResult]): The results to store.
+    """
+    data = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "benchmarks": {result.name: result.to_dict() for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_baseline(path: str) -> dict[str, BenchmarkResult]:
+    """Reads benchmark results from a JSON baseline file.
+
+    Args:
+        path (str): The baseline file path.
+
+    Returns:
+        dict[str, BenchmarkResult]: The stored results by benchmark name.
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return {
+        name: BenchmarkResult(name, value["number"], value["samples"])
+        for name, value in data["benchmarks"].items()
+    }
+
+
+def slowdown_p_value(baseline: list[float], current: list[float]) -> float:
+    """Return the one-sided p-value that current samples are slower than the baseline ones.
+
+    Uses the Mann-Whitney U test with the normal approximation and tie correction,
+    which makes no assumption about the shape of the timing distribution.
+
+    Args:
+        baseline (list[float]): Baseline samples.
+        current (list[float]): Current samples.
+
+    Returns:
+        float: The p-value; small values mean a significant slowdown.
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / variance ** 0.5
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+class Comparison:
+    """Comparison of a benchmark against its baseline.
+
+    Attributes:
+        name (str): The benchmark name.
+        baseline (float): The baseline median per-call duration in seconds.
+        current (float): The current median per-call duration in seconds.
+        p_value (float): The one-sided p-value of a slowdown.
+        regression (bool): True if the slowdown is statistically significant and large enough.
+    """
+
+    def __init__(self, name: str, baseline: float, current: float, p_value: float, regression: bool):
+        """Initializes a Comparison.
+
+        Args:
+            name (str): The benchmark name.
+            baseline (float): The baseline median.
+            current (float): The current median.
+            p_value (float): The slowdown p-value.
+            regression (bool): Whether the slowdown is flagged.
+        """
+        self.name = name
+        self.baseline = baseline
+        self.current = current
+        self.p_value = p_value
+        self.regression = regression
+
+    @property
+    def ratio(self) -> float:
+        """Return the current median divided by the baseline median."""
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def compare(baseline: dict[str, BenchmarkResult], results: list[BenchmarkResult],
+            alpha: float = 0.01, min_change: float = 0.05) -> list[Comparison]:
+    """Compares benchmark results against a baseline.
+
+    A benchmark is flagged as a regression if the slowdown is significant at level alpha
+    and the median is at least min_change slower, so tiny but consistent differences are ignored.
+
+    Args:
+        baseline (dict[str, BenchmarkResult]): The baseline results by name.
+        results (list[BenchmarkResult]): The current results.
+        alpha (float, optional): The significance level. Defaults to 0.01.
+        min_change (float, optional): The minimal relative slowdown to flag. Defaults to 0.05.
+
+    Returns:
+        list[Comparison]: Comparisons for benchmarks present in both sets.
+    """
+    comparisons = []
+    for result in results:
+        old = baseline.get(result.name)
+        if old is None:
+            continue
+        p_value = slowdown_p_value(old.samples, result.samples)
+        regression = p_value < alpha and result.median > old.median * (1 + min_change)
+        comparisons.append(Comparison(result.name, old.median, result.median, p_value, regression))
+    return comparisons
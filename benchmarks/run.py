@@ -0,0 +1,98 @@
+"""Runs the micro-benchmark suite.
+
+Usage:
+    python benchmarks/run.py                                  # run and print the timings
+    python benchmarks/run.py --save benchmarks/baseline.json  # store a new baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json
+
+In comparison mode the exit code is 1 if any benchmark became significantly slower.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+
+from harness import Benchmark, compare, load_baseline, run_benchmark, save_baseline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Benchmark suites: suite name -> (game directory, cases module).
+SUITES = {
+    "chess": (os.path.join(ROOT, "chess"), "chess_cases"),
+    "checkers": (os.path.join(ROOT, "checkers"), "checkers_cases"),
+}
+
+
+def load_suite(game_dir: str, module_name: str) -> list[Benchmark]:
+    """Imports a cases module with the game directory on the import path.
+
+    The chess and checkers games both use top-level modules named 'field' and 'main',
+    so the modules of one game are removed from sys.modules before the next game is loaded.
+
+    Args:
+        game_dir (str): The directory of the game sources.
+        module_name (str): The name of the cases module.
+
+    Returns:
+        list[Benchmark]: The benchmarks of the suite.
+    """
+    sys.path.insert(0, game_dir)
+    try:
+        return importlib.import_module(module_name).build_cases()
+    finally:
+        sys.path.remove(game_dir)
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None) or ""
+            if name == module_name or path.startswith(game_dir + os.sep):
+                del sys.modules[name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Chess and checkers micro-benchmarks.")
+    parser.add_argument("--suite", choices=sorted(SUITES), action="append",
+                        help="suite to run (repeatable); all suites by default")
+    parser.add_argument("--filter", default="", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=15, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.02, help="minimal duration of one sample, s")
+    parser.add_argument("--save", metavar="PATH", help="write the results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results against a JSON baseline")
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level of the comparison")
+    parser.add_argument("--min-change", type=float, default=0.05,
+                        help="minimal relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    benchmarks = []
+    for suite in args.suite or sorted(SUITES):
+        benchmarks.extend(load_suite(*SUITES[suite]))
+    benchmarks = [benchmark for benchmark in benchmarks if args.filter in benchmark.name]
+
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, args.repeat, args.min_time)
+        results.append(result)
+        print(f"{result.name:<65}{result.median * 1e6:>12.2f} us")
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        comparisons = compare(load_baseline(args.compare), results, args.alpha, args.min_change)
+        print()
+        print(f"{'benchmark':<65}{'baseline, us':>14}{'current, us':>14}{'ratio':>8}{'p':>8}")
+        for comparison in comparisons:
+            mark = "  SLOWER" if comparison.regression else ""
+            print(f"{comparison.name:<65}{comparison.baseline * 1e6:>14.2f}{comparison.current * 1e6:>14.2f}"
+                  f"{comparison.ratio:>8.2f}{comparison.p_value:>8.3f}{mark}")
+        regressions = [comparison for comparison in comparisons if comparison.regression]
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) became significantly slower.")
+            return 1
+        print("\nNo significant slowdowns.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
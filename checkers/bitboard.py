@@ -0,0 +1,248 @@
+from __future__ import annotations
+from typing import Literal
+
+# The 32 dark squares are numbered row by row from white's side: index = row * 4 + col // 2,
+# so a1 = 0, c1 = 1, e1 = 2, g1 = 3, b2 = 4, ..., h8 = 31. A set of squares is an int with one bit per index.
+
+#: Square names by index.
+SQUARE_NAMES = [f"{'abcdefgh'[2 * (index % 4) + (index // 4) % 2]}{index // 4 + 1}" for index in range(32)]
+
+#: Square indices by name.
+SQUARE_INDEX = {name: index for index, name in enumerate(SQUARE_NAMES)}
+
+#: Single-bit square sets by column and row index; light squares map to 0.
+SQUARE_BITS = {col: [0] * 8 for col in "abcdefgh"}
+for _name, _index in SQUARE_INDEX.items():
+    SQUARE_BITS[_name[0]][int(_name[1]) - 1] = 1 << _index
+
+FULL = (1 << 32) - 1
+EVEN_ROWS = sum(0xF << (row * 4) for row in range(0, 8, 2))
+ODD_ROWS = sum(0xF << (row * 4) for row in range(1, 8, 2))
+LEFT_EDGE = sum(1 << (row * 4) for row in range(0, 8, 2))
+RIGHT_EDGE = sum(1 << (row * 4 + 3) for row in range(1, 8, 2))
+FIRST_ROW = 0xF
+LAST_ROW = 0xF << 28
+
+#: The row a man of each color is promoted on.
+PROMOTION_ROW = {"white": LAST_ROW, "black": FIRST_ROW}
+
+
+def up_left(squares: int) -> int:
+    """Return the squares one step up and to the left of the given squares."""
+    return (((squares & EVEN_ROWS & ~LEFT_EDGE) << 3) | ((squares & ODD_ROWS) << 4)) & FULL
+
+
+def up_right(squares: int) -> int:
+    """Return the squares one step up and to the right of the given squares."""
+    return (((squares & EVEN_ROWS) << 4) | ((squares & ODD_ROWS & ~RIGHT_EDGE) << 5)) & FULL
+
+
+def down_left(squares: int) -> int:
+    """Return the squares one step down and to the left of the given squares."""
+    return ((squares & EVEN_ROWS & ~LEFT_EDGE) >> 5) | ((squares & ODD_ROWS) >> 4)
+
+
+def down_right(squares: int) -> int:
+    """Return the squares one step down and to the right of the given squares."""
+    return ((squares & EVEN_ROWS) >> 4) | ((squares & ODD_ROWS & ~RIGHT_EDGE) >> 3)
+
+
+#: Each direction together with its opposite.
+DIRECTIONS = ((up_left, down_right), (up_right, down_left), (down_left, up_right), (down_right, up_left))
+
+#: Forward directions of a man of each color.
+MAN_DIRECTIONS = {"white": DIRECTIONS[:2], "black": DIRECTIONS[2:]}
+
+
+def bit_index(bit: int) -> int:
+    """Return the square index of a single-bit square set."""
+    return bit.bit_length() - 1
+
+
+def iter_bits(squares: int):
+    """Yield the single-bit sets of all squares in a square set, lowest index first."""
+    while squares:
+        bit = squares & -squares
+        yield bit
+        squares ^= bit
+
+
+class BitMove:
+    """A complete checkers move: a step or a whole capture sequence.
+
+    Attributes:
+        path (tuple[int, ...]): Square indices visited by the moving piece, from start to end.
+        captured (int): The set of captured squares.
+        promotes (bool): True if a man becomes a king during the move.
+    """
+
+    __slots__ = ("path", "captured", "promotes")
+
+    def __init__(self, path: tuple[int, ...], captured: int = 0, promotes: bool = False):
+        """Initializes a BitMove.
+
+        Args:
+            path (tuple[int, ...]): Square indices visited by the moving piece.
+            captured (int, optional): The set of captured squares. Defaults to 0.
+            promotes (bool, optional): Whether the man is promoted. Defaults to False.
+        """
+        self.path = path
+        self.captured = captured
+        self.promotes = promotes
+
+    @property
+    def start(self) -> str:
+        """Return the starting square name."""
+        return SQUARE_NAMES[self.path[0]]
+
+    @property
+    def end(self) -> str:
+        """Return the final square name."""
+        return SQUARE_NAMES[self.path[-1]]
+
+    @property
+    def captured_squares(self) -> list[str]:
+        """Return the names of the captured squares."""
+        return [SQUARE_NAMES[bit_index(bit)] for bit in iter_bits(self.captured)]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitMove):
+            return NotImplemented
+        return self.path == other.path and self.captured == other.captured
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.captured))
+
+    def __repr__(self) -> str:
+        separator = ":" if self.captured else "-"
+        return separator.join(SQUARE_NAMES[index] for index in self.path)
+
+
+def generate_moves(men: int, kings: int, opponents: int, color: Literal["black", "white"],
+                   sources: int = FULL) -> list[BitMove]:
+    """Generate all legal moves of a side.
+
+    Captures are mandatory: if any capture exists, only complete capture sequences are returned.
+    During a sequence captured pieces stay on the board until the move is over, so they cannot be
+    jumped twice. A man reaching the promotion row becomes a king and continues capturing as one.
+
+    Args:
+        men (int): The set of squares with the side's men.
+        kings (int): The set of squares with the side's kings.
+        opponents (int): The set of squares with opponent pieces.
+        color (Literal["black", "white"]): The color of the side to move.
+        sources (int, optional): Generate only moves of pieces on these squares. Mandatory captures
+            still take every piece of the side into account. Defaults to all squares.
+
+    Returns:
+        list[BitMove]: The legal moves.
+    """
+    empty = ~(men | kings | opponents) & FULL
+    man_directions = MAN_DIRECTIONS[color]
+    promotion_row = PROMOTION_ROW[color]
+    jumping_men = _jumpers(men, man_directions, opponents, empty)
+    jumping_kings = _jumpers(kings, DIRECTIONS, opponents, empty)
+    if jumping_men | jumping_kings:
+        captures = []
+        jumping_men &= sources
+        jumping_kings &= sources
+        for bit in iter_bits(jumping_men):
+            _extend_capture(bit, False, False, man_directions, promotion_row, opponents, empty | bit, 0,
+                            (bit_index(bit),), captures)
+        for bit in iter_bits(jumping_kings):
+            _extend_capture(bit, True, False, DIRECTIONS, promotion_row, opponents, empty | bit, 0,
+                            (bit_index(bit),), captures)
+        return captures
+
+    moves = []
+    men &= sources
+    kings &= sources
+    for step, back in man_directions:
+        for bit in iter_bits(step(men) & empty):
+            moves.append(BitMove((bit_index(back(bit)), bit_index(bit)), promotes=bool(bit & promotion_row)))
+    for step, back in DIRECTIONS:
+        for bit in iter_bits(step(kings) & empty):
+            moves.append(BitMove((bit_index(back(bit)), bit_index(bit))))
+    return moves
+
+
+def has_capture(men: int, kings: int, opponents: int, color: Literal["black", "white"]) -> bool:
+    """Check whether a side has any capture available, using set-wise shifts only.
+
+    Args:
+        men (int): The set of squares with the side's men.
+        kings (int): The set of squares with the side's kings.
+        opponents (int): The set of squares with opponent pieces.
+        color (Literal["black", "white"]): The color of the side.
+
+    Returns:
+        bool: True if at least one capture exists.
+    """
+    return bool(capturing_pieces(men, kings, opponents, color))
+
+
+def capturing_pieces(men: int, kings: int, opponents: int, color: Literal["black", "white"]) -> int:
+    """Return the set of a side's pieces that have a capture available.
+
+    Args:
+        men (int): The set of squares with the side's men.
+        kings (int): The set of squares with the side's kings.
+        opponents (int): The set of squares with opponent pieces.
+        color (Literal["black", "white"]): The color of the side.
+
+    Returns:
+        int: The set of squares of pieces that can capture.
+    """
+    empty = ~(men | kings | opponents) & FULL
+    return _jumpers(men, MAN_DIRECTIONS[color], opponents, empty) | _jumpers(kings, DIRECTIONS, opponents, empty)
+
+
+def has_step(men: int, kings: int, empty: int, color: Literal["black", "white"]) -> bool:
+    """Check whether a side has any non-capturing step, using set-wise shifts only.
+
+    Args:
+        men (int): The set of squares with the side's men.
+        kings (int): The set of squares with the side's kings.
+        empty (int): The set of empty squares.
+        color (Literal["black", "white"]): The color of the side.
+
+    Returns:
+        bool: True if at least one piece can step.
+    """
+    for step, _ in MAN_DIRECTIONS[color]:
+        if step(men) & empty:
+            return True
+    for step, _ in DIRECTIONS:
+        if step(kings) & empty:
+            return True
+    return False
+
+
+def _jumpers(pieces: int, directions: tuple, opponents: int, empty: int) -> int:
+    result = 0
+    for step, back in directions:
+        # Landing squares, walked back over a victim to the jumping piece.
+        landing = step(step(pieces) & opponents) & empty
+        result |= back(back(landing) & opponents) & pieces
+    return result
+
+
+def _extend_capture(bit: int, is_king: bool, promotes: bool, directions: tuple, promotion_row: int,
+                    opponents: int, empty: int, captured: int, path: tuple[int, ...], result: list[BitMove]):
+    extended = False
+    for step, _ in directions:
+        victim = step(bit) & opponents & ~captured
+        if not victim:
+            continue
+        landing = step(victim) & empty
+        if not landing:
+            continue
+        extended = True
+        if not is_king and landing & promotion_row:
+            _extend_capture(landing, True, True, DIRECTIONS, promotion_row, opponents, empty | bit,
+                            captured | victim, path + (bit_index(landing),), result)
+        else:
+            _extend_capture(landing, is_king, promotes, directions, promotion_row, opponents, empty | bit,
+                            captured | victim, path + (bit_index(landing),), result)
+    if not extended and captured:
+        result.append(BitMove(path, captured, promotes))
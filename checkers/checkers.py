@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Literal, TYPE_CHECKING
+from typing import Iterator, Literal, TYPE_CHECKING
 
 from abc import ABC, abstractmethod
 
@@ -45,6 +45,69 @@ class Figure(ABC):
         """
         pass
 
+    def iter_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        """Lazily yield the legal moves for the figure from the given position.
+
+        The default implementation falls back to get_available_moves.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
+
+        Yields:
+            str: The legal moves in generation order.
+        """
+        yield from self.get_available_moves(pos, board)
+
+    def has_any_move(self, pos: str, board: GameField) -> bool:
+        """Check whether the figure has at least one legal move, stopping at the first one found.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
+
+        Returns:
+            bool: True if the figure can move.
+        """
+        return next(self.iter_moves(pos, board), None) is not None
+
+    def first_capture(self, pos: str, board: GameField) -> str | None:
+        """Return the first legal capture sequence of the figure.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
+
+        Returns:
+            str | None: The final square of the capture sequence, or None if the figure cannot capture.
+        """
+        for move in board.get_legal_moves(self.color, pos):
+            if move.captured:
+                return move.end
+        return None
+
+    def count_moves(self, pos: str, board: GameField, limit: int | None = None) -> int:
+        """Count the legal moves of the figure, stopping once the limit is reached.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
+            limit (int | None, optional): Stop counting at this number. Defaults to None (count all).
+
+        Returns:
+            int: The number of legal moves, at most limit.
+        """
+        count = 0
+        for _ in self.iter_moves(pos, board):
+            count += 1
+            if count == limit:
+                break
+        return count
+
+    def _iter_board_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        # Capture sequences of different pieces may end on the same square; report every square once.
+        yield from dict.fromkeys(move.end for move in board.get_legal_moves(self.color, pos))
+
 
 class King(Figure):
     """Represents a King piece in checkers.
@@ -74,40 +137,29 @@ class King(Figure):
     def get_available_moves(self, pos: str, board: GameField) -> list:
         """Calculate the legal moves for the king from the given position.
 
-        This method determines basic diagonal moves and then validates them against the game board.
-        If an opponent's piece is encountered,
-        it checks whether the capture move is valid by ensuring the landing square is empty.
+        Moves are generated on the board bitboards: diagonal steps in any direction, or, if any piece
+        of the side can capture, the final squares of complete capture sequences.
 
         Args:
             pos (str): The current position in algebraic notation (e.g., 'a1').
             board (GameField): The game board containing piece positions.
 
         Returns:
-            list: A list of valid moves for the king, including potential capture moves.
+            list: A list of final squares of the king's legal moves.
         """
-        pos = pos.lower()
-        pos_col = ord(pos[0])
-        pos_row = int(pos[1])
-        moves = self._get_moves(pos)
+        return list(self.iter_moves(pos, board))
 
-        result = []
-        for move in moves:
-            figure = board.get_figure(move)
-            if figure is None:
-                result.append(move)
-                continue
-            else:
-                if figure.color != self.color:
-                    move_col = ord(move[0])
-                    move_row = int(move[1])
-                    col_dir = move_col - pos_col
-                    row_dir = move_row - pos_row
-                    future_pos = f"{chr(move_col + col_dir)}{move_row + row_dir}"
-                    future_move_figure = board.get_figure(future_pos)
-                    if future_move_figure is None:
-                        result.append(future_pos)
-        print(f"Available moves: {result}")
-        return result
+    def iter_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        """Lazily yield the final squares of the king's legal moves.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing piece positions.
+
+        Yields:
+            str: The legal moves in generation order.
+        """
+        return self._iter_board_moves(pos, board)
 
 
 class Man(Figure):
@@ -142,36 +194,26 @@ class Man(Figure):
     def get_available_moves(self, pos: str, board: GameField) -> list:
         """Calculate the legal moves for the man from the given position.
 
-        This method determines valid forward moves and checks for possible captures based on the board state.
-        If an opponent's piece is encountered, it validates the capture move by ensuring the landing square is empty.
+        Moves are generated on the board bitboards: forward diagonal steps, or, if any piece of the side
+        can capture, the final squares of complete capture sequences.
 
         Args:
             pos (str): The current position in algebraic notation (e.g., 'a1').
             board (GameField): The game board containing piece positions.
 
         Returns:
-            list: A list of valid moves for the man, including potential capture moves.
+            list: A list of final squares of the man's legal moves.
         """
-        pos = pos.lower()
-        pos_col = ord(pos[0])
-        pos_row = int(pos[1])
-        moves = self._get_moves(pos)
+        return list(self.iter_moves(pos, board))
 
-        result = []
-        for move in moves:
-            figure = board.get_figure(move)
-            if figure is None:
-                result.append(move)
-                continue
-            else:
-                if figure.color != self.color:
-                    move_col = ord(move[0])
-                    move_row = int(move[1])
-                    col_dir = move_col - pos_col
-                    row_dir = move_row - pos_row
-                    future_pos = f"{chr(move_col + col_dir)}{move_row + row_dir}"
-                    future_move_figure = board.get_figure(future_pos)
-                    if future_move_figure is None:
-                        result.append(future_pos)
-        print(f"Available moves: {result}")
-        return result
+    def iter_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        """Lazily yield the final squares of the man's legal moves.
+
+        Args:
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing piece positions.
+
+        Yields:
+            str: The legal moves in generation order.
+        """
+        return self._iter_board_moves(pos, board)
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import Literal, TYPE_CHECKING
+
+from bitboard import (BitMove, DIRECTIONS, FIRST_ROW, FULL, LAST_ROW, MAN_DIRECTIONS, bit_index, generate_moves,
+                      iter_bits)
+
+if TYPE_CHECKING:
+    from field import GameField
+
+#: Search state: (white men, white kings, black men, black kings).
+State = tuple[int, int, int, int]
+
+WIN_SCORE = 1_000_000
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+_ROW_MASKS = [0xF << (row * 4) for row in range(8)]
+
+_zobrist_random = random.Random(20240601)
+#: Zobrist keys by piece kind (white man, white king, black man, black king) and square.
+ZOBRIST = [[_zobrist_random.getrandbits(64) for _ in range(32)] for _ in range(4)]
+#: Zobrist key xor-ed in when black is to move.
+ZOBRIST_BLACK = _zobrist_random.getrandbits(64)
+
+
+def zobrist_hash(state: State, color: Literal["black", "white"]) -> int:
+    """Compute the Zobrist hash of a search state from scratch.
+
+    Args:
+        state (State): The bitboards of the position.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        int: The 64-bit hash.
+    """
+    key = ZOBRIST_BLACK if color == "black" else 0
+    for kind, pieces in enumerate(state):
+        for bit in iter_bits(pieces):
+            key ^= ZOBRIST[kind][bit_index(bit)]
+    return key
+
+
+def make_move(state: State, key: int, move: BitMove, color: Literal["black", "white"]) -> tuple[State, int]:
+    """Apply a move to a search state, updating the Zobrist hash incrementally.
+
+    Args:
+        state (State): The bitboards of the position.
+        key (int): The Zobrist hash of the position.
+        move (BitMove): A legal move of the side to move.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        tuple[State, int]: The new state and its hash.
+    """
+    white_men, white_kings, black_men, black_kings = state
+    start, end = move.path[0], move.path[-1]
+    start_bit, end_bit = 1 << start, 1 << end
+    if color == "white":
+        own_men, own_kings, opp_men, opp_kings, own, opp = white_men, white_kings, black_men, black_kings, 0, 2
+    else:
+        own_men, own_kings, opp_men, opp_kings, own, opp = black_men, black_kings, white_men, white_kings, 2, 0
+    if own_kings & start_bit:
+        own_kings = own_kings & ~start_bit | end_bit
+        key ^= ZOBRIST[own + 1][start] ^ ZOBRIST[own + 1][end]
+    elif move.promotes:
+        own_men &= ~start_bit
+        own_kings |= end_bit
+        key ^= ZOBRIST[own][start] ^ ZOBRIST[own + 1][end]
+    else:
+        own_men = own_men & ~start_bit | end_bit
+        key ^= ZOBRIST[own][start] ^ ZOBRIST[own][end]
+    if move.captured:
+        for bit in iter_bits(move.captured):
+            key ^= ZOBRIST[opp + 1 if opp_kings & bit else opp][bit_index(bit)]
+        opp_men &= ~move.captured
+        opp_kings &= ~move.captured
+    key ^= ZOBRIST_BLACK
+    if color == "white":
+        return (own_men, own_kings, opp_men, opp_kings), key
+    return (opp_men, opp_kings, own_men, own_kings), key
+
+
+class Evaluation:
+    """Static evaluation of a checkers position.
+
+    Attributes:
+        man (int): The value of a man.
+        king (int): The value of a king.
+        back_rank (int): Bonus for every man still guarding its own back row.
+        advancement (int): Bonus per row a man has advanced.
+        mobility (int): Bonus per available non-capturing step.
+    """
+
+    def __init__(self, man: int = 100, king: int = 170, back_rank: int = 12, advancement: int = 3,
+                 mobility: int = 4):
+        """Initializes the evaluation weights.
+
+        Args:
+            man (int, optional): The value of a man. Defaults to 100.
+            king (int, optional): The value of a king. Defaults to 170.
+            back_rank (int, optional): Back row guard bonus. Defaults to 12.
+            advancement (int, optional): Bonus per advanced row. Defaults to 3.
+            mobility (int, optional): Bonus per available step. Defaults to 4.
+        """
+        self.man = man
+        self.king = king
+        self.back_rank = back_rank
+        self.advancement = advancement
+        self.mobility = mobility
+
+    def evaluate(self, state: State, color: Literal["black", "white"]) -> int:
+        """Evaluate a position from the point of view of the side to move.
+
+        Args:
+            state (State): The bitboards of the position.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            int: The score in centi-men; positive is good for the side to move.
+        """
+        white_men, white_kings, black_men, black_kings = state
+        empty = ~(white_men | white_kings | black_men | black_kings) & FULL
+        score = (self.man * (white_men.bit_count() - black_men.bit_count())
+                 + self.king * (white_kings.bit_count() - black_kings.bit_count())
+                 + self.back_rank * ((white_men & FIRST_ROW).bit_count() - (black_men & LAST_ROW).bit_count()))
+        if self.advancement:
+            for row in range(1, 7):
+                score += self.advancement * (row * (white_men & _ROW_MASKS[row]).bit_count()
+                                             - row * (black_men & _ROW_MASKS[7 - row]).bit_count())
+        if self.mobility:
+            score += self.mobility * (self._steps(white_men, white_kings, "white", empty)
+                                      - self._steps(black_men, black_kings, "black", empty))
+        return score if color == "white" else -score
+
+    @staticmethod
+    def _steps(men: int, kings: int, color: str, empty: int) -> int:
+        count = 0
+        for step, _ in MAN_DIRECTIONS[color]:
+            count += (step(men) & empty).bit_count()
+        for step, _ in DIRECTIONS:
+            count += (step(kings) & empty).bit_count()
+        return count
+
+
+class SearchResult:
+    """The outcome of a search.
+
+    Attributes:
+        move (BitMove | None): The best move found, or None if the side has no moves.
+        score (int): The score of the move from the point of view of the side to move.
+        depth (int): The last fully searched depth.
+        nodes (int): The number of visited nodes.
+        elapsed (float): The search time in seconds.
+    """
+
+    def __init__(self, move: BitMove | None, score: int, depth: int, nodes: int, elapsed: float):
+        """Initializes a SearchResult.
+
+        Args:
+            move (BitMove | None): The best move.
+            score (int): The score of the move.
+            depth (int): The completed depth.
+            nodes (int): The visited nodes.
+            elapsed (float): The search time in seconds.
+        """
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    @property
+    def nps(self) -> float:
+        """Return the number of nodes searched per second."""
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+class _Timeout(Exception):
+    pass
+
+
+class CheckersEngine:
+    """Alpha-beta checkers player with iterative deepening and a transposition table.
+
+    One engine should be used per game: the transposition table is reused between the moves of a game,
+    and engines share no state, so many games can be played concurrently.
+
+    Attributes:
+        time_limit (float): The time budget of one search in seconds.
+        max_depth (int): The maximal search depth in plies.
+        evaluation (Evaluation): The static evaluation.
+        table_size (int): The maximal number of transposition table entries.
+    """
+
+    def __init__(self, time_limit: float = 1.0, max_depth: int = 64, evaluation: Evaluation = None,
+                 table_size: int = 1 << 20):
+        """Initializes a CheckersEngine.
+
+        Args:
+            time_limit (float, optional): The time budget of one search in seconds. Defaults to 1.
+            max_depth (int, optional): The maximal search depth in plies. Defaults to 64.
+            evaluation (Evaluation, optional): The static evaluation. Defaults to the standard weights.
+            table_size (int, optional): The maximal number of transposition table entries. Defaults to 2**20.
+        """
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.evaluation = evaluation or Evaluation()
+        self.table_size = table_size
+        self._table: dict[int, tuple[int, int, int, BitMove | None]] = {}
+        self._nodes = 0
+        self._deadline = 0.0
+
+    def choose_move(self, board: GameField, color: Literal["black", "white"]) -> BitMove | None:
+        """Search the position on the board and return the best move.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            BitMove | None: The best move, or None if the side has no legal moves.
+        """
+        return self.search(board, color).move
+
+    def search(self, board: GameField, color: Literal["black", "white"]) -> SearchResult:
+        """Search the position on the board with iterative deepening until the time budget runs out.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            SearchResult: The best move of the last completed iteration.
+        """
+        state = (board.men["white"], board.kings["white"], board.men["black"], board.kings["black"])
+        return self.search_state(state, color)
+
+    def search_state(self, state: State, color: Literal["black", "white"]) -> SearchResult:
+        """Search a position given as bitboards.
+
+        Args:
+            state (State): The bitboards of the position.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            SearchResult: The best move of the last completed iteration.
+        """
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit
+        self._nodes = 0
+        moves = self._moves(state, color)
+        if not moves:
+            return SearchResult(None, -WIN_SCORE, 0, 0, time.perf_counter() - start)
+        key = zobrist_hash(state, color)
+        best_move, best_score, completed = moves[0], 0, 0
+        if len(moves) > 1:
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    score, move = self._root(state, key, color, depth)
+                except _Timeout:
+                    break
+                best_move, best_score, completed = move, score, depth
+                if abs(score) >= WIN_SCORE - self.max_depth:
+                    break
+        return SearchResult(best_move, best_score, completed, self._nodes, time.perf_counter() - start)
+
+    def _root(self, state: State, key: int, color: str, depth: int) -> tuple[int, BitMove]:
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move = None
+        opponent = "black" if color == "white" else "white"
+        for move in self._ordered(self._moves(state, color), key):
+            child, child_key = make_move(state, key, move, color)
+            score = -self._negamax(child, child_key, opponent, depth - 1, -beta, -alpha, 1)
+            if best_move is None or score > alpha:
+                alpha, best_move = score, move
+        self._store(key, depth, alpha, _EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, state: State, key: int, color: str, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout
+
+        entry = self._table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, tt_move = entry
+            if entry_depth >= depth:
+                score = self._from_table(entry_score, ply)
+                if flag == _EXACT:
+                    return score
+                if flag == _LOWER and score >= beta:
+                    return score
+                if flag == _UPPER and score <= alpha:
+                    return score
+
+        moves = self._moves(state, color)
+        if not moves:
+            return -WIN_SCORE + ply
+        # Captures are forced, so a position with a capture pending is never evaluated statically.
+        if depth <= 0 and not moves[0].captured:
+            return self.evaluation.evaluate(state, color)
+        if depth <= 0 and ply >= self.max_depth:
+            return self.evaluation.evaluate(state, color)
+
+        original_alpha = alpha
+        best_move = None
+        best_score = -WIN_SCORE - 1
+        opponent = "black" if color == "white" else "white"
+        for move in self._ordered(moves, key, tt_move):
+            child, child_key = make_move(state, key, move, color)
+            score = -self._negamax(child, child_key, opponent, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            flag = _UPPER
+        elif best_score >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._store(key, max(depth, 0), self._to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    @staticmethod
+    def _moves(state: State, color: str) -> list[BitMove]:
+        white_men, white_kings, black_men, black_kings = state
+        if color == "white":
+            return generate_moves(white_men, white_kings, black_men | black_kings, "white")
+        return generate_moves(black_men, black_kings, white_men | white_kings, "black")
+
+    def _ordered(self, moves: list[BitMove], key: int, tt_move: BitMove = None) -> list[BitMove]:
+        if tt_move is None:
+            entry = self._table.get(key)
+            tt_move = entry[3] if entry is not None else None
+
+        def priority(move: BitMove) -> int:
+            if move == tt_move:
+                return -100
+            return -move.captured.bit_count() * 2 - move.promotes
+
+        return sorted(moves, key=priority)
+
+    def _store(self, key: int, depth: int, score: int, flag: int, move: BitMove | None):
+        if len(self._table) >= self.table_size:
+            self._table.clear()
+        self._table[key] = (depth, score, flag, move)
+
+    @staticmethod
+    def _to_table(score: int, ply: int) -> int:
+        if score > WIN_SCORE - 1000:
+            return score + ply
+        if score < -WIN_SCORE + 1000:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score: int, ply: int) -> int:
+        if score > WIN_SCORE - 1000:
+            return score - ply
+        if score < -WIN_SCORE + 1000:
+            return score + ply
+        return score
+
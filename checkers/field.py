@@ -1,4 +1,8 @@
-from checkers import Figure, Man
+from __future__ import annotations
+from typing import Iterator, Literal
+
+from bitboard import FULL, SQUARE_BITS, BitMove, capturing_pieces, generate_moves, has_step
+from checkers import Figure, Man, King
 
 
 class GameField:
@@ -7,6 +11,17 @@ class GameField:
     The board is implemented as a dictionary with keys representing columns ('a' to 'h')
     and values being lists representing the rows. The GameField class provides methods to
     initialize the board, access and modify pieces, and print the board state.
+
+    Alongside the dictionary the board keeps 32-bit bitboards of the dark squares (see bitboard.py),
+    which move generation works on.
+
+    The board also keeps the number of pieces of each color and the set of pieces of each color that have
+    a capture available, so end-of-game and mandatory-capture checks do not scan the board.
+
+    Attributes:
+        men (dict[str, int]): The set of squares with men, by color.
+        kings (dict[str, int]): The set of squares with kings, by color.
+        counts (dict[str, int]): The number of pieces, by color.
     """
 
     def __init__(self, data=None):
@@ -21,6 +36,15 @@ class GameField:
             self.data = self.initialize_field()
         else:
             self.data = data
+        self.men = {"white": 0, "black": 0}
+        self.kings = {"white": 0, "black": 0}
+        self.counts = {"white": 0, "black": 0}
+        self._captures: dict[str, int] | None = None
+        for pos, figure in self.iter_figures():
+            bit = SQUARE_BITS[pos[0]][int(pos[1]) - 1]
+            if not bit:
+                raise ValueError(f"Pieces can only stand on dark squares, got {pos}")
+            self._add_bit(bit, figure)
 
     @staticmethod
     def initialize_field():
@@ -67,6 +91,9 @@ class GameField:
         """
         col = move[0].lower()
         row = int(move[1]) - 1
+        figure = self.data[col][row]
+        if figure is not None:
+            self._remove_bit(SQUARE_BITS[col][row], figure)
         self.data[col][row] = None
 
     def set_figure(self, move: str, figure: Figure):
@@ -80,8 +107,128 @@ class GameField:
         """
         col = move[0].lower()
         row = int(move[1]) - 1
+        bit = SQUARE_BITS[col][row]
+        old_figure = self.data[col][row]
+        if old_figure is not None:
+            self._remove_bit(bit, old_figure)
+        if figure is not None:
+            if not bit:
+                raise ValueError(f"Pieces can only stand on dark squares, got {col}{row + 1}")
+            self._add_bit(bit, figure)
         self.data[col][row] = figure
 
+    def _add_bit(self, bit: int, figure: Figure):
+        if isinstance(figure, King):
+            self.kings[figure.color] |= bit
+        else:
+            self.men[figure.color] |= bit
+        self.counts[figure.color] += 1
+        self._captures = None
+
+    def _remove_bit(self, bit: int, figure: Figure):
+        if isinstance(figure, King):
+            self.kings[figure.color] &= ~bit
+        else:
+            self.men[figure.color] &= ~bit
+        self.counts[figure.color] -= 1
+        self._captures = None
+
+    def capturing_pieces(self, color: Literal["black", "white"]) -> int:
+        """Return the set of pieces of a side that have a capture available.
+
+        The sets of both colors are computed with a few bitboard shifts after the board changes and cached
+        until the next change, so a capture sequence removing several pieces is accounted for once.
+
+        Args:
+            color (Literal["black", "white"]): The color of the side.
+
+        Returns:
+            int: The set of squares (see bitboard.py) of the pieces that can capture.
+        """
+        if self._captures is None:
+            self._captures = {
+                "white": capturing_pieces(self.men["white"], self.kings["white"],
+                                          self.men["black"] | self.kings["black"], "white"),
+                "black": capturing_pieces(self.men["black"], self.kings["black"],
+                                          self.men["white"] | self.kings["white"], "black"),
+            }
+        return self._captures[color]
+
+    def has_capture(self, color: Literal["black", "white"]) -> bool:
+        """Check whether a side must capture on its move.
+
+        Args:
+            color (Literal["black", "white"]): The color of the side.
+
+        Returns:
+            bool: True if any piece of the side can capture.
+        """
+        return bool(self.capturing_pieces(color))
+
+    def has_any_move(self, color: Literal["black", "white"]) -> bool:
+        """Check whether a side has at least one legal move, without generating moves.
+
+        Args:
+            color (Literal["black", "white"]): The color of the side.
+
+        Returns:
+            bool: False if the side has no pieces or all of its pieces are blocked.
+        """
+        if not self.counts[color]:
+            return False
+        if self.capturing_pieces(color):
+            return True
+        empty = ~(self.men["white"] | self.kings["white"] | self.men["black"] | self.kings["black"]) & FULL
+        return has_step(self.men[color], self.kings[color], empty, color)
+
+    def get_legal_moves(self, color: Literal["black", "white"], pos: str = None) -> list[BitMove]:
+        """Generate the legal moves of a side, with complete capture sequences.
+
+        Captures are mandatory: if any piece of the side can capture, only capture sequences are returned,
+        so the other pieces have no legal moves.
+
+        Args:
+            color (Literal["black", "white"]): The color of the side to move.
+            pos (str, optional): Return only the moves of the piece on this position. Defaults to None (all).
+
+        Returns:
+            list[BitMove]: The legal moves.
+        """
+        opponent = "black" if color == "white" else "white"
+        sources = FULL if pos is None else SQUARE_BITS[pos[0].lower()][int(pos[1]) - 1]
+        return generate_moves(self.men[color], self.kings[color], self.men[opponent] | self.kings[opponent],
+                              color, sources)
+
+    def apply_move(self, move: BitMove):
+        """Plays a move: moves the piece, removes the captured pieces and promotes a man reaching the last row.
+
+        Args:
+            move (BitMove): A legal move for the current position.
+        """
+        figure = self.get_figure(move.start)
+        self.remove_figure(move.start)
+        for square in move.captured_squares:
+            self.remove_figure(square)
+        if move.promotes:
+            figure = King(figure.color)
+        self.set_figure(move.end, figure)
+
+    def iter_figures(self, color: Literal["black", "white"] = None) -> Iterator[tuple[str, Figure]]:
+        """Lazily yield the figures on the board with their positions.
+
+        The board must not be modified while the iterator is in use.
+
+        Args:
+            color (Literal["black", "white"], optional): Yield only figures of this color. Defaults to None (all).
+
+        Yields:
+            tuple[str, Figure]: The position in algebraic notation and the figure standing on it.
+        """
+        for col, column in self.data.items():
+            for row, figure in enumerate(column):
+                if figure is not None and (color is None or figure.color == color):
+                    yield f"{col}{row + 1}", figure
+
     def print_field(self):
         """Print the current state of the board to the console.
 
@@ -1,7 +1,9 @@
 from typing import Literal
 
+from bitboard import BitMove
 from field import GameField
-from checkers import Figure, King
+from checkers import Figure
+from engine import CheckersEngine
 
 
 class Move:
@@ -64,6 +66,25 @@ class Player:
         self.color: Literal["black", "white"] = color
 
 
+class ComputerPlayer(Player):
+    """Represents a player whose moves are chosen by a CheckersEngine.
+
+    Attributes:
+        engine (CheckersEngine): The engine searching the player's moves.
+    """
+
+    def __init__(self, name, color: Literal["black", "white"], engine: CheckersEngine = None):
+        """Initializes a new ComputerPlayer instance.
+
+        Args:
+            name (str): The name of the player.
+            color (Literal["black", "white"]): The color assigned to the player.
+            engine (CheckersEngine, optional): The engine to use. Defaults to a new CheckersEngine.
+        """
+        super().__init__(name, color)
+        self.engine = engine or CheckersEngine()
+
+
 class GameController:
     def __init__(self, game_field: GameField = None, players: tuple[Player] = None):
         """Initializes a GameController instance.
@@ -81,37 +102,30 @@ class GameController:
         """Creates players by prompting the user for their names.
 
         This method asks the user to input names for both white and black players and assigns their respective colors.
+        The black side can be played by the computer instead.
         """
         players = []
         name = input("1 игрок (белые) – назовите ваше имя: ")
         players.append(Player(name, color="white"))
-        name = input("2 игрок (чёрные) – назовите ваше имя: ")
-        players.append(Player(name, color="black"))
+        if input("Играть против компьютера? (да/нет): ").strip().lower() in ("да", "д", "y", "yes"):
+            players.append(ComputerPlayer("Компьютер", color="black"))
+        else:
+            name = input("2 игрок (чёрные) – назовите ваше имя: ")
+            players.append(Player(name, color="black"))
         self.players = players
 
-    def check_end_game(self) -> bool:
-        """True if game is ended"""
-        white = 0
-        black = 0
-        for col in range(97, 104 + 1):
-            for row in range(1, 8 + 1):
-                pos = f"{chr(col)}{row}"
-                figure = self.game_field.get_figure(pos)
-                if figure is not None:
-                    if figure.color == "white":
-                        white += 1
-                    elif figure.color == "black":
-                        black += 1
-
-                if white > 0 and black > 0:
-                    return False
-
-        if white == 0:
-            return True
-        elif black == 0:
+    def check_end_game(self, color: Literal["black", "white"] = None) -> bool:
+        """True if game is ended
+
+        The game ends when a side has no pieces left, or when the side to move cannot move.
+
+        Args:
+            color (Literal["black", "white"], optional): The side to move. Defaults to None (check piece counts only).
+        """
+        counts = self.game_field.counts
+        if not counts["white"] or not counts["black"]:
             return True
-        else:
-            return False
+        return color is not None and not self.game_field.has_any_move(color)
 
     def choose_figure(self, player: Player) -> tuple[Figure, str]:
         """Prompts the user to select a figure to move.
@@ -143,9 +157,11 @@ class GameController:
                     print("В выбранной клетка пешка противника, выберите другую клетку.")
                     result, start_pos = self.choose_figure(player)
                 else:
-                    available_moves = chosen_figure.get_available_moves(start_pos, self.game_field)
-                    if len(available_moves) == 0:
-                        print("Данная фигура не может ходить, выберите другую фигуру.")
+                    if not chosen_figure.has_any_move(start_pos, self.game_field):
+                        if self.game_field.has_capture(player.color):
+                            print("Взятие обязательно, выберите фигуру, которая может бить.")
+                        else:
+                            print("Данная фигура не может ходить, выберите другую фигуру.")
                         result, start_pos = self.choose_figure(player)
                     else:
                         result = chosen_figure
@@ -173,60 +189,53 @@ class GameController:
             end_pos = self.choose_end_pos(chosen_figure, start_pos)
         return end_pos
 
-    @staticmethod
-    def checked(start_pos: str, end_pos: str) -> bool:
-        end_col = ord(end_pos[0])
-        end_row = int(end_pos[1])
-        start_col = ord(start_pos[0])
-        start_row = int(start_pos[1])
-
-        dif_col = end_col - start_col
-        dif_row = end_row - start_row
-        if abs(dif_col) > 1 and abs(dif_row) > 1:
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def calculate_checked_pos(start_pos: str, end_pos: str):
-        end_col = ord(end_pos[0])
-        end_row = int(end_pos[1])
-        start_col = ord(start_pos[0])
-        start_row = int(start_pos[1])
-
-        dif_col = int((end_col - start_col) / 2)
-        dif_row = int((end_row - start_row) / 2)
-
-        check_col = chr(start_col + dif_col)
-        check_row = start_row + dif_row
-        return f"{check_col}{check_row}"
-
     def make_move(self, player: Player):
         """Executes a move for the given player.
 
         This method orchestrates the process of selecting a figure and its target position, updates the game board.
+        A capture sequence removes every jumped piece, and a man reaching the last row becomes a king.
+        If several capture sequences lead to the target position, the player chooses one of them.
+        A computer player's move is chosen by its engine instead of prompting.
 
         Args:
             player (Player): The player making the move.
         """
+        if isinstance(player, ComputerPlayer):
+            move = player.engine.choose_move(self.game_field, player.color)
+            print(f"Компьютер ходит {move}")
+            self.game_field.apply_move(move)
+            return
+
         chosen_figure, start_pos = self.choose_figure(player)
 
         end_pos = self.choose_end_pos(chosen_figure, start_pos)
 
-        if self.checked(start_pos, end_pos):
-            check_pos = self.calculate_checked_pos(start_pos, end_pos)
-            self.game_field.remove_figure(check_pos)
+        moves = [move for move in self.game_field.get_legal_moves(player.color, start_pos) if move.end == end_pos]
+        self.game_field.apply_move(moves[0] if len(moves) == 1 else self.choose_capture(moves))
+
+    def choose_capture(self, moves: list[BitMove]) -> BitMove:
+        """Prompts the user to choose one of several capture sequences that end on the same square.
+
+        The sequences are listed with their paths and captured pieces; the user enters the number of one.
+        If the input is not valid, the user is prompted again.
 
-        self.game_field.remove_figure(start_pos)
-        if chosen_figure.color == "black" and end_pos[1] == 1:
-            chosen_figure = King("black")
-        elif chosen_figure.color == "white" and end_pos[1] == 8:
-            chosen_figure = King("white")
+        Args:
+            moves (list[BitMove]): The legal moves from the chosen piece to the chosen square.
 
-        self.game_field.set_figure(end_pos, chosen_figure)
+        Returns:
+            BitMove: The chosen move.
+        """
+        print("На эту клетку ведут несколько путей взятия. Выберите путь:")
+        for number, move in enumerate(moves, 1):
+            print(f"{number}. {move} (бьёт {', '.join(move.captured_squares)})")
+        choice = input().strip()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(moves):
+            print("Некорректный ввод.")
+            return self.choose_capture(moves)
+        return moves[int(choice) - 1]
 
     def start_game(self):
-        """Starts and runs the checkers' game until any colored figures end.
+        """Starts and runs the checkers' game until a side loses all its pieces or cannot move.
 
         This method handles the game loop, alternating moves between players, updating the board,
         and declaring the winner when the game ends.
@@ -235,12 +244,15 @@ class GameController:
         if self.players is None:
             self._create_players()
         winner = None
-        while not self.check_end_game():
-            for player in self.players:
+        if self.check_end_game(self.players[0].color):
+            # The position is decided before the first move: white wins only if black has no pieces left.
+            winner = self.players[0] if not self.game_field.counts[self.players[1].color] else self.players[1]
+        while winner is None:
+            for index, player in enumerate(self.players):
                 self.game_field.print_field()
                 print(f"Ход {player.color}")
                 self.make_move(player)
-                if self.check_end_game():
+                if self.check_end_game(self.players[1 - index].color):
                     winner = player
                     break
         print(f"Победил {winner.name}! Пешки цвета {winner.color} оказались сильнее!")
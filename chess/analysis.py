@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal
+
+from engine import WIN_SCORE, ChessEngine, ChessMove
+from field import GameField
+from figures import *
+from snapshot import BoardSnapshot
+
+# Post-game analysis. Every position of a finished game is searched independently, so the positions are
+# spread over a process pool and the analysis of a long game scales with the number of cores. Each position
+# is searched at a fixed depth with a fresh engine, which makes the annotations reproducible regardless of
+# how the positions are distributed over the workers.
+
+#: Minimal score losses in centipawns for the annotations, from the worst.
+THRESHOLDS = ((300, "??"), (100, "?"), (50, "?!"))
+
+
+class Annotation:
+    """The verdict on one move of a game.
+
+    Attributes:
+        ply (int): The number of moves played before the move.
+        color (Literal["black", "white"]): The side that moved.
+        move (ChessMove): The move played.
+        best_move (ChessMove | None): The best move found by the engine.
+        best_score (int): The score of the best move for the side that moved.
+        played_score (int): The score of the played move for the side that moved.
+        symbol (str): '??' for a blunder, '?' for a mistake, '?!' for an inaccuracy, else ''.
+    """
+
+    def __init__(self, ply: int, color: Literal["black", "white"], move: ChessMove, best_move: ChessMove | None,
+                 best_score: int, played_score: int):
+        """Initializes an Annotation.
+
+        Args:
+            ply (int): The ply of the move.
+            color (Literal["black", "white"]): The side that moved.
+            move (ChessMove): The move played.
+            best_move (ChessMove | None): The best move.
+            best_score (int): The score of the best move.
+            played_score (int): The score of the played move.
+        """
+        self.ply = ply
+        self.color = color
+        self.move = move
+        self.best_move = best_move
+        self.best_score = best_score
+        self.played_score = played_score
+        self.symbol = next((symbol for threshold, symbol in THRESHOLDS if self.loss >= threshold), "")
+
+    @property
+    def loss(self) -> int:
+        """Return how many centipawns the played move gives away compared with the best one."""
+        return max(self.best_score - self.played_score, 0)
+
+    def __str__(self):
+        number = f"{self.ply // 2 + 1}." + ("" if self.color == "white" else "..")
+        text = f"{number} {''.join(self.move)}{self.symbol}"
+        if self.symbol and self.best_move is not None:
+            text += f" (лучше {''.join(self.best_move)}, потеря {self.loss / 100:.1f})"
+        return text
+
+
+def analyze_position(position: bytes, color: str, move: ChessMove, depth: int) -> tuple[ChessMove | None, int, int]:
+    """Searches one position of a game; runs in a worker process.
+
+    Args:
+        position (bytes): The position before the move, serialized with BoardSnapshot.to_bytes.
+        color (str): The side to move.
+        move (ChessMove): The move played.
+        depth (int): The search depth in plies.
+
+    Returns:
+        tuple[ChessMove | None, int, int]: The best move, its score and the score of the played move,
+            both for the side to move.
+    """
+    field = GameField.from_snapshot(BoardSnapshot.from_bytes(position))
+    engine = ChessEngine(max_depth=depth, table_size=1 << 16)
+    result = engine.search(field, color, infinite=True)
+    if result.move == move:
+        return result.move, result.score, result.score
+    start, end = move
+    figure = field.get_figure(start)
+    captured = field.get_figure(end)
+    if isinstance(captured, King):
+        return result.move, result.score, WIN_SCORE - 1
+    field.remove_figure(start)
+    field.set_figure(end, figure)
+    opponent = "black" if color == "white" else "white"
+    if depth > 1:
+        reply = engine.search(field, opponent, max_depth=depth - 1, infinite=True)
+        played_score = -reply.score if reply.move is not None else engine.evaluate(field, color)
+    else:
+        played_score = engine.evaluate(field, color)
+    # The played move was searched one ply shallower, so it must not look better than the best move.
+    return result.move, result.score, min(played_score, result.score)
+
+
+def annotate_game(history, depth: int = 3, workers: int = None) -> list[Annotation]:
+    """Analyzes every move of a recorded game in parallel.
+
+    Args:
+        history (MoveHistory): The game history.
+        depth (int, optional): The search depth of every position. Defaults to 3.
+        workers (int, optional): The number of processes; 0 analyzes in the calling process.
+            Defaults to the number of CPUs.
+
+    Returns:
+        list[Annotation]: One annotation per move, in game order.
+    """
+    tasks = []
+    color = "white"
+    for ply, move in enumerate(history):
+        tasks.append((history.position(ply).to_bytes(), color, (move.start_pos, move.end_pos), depth))
+        color = "black" if color == "white" else "white"
+    if workers == 0 or len(tasks) < 2:
+        results = [analyze_position(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(min(workers or os.cpu_count() or 1, len(tasks))) as pool:
+            results = list(pool.map(analyze_position, *zip(*tasks)))
+    return [Annotation(ply, task[1], task[2], *result) for ply, (task, result) in enumerate(zip(tasks, results))]
@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Callable, Literal
+
+from evaluation import type_value
+from field import GameField
+from figures import *
+from figures.definitions import SQUARE_INDEX
+from pawns import PawnHashTable
+from profiler import PROFILER
+from snapshot import BoardSnapshot
+
+#: A move: (start square, end square) in algebraic notation.
+ChessMove = tuple[str, str]
+
+WIN_SCORE = 1_000_000
+#: Scores beyond this bound mean the King is captured; WIN_SCORE - score is the number of plies to the capture.
+MATE_BOUND = WIN_SCORE - 1000
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+#: Zobrist key xor-ed in when black is to move.
+ZOBRIST_BLACK = random.Random("black-to-move").getrandbits(64)
+_zobrist_keys: dict[tuple[type, str], list[int]] = {}
+
+
+def zobrist_keys(figure_type: type, color: Literal["black", "white"]) -> list[int]:
+    """Return the Zobrist keys of a figure type and color by square index.
+
+    Keys are derived from the type name, so they do not depend on the order in which types are first seen.
+
+    Args:
+        figure_type (type): The figure class.
+        color (Literal["black", "white"]): The color of the figure.
+
+    Returns:
+        list[int]: 64 random 64-bit keys.
+    """
+    keys = _zobrist_keys.get((figure_type, color))
+    if keys is None:
+        generator = random.Random(f"{figure_type.__name__}-{color}")
+        keys = _zobrist_keys[(figure_type, color)] = [generator.getrandbits(64) for _ in range(64)]
+    return keys
+
+
+def zobrist_hash(field: GameField, color: Literal["black", "white"]) -> int:
+    """Compute the Zobrist hash of a position from scratch.
+
+    Args:
+        field (GameField): The game board.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        int: The 64-bit hash.
+    """
+    key = ZOBRIST_BLACK if color == "black" else 0
+    for pos, figure in field.iter_figures():
+        key ^= zobrist_keys(figure.__class__, figure.color)[SQUARE_INDEX[pos]]
+    return key
+
+
+class SearchResult:
+    """The outcome of a search.
+
+    Attributes:
+        move (ChessMove | None): The best move found, or None if the side has no moves.
+        score (int): The score of the move in centipawns from the point of view of the side to move.
+        depth (int): The last fully searched depth.
+        nodes (int): The number of visited nodes.
+        elapsed (float): The search time in seconds.
+        pv (list[ChessMove]): The expected line of play, starting with move.
+    """
+
+    def __init__(self, move: ChessMove | None, score: int, depth: int, nodes: int, elapsed: float,
+                 pv: list[ChessMove] = None):
+        """Initializes a SearchResult.
+
+        Args:
+            move (ChessMove | None): The best move.
+            score (int): The score of the move.
+            depth (int): The completed depth.
+            nodes (int): The visited nodes.
+            elapsed (float): The search time in seconds.
+            pv (list[ChessMove], optional): The expected line of play. Defaults to just the move.
+        """
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = pv if pv is not None else [move] if move is not None else []
+
+    @property
+    def nps(self) -> float:
+        """Return the number of nodes searched per second."""
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def ponder(self) -> ChessMove | None:
+        """Return the expected reply of the opponent, or None if it is not known."""
+        return self.pv[1] if len(self.pv) > 1 else None
+
+
+class _Timeout(Exception):
+    pass
+
+
+class ChessEngine:
+    """Alpha-beta chess player with iterative deepening, quiescence search and a transposition table.
+
+    The game ends when a King is captured, so there are no check rules: capturing the King is the win.
+    The search plays its moves on the given board and takes them back, so the board is unchanged
+    afterwards. A search can be stopped from another thread with stop().
+
+    Attributes:
+        time_limit (float): The time budget of one search in seconds.
+        max_depth (int): The maximal search depth in plies.
+        table_size (int): The maximal number of transposition table entries.
+        pawn_table (PawnHashTable): The cache of pawn structure scores.
+    """
+
+    def __init__(self, time_limit: float = 1.0, max_depth: int = 64, table_size: int = 1 << 20,
+                 pawn_table: PawnHashTable = None):
+        """Initializes a ChessEngine.
+
+        Args:
+            time_limit (float, optional): The time budget of one search in seconds. Defaults to 1.
+            max_depth (int, optional): The maximal search depth in plies. Defaults to 64.
+            table_size (int, optional): The maximal number of transposition table entries. Defaults to 2**20.
+            pawn_table (PawnHashTable, optional): The pawn structure cache. Defaults to a new one.
+        """
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.pawn_table = pawn_table or PawnHashTable()
+        self._table: dict[int, tuple[int, int, int, ChessMove | None]] = {}
+        self._nodes = 0
+        self._start = 0.0
+        self._deadline = 0.0
+        self._stop = threading.Event()
+
+    def choose_move(self, board: GameField, color: Literal["black", "white"]) -> ChessMove | None:
+        """Search the position on the board and return the best move.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            ChessMove | None: The best move, or None if the side cannot move.
+        """
+        return self.search(board, color).move
+
+    def clear(self):
+        """Forgets the transposition table and the cached pawn structures, e.g. before a new game."""
+        self._table.clear()
+        self.pawn_table.clear()
+
+    def stop(self):
+        """Makes a running search return the result of its last completed iteration as soon as possible."""
+        self._stop.set()
+
+    def ponderhit(self, time_limit: float = None):
+        """Gives a running search without a time budget (a ponder search) a budget counted from its start.
+
+        Args:
+            time_limit (float, optional): The budget in seconds. Defaults to time_limit.
+        """
+        self._deadline = self._start + (self.time_limit if time_limit is None else time_limit)
+
+    def search(self, board: GameField, color: Literal["black", "white"], time_limit: float = None,
+               max_depth: int = None, infinite: bool = False,
+               on_iteration: Callable[[SearchResult], None] = None) -> SearchResult:
+        """Search the position on the board with iterative deepening until the time budget runs out.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side to move.
+            time_limit (float, optional): The budget in seconds. Defaults to time_limit.
+            max_depth (int, optional): The maximal depth. Defaults to max_depth.
+            infinite (bool, optional): Search without a budget until stop() or ponderhit(). Defaults to False.
+            on_iteration (Callable[[SearchResult], None], optional): Called with the result of every completed
+                depth, e.g. to report progress. Defaults to None.
+
+        Returns:
+            SearchResult: The best move of the last completed iteration.
+        """
+        if infinite:
+            time_limit = None
+        elif time_limit is None:
+            time_limit = self.time_limit
+        self._begin(time_limit)
+        return self._iterate(board, color, max_depth, on_iteration)
+
+    def _begin(self, time_limit: float | None):
+        # Separate from _iterate so that a search started on another thread can be stopped or given a
+        # budget as soon as it is requested.
+        self._start = time.perf_counter()
+        self._deadline = float("inf") if time_limit is None else self._start + time_limit
+        self._stop.clear()
+        self._nodes = 0
+
+    def _iterate(self, board: GameField, color: str, max_depth: int = None,
+                 on_iteration: Callable[[SearchResult], None] = None) -> SearchResult:
+        max_depth = self.max_depth if max_depth is None else max_depth
+        timed = self._deadline != float("inf")
+        moves = self._moves(board, color)
+        if not moves:
+            return self._finish(SearchResult(None, -WIN_SCORE, 0, 0, time.perf_counter() - self._start))
+        key = zobrist_hash(board, color)
+        best_move, best_score, completed = moves[0], 0, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._root(board, key, color, depth)
+            except _Timeout:
+                break
+            best_move, best_score, completed = move, score, depth
+            if on_iteration is not None:
+                on_iteration(SearchResult(move, score, depth, self._nodes, time.perf_counter() - self._start,
+                                          self._principal_variation(board, key, color, move, depth)))
+            if abs(score) >= MATE_BOUND or len(moves) == 1 and timed:
+                break
+        pv = self._principal_variation(board, key, color, best_move, completed)
+        return self._finish(SearchResult(best_move, best_score, completed, self._nodes,
+                                         time.perf_counter() - self._start, pv))
+
+    @staticmethod
+    def _finish(result: SearchResult) -> SearchResult:
+        PROFILER.record_search("ChessEngine.search", result.nodes, result.elapsed)
+        return result
+
+    def evaluate(self, board: GameField, color: Literal["black", "white"]) -> int:
+        """Evaluate a position statically: material, piece-square bonuses and pawn structure.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side the score is given for.
+
+        Returns:
+            int: The score in centipawns; positive is good for the color.
+        """
+        score = board.score + self.pawn_table.probe(board)
+        return score if color == "white" else -score
+
+    def _root(self, board: GameField, key: int, color: str, depth: int) -> tuple[int, ChessMove]:
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move = None
+        opponent = "black" if color == "white" else "white"
+        for move in self._ordered(board, self._moves(board, color), key):
+            figure, captured, child_key = self._make(board, key, move)
+            try:
+                if isinstance(captured, King):
+                    score = WIN_SCORE - 1
+                else:
+                    score = -self._negamax(board, child_key, opponent, depth - 1, -beta, -alpha, 1)
+            finally:
+                self._unmake(board, move, figure, captured)
+            if best_move is None or score > alpha:
+                alpha, best_move = score, move
+        self._store(key, depth, alpha, _EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, board: GameField, key: int, color: str, depth: int, alpha: int, beta: int,
+                 ply: int) -> int:
+        self._nodes += 1
+        if self._nodes & 255 == 0 and (self._stop.is_set() or time.perf_counter() > self._deadline):
+            raise _Timeout
+        if depth <= 0:
+            return self._quiescence(board, color, alpha, beta, ply)
+
+        entry = self._table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, tt_move = entry
+            if entry_depth >= depth:
+                score = self._from_table(entry_score, ply)
+                if flag == _EXACT:
+                    return score
+                if flag == _LOWER and score >= beta:
+                    return score
+                if flag == _UPPER and score <= alpha:
+                    return score
+
+        moves = self._moves(board, color)
+        if not moves:
+            # A side that cannot move loses nothing by rule; score the position as it stands.
+            return self.evaluate(board, color)
+
+        original_alpha = alpha
+        best_move = None
+        best_score = -WIN_SCORE - 1
+        opponent = "black" if color == "white" else "white"
+        for move in self._ordered(board, moves, key, tt_move):
+            figure, captured, child_key = self._make(board, key, move)
+            try:
+                if isinstance(captured, King):
+                    score = WIN_SCORE - ply - 1
+                else:
+                    score = -self._negamax(board, child_key, opponent, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self._unmake(board, move, figure, captured)
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            flag = _UPPER
+        elif best_score >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._store(key, depth, self._to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiescence(self, board: GameField, color: str, alpha: int, beta: int, ply: int) -> int:
+        # Only captures are searched past the horizon, so the static evaluation is never taken mid-exchange.
+        stand_pat = self.evaluate(board, color)
+        if stand_pat >= beta or ply >= self.max_depth:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        opponent = "black" if color == "white" else "white"
+        for move in self._ordered(board, self._captures(board, color), 0):
+            self._nodes += 1
+            figure, captured, _ = self._make(board, 0, move)
+            try:
+                if isinstance(captured, King):
+                    score = WIN_SCORE - ply - 1
+                else:
+                    score = -self._quiescence(board, opponent, -beta, -alpha, ply + 1)
+            finally:
+                self._unmake(board, move, figure, captured)
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    @staticmethod
+    def _moves(board: GameField, color: str) -> list[ChessMove]:
+        return [(pos, end) for pos, figure in board.iter_figures(color)
+                for end in figure.get_available_moves(pos, board)]
+
+    @staticmethod
+    def _captures(board: GameField, color: str) -> list[ChessMove]:
+        return [(pos, end) for pos, figure in board.iter_figures(color)
+                for end in figure.get_available_moves(pos, board) if board.get_figure(end) is not None]
+
+    def _ordered(self, board: GameField, moves: list[ChessMove], key: int,
+                 tt_move: ChessMove = None) -> list[ChessMove]:
+        if tt_move is None:
+            entry = self._table.get(key)
+            tt_move = entry[3] if entry is not None else None
+
+        def priority(move: ChessMove) -> int:
+            if move == tt_move:
+                return -WIN_SCORE
+            captured = board.get_figure(move[1])
+            if captured is None:
+                return 0
+            # Most valuable victim first, least valuable attacker among equal victims.
+            return type_value(type(board.get_figure(move[0]))) // 100 - type_value(type(captured)) * 10
+
+        return sorted(moves, key=priority)
+
+    @staticmethod
+    def _make(board: GameField, key: int, move: ChessMove) -> tuple[Figure, Figure | None, int]:
+        start, end = move
+        figure = board.get_figure(start)
+        captured = board.get_figure(end)
+        keys = zobrist_keys(figure.__class__, figure.color)
+        key ^= keys[SQUARE_INDEX[start]] ^ keys[SQUARE_INDEX[end]] ^ ZOBRIST_BLACK
+        if captured is not None:
+            key ^= zobrist_keys(captured.__class__, captured.color)[SQUARE_INDEX[end]]
+        board.remove_figure(start)
+        board.set_figure(end, figure)
+        return figure, captured, key
+
+    @staticmethod
+    def _unmake(board: GameField, move: ChessMove, figure: Figure, captured: Figure | None):
+        start, end = move
+        board.set_figure(end, captured)
+        board.set_figure(start, figure)
+
+    def _principal_variation(self, board: GameField, key: int, color: str, move: ChessMove | None,
+                             depth: int) -> list[ChessMove]:
+        pv = []
+        played = []
+        seen = {key}
+        while move is not None and len(pv) < max(depth, 1):
+            figure = board.get_figure(move[0])
+            if figure is None or figure.color != color or move[1] not in figure.get_available_moves(move[0], board):
+                break
+            pv.append(move)
+            figure, captured, key = self._make(board, key, move)
+            played.append((move, figure, captured))
+            if isinstance(captured, King) or key in seen:
+                break
+            seen.add(key)
+            color = "black" if color == "white" else "white"
+            entry = self._table.get(key)
+            move = entry[3] if entry is not None else None
+        for move, figure, captured in reversed(played):
+            self._unmake(board, move, figure, captured)
+        return pv
+
+    def _store(self, key: int, depth: int, score: int, flag: int, move: ChessMove | None):
+        if len(self._table) >= self.table_size:
+            self._table.clear()
+        self._table[key] = (depth, score, flag, move)
+
+    @staticmethod
+    def _to_table(score: int, ply: int) -> int:
+        if score > MATE_BOUND:
+            return score + ply
+        if score < -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score: int, ply: int) -> int:
+        if score > MATE_BOUND:
+            return score - ply
+        if score < -MATE_BOUND:
+            return score + ply
+        return score
+
+
+class Ponderer:
+    """Searches on a background thread while the opponent is thinking.
+
+    After the engine moves, start() searches the position after the opponent's expected reply with no
+    time budget. When the opponent has moved, finish() either turns that search into the real one (the
+    prediction was right: the time already spent counts against the budget) or stops it (it was wrong);
+    the transposition table filled meanwhile speeds up the following search in both cases. The thread
+    runs while the main thread waits in input(), which releases the interpreter lock.
+
+    Attributes:
+        engine (ChessEngine): The engine; it must not be used by others while pondering.
+        predicted (ChessMove | None): The expected reply the running search assumes.
+    """
+
+    def __init__(self, engine: ChessEngine):
+        """Initializes a Ponderer.
+
+        Args:
+            engine (ChessEngine): The engine to ponder with.
+        """
+        self.engine = engine
+        self.predicted: ChessMove | None = None
+        self._thread: threading.Thread | None = None
+        self._result: SearchResult | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while a ponder search is running or waiting to be finished."""
+        return self._thread is not None
+
+    def start(self, position: BoardSnapshot, reply: ChessMove, color: Literal["black", "white"]):
+        """Starts searching the position after the expected reply.
+
+        Args:
+            position (BoardSnapshot): The position the opponent moves from.
+            reply (ChessMove): The expected reply of the opponent.
+            color (Literal["black", "white"]): The engine's side, which is to move after the reply.
+        """
+        self.stop()
+        board = GameField.from_snapshot(position)
+        start, end = reply
+        figure = board.get_figure(start)
+        if figure is None or isinstance(board.get_figure(end), King):
+            return
+        board.remove_figure(start)
+        board.set_figure(end, figure)
+        self.predicted = reply
+        self._result = None
+        self.engine._begin(None)
+        self._thread = threading.Thread(target=self._run, args=(board, color), daemon=True)
+        self._thread.start()
+
+    def _run(self, board: GameField, color: str):
+        self._result = self.engine._iterate(board, color)
+
+    def finish(self, reply: ChessMove, time_limit: float = None) -> SearchResult | None:
+        """Ends pondering once the opponent has moved.
+
+        Args:
+            reply (ChessMove): The move the opponent played.
+            time_limit (float, optional): The budget of the move, counted from the start of pondering.
+                Defaults to the engine's time_limit.
+
+        Returns:
+            SearchResult | None: The result of the ponder search if the reply was predicted, otherwise None.
+        """
+        if self._thread is None:
+            return None
+        if tuple(reply) != self.predicted:
+            self.stop()
+            return None
+        self.engine.ponderhit(time_limit)
+        self._thread.join()
+        result = self._result
+        self._thread = None
+        self.predicted = None
+        return result
+
+    def stop(self):
+        """Cancels a running ponder search and waits for the thread to end."""
+        if self._thread is not None:
+            self.engine.stop()
+            self._thread.join()
+            self._thread = None
+        self.predicted = None
+        self._result = None
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from typing import Literal, TYPE_CHECKING
+
+from figures import *
+
+if TYPE_CHECKING:
+    from field import GameField
+
+#: Material values of the figure types in centipawns. Subclasses (e.g. the hexagonal figures) use the value
+#: of the nearest listed base class; unknown types are worth DEFAULT_VALUE.
+FIGURE_VALUES: dict[type, int] = {
+    Pawn: 100,
+    Knight: 320,
+    Bishop: 330,
+    Rook: 500,
+    Queen: 900,
+    King: 20000,
+    Balloon: 650,
+    Tank: 200,
+    PEKKA: 250,
+}
+
+#: The value of figure types missing from FIGURE_VALUES.
+DEFAULT_VALUE = 300
+
+#: Piece-square bonuses in centipawns from white's point of view, as 8 rows from rank 8 down to rank 1.
+#: Types missing here (including the custom figures unless configured) get no positional bonus.
+PIECE_SQUARE_ROWS: dict[type, tuple[tuple[int, ...], ...]] = {
+    Pawn: (
+        (0, 0, 0, 0, 0, 0, 0, 0),
+        (50, 50, 50, 50, 50, 50, 50, 50),
+        (10, 10, 20, 30, 30, 20, 10, 10),
+        (5, 5, 10, 25, 25, 10, 5, 5),
+        (0, 0, 0, 20, 20, 0, 0, 0),
+        (5, -5, -10, 0, 0, -10, -5, 5),
+        (5, 10, 10, -20, -20, 10, 10, 5),
+        (0, 0, 0, 0, 0, 0, 0, 0),
+    ),
+    Knight: (
+        (-50, -40, -30, -30, -30, -30, -40, -50),
+        (-40, -20, 0, 0, 0, 0, -20, -40),
+        (-30, 0, 10, 15, 15, 10, 0, -30),
+        (-30, 5, 15, 20, 20, 15, 5, -30),
+        (-30, 0, 15, 20, 20, 15, 0, -30),
+        (-30, 5, 10, 15, 15, 10, 5, -30),
+        (-40, -20, 0, 5, 5, 0, -20, -40),
+        (-50, -40, -30, -30, -30, -30, -40, -50),
+    ),
+    Bishop: (
+        (-20, -10, -10, -10, -10, -10, -10, -20),
+        (-10, 0, 0, 0, 0, 0, 0, -10),
+        (-10, 0, 5, 10, 10, 5, 0, -10),
+        (-10, 5, 5, 10, 10, 5, 5, -10),
+        (-10, 0, 10, 10, 10, 10, 0, -10),
+        (-10, 10, 10, 10, 10, 10, 10, -10),
+        (-10, 5, 0, 0, 0, 0, 5, -10),
+        (-20, -10, -10, -10, -10, -10, -10, -20),
+    ),
+    Rook: (
+        (0, 0, 0, 0, 0, 0, 0, 0),
+        (5, 10, 10, 10, 10, 10, 10, 5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (0, 0, 0, 5, 5, 0, 0, 0),
+    ),
+    Queen: (
+        (-20, -10, -10, -5, -5, -10, -10, -20),
+        (-10, 0, 0, 0, 0, 0, 0, -10),
+        (-10, 0, 5, 5, 5, 5, 0, -10),
+        (-5, 0, 5, 5, 5, 5, 0, -5),
+        (0, 0, 5, 5, 5, 5, 0, -5),
+        (-10, 5, 5, 5, 5, 5, 0, -10),
+        (-10, 0, 5, 0, 0, 0, 0, -10),
+        (-20, -10, -10, -5, -5, -10, -10, -20),
+    ),
+    King: (
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-20, -30, -30, -40, -40, -30, -30, -20),
+        (-10, -20, -20, -20, -20, -20, -20, -10),
+        (20, 20, 0, 0, 0, 0, 20, 20),
+        (20, 30, 10, 0, 0, 10, 30, 20),
+    ),
+}
+
+#: Cache of score_table results by figure type and color; cleared when values are configured.
+SCORE_TABLES: dict[tuple[type, str], list[int]] = {}
+
+
+def figure_value(figure: Figure | None) -> int:
+    """Return the material value of a figure.
+
+    Args:
+        figure (Figure | None): The figure, or None for an empty square.
+
+    Returns:
+        int: The value in centipawns; 0 for an empty square.
+    """
+    if figure is None:
+        return 0
+    return type_value(type(figure))
+
+
+def type_value(figure_type: type) -> int:
+    """Return the material value of a figure type.
+
+    Args:
+        figure_type (type): The figure class.
+
+    Returns:
+        int: The value in centipawns.
+    """
+    for cls in figure_type.__mro__:
+        value = FIGURE_VALUES.get(cls)
+        if value is not None:
+            return value
+    return DEFAULT_VALUE
+
+
+def set_figure_value(figure_type: type, value: int, piece_square_rows=None):
+    """Configures the material value and piece-square bonuses of a figure type.
+
+    Boards keep running scores, so the configuration must be done before boards are created.
+
+    Args:
+        figure_type (type): The figure class (e.g. Balloon, Tank or PEKKA).
+        value (int): The material value in centipawns.
+        piece_square_rows (tuple[tuple[int, ...], ...], optional): Bonuses from white's point of view,
+            8 rows from rank 8 down to rank 1. Defaults to None (keep the current bonuses).
+    """
+    FIGURE_VALUES[figure_type] = value
+    if piece_square_rows is not None:
+        if len(piece_square_rows) != 8 or any(len(row) != 8 for row in piece_square_rows):
+            raise ValueError("Piece-square bonuses must have 8 rows of 8 values")
+        PIECE_SQUARE_ROWS[figure_type] = tuple(tuple(row) for row in piece_square_rows)
+    SCORE_TABLES.clear()
+
+
+def score_table(figure_type: type, color: Literal["black", "white"]) -> list[int]:
+    """Return the signed score of a figure on every square: its value plus its piece-square bonus,
+    positive for white and negative for black.
+
+    Args:
+        figure_type (type): The figure class.
+        color (Literal["black", "white"]): The color of the figure.
+
+    Returns:
+        list[int]: The scores indexed by square index (file * 8 + rank).
+    """
+    table = SCORE_TABLES.get((figure_type, color))
+    if table is None:
+        value = type_value(figure_type)
+        rows = None
+        for cls in figure_type.__mro__:
+            rows = PIECE_SQUARE_ROWS.get(cls)
+            if rows is not None:
+                break
+        table = []
+        for index in range(64):
+            col, row = divmod(index, 8)
+            bonus = 0
+            if rows is not None:
+                bonus = rows[7 - row][col] if color == "white" else rows[row][col]
+            table.append(value + bonus if color == "white" else -value - bonus)
+        SCORE_TABLES[(figure_type, color)] = table
+    return table
+
+
+def static_exchange(field: GameField, square: str, color: Literal["black", "white"]) -> int:
+    """Evaluates the sequence of captures on a square started by a color (static exchange evaluation).
+
+    Both sides capture with their least valuable attacker first, and either side may stop capturing
+    when continuing would lose material. Pieces removed from the square's rays uncover the sliders behind
+    them (x-rays), since the attackers are looked up again on the board after every capture. Capturing
+    the King ends the sequence.
+
+    The board is modified during the evaluation and restored before returning.
+
+    Args:
+        field (GameField): The game board.
+        square (str): The square of the captured figure in algebraic notation (e.g., 'e4').
+        color (Literal["black", "white"]): The color making the first capture.
+
+    Returns:
+        int: The material won by the color in centipawns, or 0 if it has no capture on the square.
+            Negative if the first capture itself loses material.
+    """
+    target = field.get_figure(square)
+    if target is None:
+        return 0
+    gains = []
+    removed = []
+    side = color
+    try:
+        while True:
+            attackers = field.attackers_of(square, side, target)
+            if not attackers:
+                break
+            gains.append(figure_value(target))
+            if isinstance(target, King):
+                break
+            pos = min(attackers, key=lambda attacker: figure_value(field.get_figure(attacker)))
+            target = field.get_figure(pos)
+            removed.append((pos, target))
+            field.remove_figure(pos)
+            side = "black" if side == "white" else "white"
+    finally:
+        for pos, figure in reversed(removed):
+            field.set_figure(pos, figure)
+
+    if not gains:
+        return 0
+    score = 0
+    for gain in reversed(gains[1:]):
+        score = max(0, gain - score)
+    return gains[0] - score
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from field import GameField
+from figures import *
+from figures.definitions import FILES
+from pgn import SAN_LETTERS
+
+#: Figure classes by FEN letter; upper case is white, lower case is black. The author figures use their SAN letters.
+FEN_LETTERS = {"P": Pawn, **SAN_LETTERS}
+_LETTERS_BY_TYPE = {figure_type: letter for letter, figure_type in FEN_LETTERS.items()}
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+
+
+def parse_fen(fen: str) -> tuple[GameField, Literal["black", "white"]]:
+    """Creates a board from a position in Forsyth-Edwards Notation.
+
+    The castling, en passant and move counter fields are accepted but ignored, since the game has no such rules.
+
+    Args:
+        fen (str): The position, e.g. START_FEN.
+
+    Returns:
+        tuple[GameField, Literal["black", "white"]]: The board and the side to move.
+
+    Raises:
+        ValueError: If the position cannot be read.
+    """
+    fields = fen.split()
+    if not fields:
+        raise ValueError("Empty FEN")
+    ranks = fields[0].split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"FEN must have 8 ranks: {fen!r}")
+    data = {col: [None] * 8 for col in FILES}
+    for row, rank in zip(range(7, -1, -1), ranks):
+        file_index = 0
+        for char in rank:
+            if char.isdigit():
+                file_index += int(char)
+                continue
+            figure_class = FEN_LETTERS.get(char.upper())
+            if figure_class is None or file_index > 7:
+                raise ValueError(f"Bad rank {rank!r} in FEN {fen!r}")
+            data[FILES[file_index]][row] = figure_class("white" if char.isupper() else "black")
+            file_index += 1
+        if file_index != 8:
+            raise ValueError(f"Rank {rank!r} does not have 8 squares in FEN {fen!r}")
+    side = fields[1] if len(fields) > 1 else "w"
+    if side not in ("w", "b"):
+        raise ValueError(f"Bad side to move {side!r} in FEN {fen!r}")
+    return GameField(data), "white" if side == "w" else "black"
+
+
+def to_fen(field: GameField, color: Literal["black", "white"]) -> str:
+    """Writes a position in Forsyth-Edwards Notation.
+
+    Args:
+        field (GameField): The game board.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        str: The position, with empty castling and en passant fields.
+
+    Raises:
+        ValueError: If the board holds a figure without a FEN letter.
+    """
+    ranks = []
+    for row in range(7, -1, -1):
+        rank = ""
+        empty = 0
+        for col in FILES:
+            figure = field.data[col][row]
+            if figure is None:
+                empty += 1
+                continue
+            letter = _LETTERS_BY_TYPE.get(figure.__class__)
+            if letter is None:
+                raise ValueError(f"{figure.__class__.__name__} has no FEN letter")
+            rank += (str(empty) if empty else "") + (letter if figure.color == "white" else letter.lower())
+            empty = 0
+        ranks.append(rank + (str(empty) if empty else ""))
+    return f"{'/'.join(ranks)} {'w' if color == 'white' else 'b'} - - 0 1"
@@ -1,4 +1,15 @@
-from figures import Pawn, Rook, Knight, Bishop, Queen, King, Figure
+from __future__ import annotations
+
+from typing import Iterator, Literal
+
+from figures import Pawn, Rook, Knight, Bishop, Queen, King, Figure, DefinedFigure
+from evaluation import SCORE_TABLES, score_table
+from figures.definitions import AttackTable
+from pawns import PAWN_KEYS
+from snapshot import BoardSnapshot
+
+#: Attack tables by the set of figure types they were compiled for.
+_ATTACK_TABLES: dict[frozenset, AttackTable] = {}
 
 
 class GameField:
@@ -6,6 +17,11 @@ class GameField:
 
     This class provides methods for initializing the board with chess pieces,
     retrieving, updating, and printing the state of the game field.
+
+    Attributes:
+        score (int): The running material and piece-square score in centipawns from white's point of view,
+            updated on every set_figure/remove_figure (see evaluation.score_table).
+        pawn_key (int): A hash of the pawn-like figures only (see pawns.PAWN_KEYS), updated the same way.
     """
 
     def __init__(self, data=None):
@@ -22,6 +38,17 @@ class GameField:
             self.data = self.initialize_field()
         else:
             self.data = data
+        self.score = 0
+        self.pawn_key = 0
+        self._observers: list = []
+        self._figure_types: set[type] = set()
+        self._custom_positions: set[str] = set()
+        self._attack_table: AttackTable | None = None
+        for col, column in self.data.items():
+            for row, figure in enumerate(column):
+                if figure is not None:
+                    self._track_figure(f"{col}{row + 1}", figure)
+                    self._on_added(figure, (ord(col) - 97) * 8 + row)
 
     @staticmethod
     def initialize_field():
@@ -43,6 +70,28 @@ class GameField:
         }
         return field
 
+    @classmethod
+    def from_snapshot(cls, snapshot: BoardSnapshot) -> GameField:
+        """Creates a mutable board from a snapshot.
+
+        Args:
+            snapshot (BoardSnapshot): The position to start from.
+
+        Returns:
+            GameField: A new board with its own copy of the snapshot data.
+        """
+        return cls(snapshot.to_data())
+
+    def snapshot(self) -> BoardSnapshot:
+        """Returns an immutable snapshot of the current position.
+
+        Derived positions can then be created from the snapshot without copying the whole board.
+
+        Returns:
+            BoardSnapshot: The snapshot of the board.
+        """
+        return BoardSnapshot.from_data(self.data)
+
     def get_figure(self, move: str) -> Figure | None:
         """Retrieves the figure at the specified board position.
 
@@ -64,7 +113,12 @@ class GameField:
         """
         col = move[0].lower()
         row = int(move[1]) - 1
-        self.data[col][row] = None
+        column = self.data[col]
+        old_figure = column[row]
+        if old_figure is not None:
+            self._on_removed(old_figure, (ord(col) - 97) * 8 + row)
+        column[row] = None
+        self._custom_positions.discard(f"{col}{row + 1}")
 
     def set_figure(self, move: str, figure: Figure):
         """Places a chess figure at the specified board position.
@@ -75,7 +129,179 @@ class GameField:
         """
         col = move[0].lower()
         row = int(move[1]) - 1
-        self.data[col][row] = figure
+        index = (ord(col) - 97) * 8 + row
+        column = self.data[col]
+        old_figure = column[row]
+        if old_figure is not None:
+            self._on_removed(old_figure, index)
+        column[row] = figure
+        self._custom_positions.discard(f"{col}{row + 1}")
+        if figure is not None:
+            self._track_figure(f"{col}{row + 1}", figure)
+            self._on_added(figure, index)
+
+    def _on_added(self, figure: Figure, index: int):
+        # Updates the running score and pawn key for a figure placed on a square, and notifies the observers.
+        table = SCORE_TABLES.get((figure.__class__, figure.color))
+        if table is None:
+            table = score_table(figure.__class__, figure.color)
+        self.score += table[index]
+        pawn_keys = PAWN_KEYS.get(figure.__class__)
+        if pawn_keys is not None:
+            self.pawn_key ^= pawn_keys[figure.color][index]
+        if self._observers:
+            for observer in self._observers:
+                observer.figure_added(figure, index)
+
+    def _on_removed(self, figure: Figure, index: int):
+        # Reverts _on_added for a figure taken off a square.
+        table = SCORE_TABLES.get((figure.__class__, figure.color))
+        if table is None:
+            table = score_table(figure.__class__, figure.color)
+        self.score -= table[index]
+        pawn_keys = PAWN_KEYS.get(figure.__class__)
+        if pawn_keys is not None:
+            self.pawn_key ^= pawn_keys[figure.color][index]
+        if self._observers:
+            for observer in self._observers:
+                observer.figure_removed(figure, index)
+
+    def attach(self, observer):
+        """Registers an observer notified of every figure placed on or removed from the board.
+
+        The observer must provide figure_added(figure, index) and figure_removed(figure, index),
+        where index is the square index (see SQUARE_INDEX). It is used by incremental evaluators.
+
+        Args:
+            observer: The observer to notify.
+        """
+        self._observers.append(observer)
+
+    def detach(self, observer):
+        """Unregisters an observer registered with attach.
+
+        Args:
+            observer: The observer to remove.
+        """
+        self._observers.remove(observer)
+
+    def evaluate(self, color: Literal["black", "white"]) -> int:
+        """Returns the static material and piece-square evaluation of the position without scanning the board.
+
+        Args:
+            color (Literal["black", "white"]): The side the score is given for.
+
+        Returns:
+            int: The score in centipawns; positive is good for the color.
+        """
+        return self.score if color == "white" else -self.score
+
+    def iter_figures(self, color: Literal["black", "white"] = None) -> Iterator[tuple[str, Figure]]:
+        """Lazily yields the figures on the board with their positions.
+
+        The board must not be modified while the iterator is in use.
+
+        Args:
+            color (Literal["black", "white"], optional): Yield only figures of this color. Defaults to None (all).
+
+        Yields:
+            tuple[str, Figure]: The position in algebraic notation and the figure standing on it.
+        """
+        for col, column in self.data.items():
+            for row, figure in enumerate(column):
+                if figure is not None and (color is None or figure.color == color):
+                    yield f"{col}{row + 1}", figure
+
+    def has_any_move(self, color: Literal["black", "white"]) -> bool:
+        """Checks whether any figure of a color can move, stopping at the first available move.
+
+        Args:
+            color (Literal["black", "white"]): The color of the side to check.
+
+        Returns:
+            bool: False if the side has no available moves (e.g. it is stalemated or has no figures left).
+        """
+        return any(figure.has_any_move(pos, self) for pos, figure in self.iter_figures(color))
+
+    def _track_figure(self, pos: str, figure: Figure):
+        if isinstance(figure, DefinedFigure):
+            if type(figure) not in self._figure_types:
+                self._figure_types.add(type(figure))
+                self._attack_table = None
+        else:
+            self._custom_positions.add(pos)
+
+    def attackers_of(self, square: str, color: Literal["black", "white"], target: Figure = None) -> list[str]:
+        """Finds the figures of a color that can capture on the specified square.
+
+        Defined figures are found by looking outward from the square along their reverse attack patterns;
+        figures without a declarative definition fall back to generating their moves.
+
+        Args:
+            square (str): The board position in algebraic notation (e.g., 'e4').
+            color (Literal["black", "white"]): The color of the attacking figures.
+            target (Figure, optional): The figure assumed to stand on the square.
+                Defaults to the figure currently on it.
+
+        Returns:
+            list[str]: The positions of the attacking figures.
+        """
+        if target is None:
+            target = self.get_figure(square)
+        result = self._get_attack_table().attackers(square, color, self.data, target)
+        if self._custom_positions:
+            result.extend(self._custom_attackers(square, color, target))
+        return result
+
+    def is_attacked(self, square: str, color: Literal["black", "white"], target: Figure = None) -> bool:
+        """Checks whether any figure of a color can capture on the specified square.
+
+        Args:
+            square (str): The board position in algebraic notation (e.g., 'e4').
+            color (Literal["black", "white"]): The color of the attacking figures.
+            target (Figure, optional): The figure assumed to stand on the square.
+                Defaults to the figure currently on it.
+
+        Returns:
+            bool: True if the square is attacked.
+        """
+        if target is None:
+            target = self.get_figure(square)
+        table = self._attack_table or self._get_attack_table()
+        if table.attackers(square, color, self.data, target, first=True):
+            return True
+        if not self._custom_positions:
+            return False
+        return next(self._custom_attackers(square, color, target), None) is not None
+
+    def _get_attack_table(self) -> AttackTable:
+        if self._attack_table is None:
+            key = frozenset(self._figure_types)
+            table = _ATTACK_TABLES.get(key)
+            if table is None:
+                table = _ATTACK_TABLES[key] = AttackTable({cls: cls.definition for cls in key})
+            self._attack_table = table
+        return self._attack_table
+
+    def _custom_attackers(self, square: str, color: str, target: Figure | None):
+        square = square.lower()
+        for pos in list(self._custom_positions):
+            figure = self.get_figure(pos)
+            if figure.color != color:
+                continue
+            if target is None or self.get_figure(square) is target:
+                if square in figure.get_available_moves(pos, self):
+                    yield pos
+            else:
+                # Put the assumed target on the square so that capture rules see it.
+                original = self.data[square[0]][int(square[1]) - 1]
+                self.data[square[0]][int(square[1]) - 1] = target
+                try:
+                    attacks = square in figure.get_available_moves(pos, self)
+                finally:
+                    self.data[square[0]][int(square[1]) - 1] = original
+                if attacks:
+                    yield pos
 
     def print_field(self):
         """Prints the current state of the game board.
@@ -1,8 +1,15 @@
+from .definitions import PieceDefinition, MoveRule, Leaper, Slider
 from .figures import *
 from .author_figures import *
+from .hex_figures import *
 
 __all__ = [
     "Figure",
+    "DefinedFigure",
+    "PieceDefinition",
+    "MoveRule",
+    "Leaper",
+    "Slider",
     "King",
     "Queen",
     "Knight",
@@ -12,5 +19,11 @@ __all__ = [
     "Balloon",
     "Tank",
     "PEKKA",
-    "AUTHOR_FIELD"
+    "AUTHOR_FIELD",
+    "HexKing",
+    "HexQueen",
+    "HexKnight",
+    "HexRook",
+    "HexBishop",
+    "HexPawn"
 ]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+from typing import Iterator, Literal
+
+#: Files of the board in order.
+FILES = "abcdefgh"
+
+#: Square names by index; the index of a square is file * 8 + rank (a1 = 0, a2 = 1, ..., h8 = 63).
+SQUARES = [f"{col}{row + 1}" for col in FILES for row in range(8)]
+
+#: Square indices by name.
+SQUARE_INDEX = {name: index for index, name in enumerate(SQUARES)}
+
+#: Move rule modes.
+ANY = "any"
+MOVE = "move"
+CAPTURE = "capture"
+
+
+class MoveRule:
+    """A declarative move rule: a set of direction vectors with a range limit.
+
+    Vectors are (file offset, rank offset) pairs. For color-relative definitions the rank offset
+    is given from white's point of view and mirrored for black.
+
+    Attributes:
+        vectors (tuple[tuple[int, int], ...]): The direction vectors.
+        mode (Literal["any", "move", "capture"]): 'move' only goes to empty squares,
+            'capture' only takes opponent figures, 'any' does both.
+        limit (int | None): The maximal number of steps along a vector, None for unlimited.
+        ranks (frozenset[int] | None): Relative ranks (0 is the own back rank) the rule applies on, None for all.
+    """
+
+    def __init__(self, vectors, mode: Literal["any", "move", "capture"] = ANY, limit: int | None = None,
+                 ranks=None):
+        """Initializes a MoveRule.
+
+        Args:
+            vectors (Iterable[tuple[int, int]]): The direction vectors.
+            mode (Literal["any", "move", "capture"], optional): The rule mode. Defaults to 'any'.
+            limit (int | None, optional): The maximal number of steps. Defaults to None (unlimited).
+            ranks (Iterable[int] | None, optional): Relative ranks the rule applies on. Defaults to None (all).
+        """
+        if mode not in (ANY, MOVE, CAPTURE):
+            raise ValueError(f"Unknown move rule mode: {mode}")
+        self.vectors = tuple(vectors)
+        self.mode = mode
+        self.limit = limit
+        self.ranks = None if ranks is None else frozenset(ranks)
+
+
+class Leaper(MoveRule):
+    """A rule that jumps directly to the target square, ignoring figures in between."""
+
+    def __init__(self, vectors, mode: Literal["any", "move", "capture"] = ANY, ranks=None):
+        """Initializes a Leaper rule.
+
+        Args:
+            vectors (Iterable[tuple[int, int]]): The jump offsets.
+            mode (Literal["any", "move", "capture"], optional): The rule mode. Defaults to 'any'.
+            ranks (Iterable[int] | None, optional): Relative ranks the rule applies on. Defaults to None (all).
+        """
+        super().__init__(vectors, mode, 1, ranks)
+
+
+class Slider(MoveRule):
+    """A rule that moves along a direction until the board edge or the first figure."""
+
+
+class PieceDefinition:
+    """Declarative description of a figure's moves compiled into per-square target tables.
+
+    The rules are compiled once, when the definition is created. For every color and square the table
+    holds rays of target squares, so move generation only walks precomputed tuples and reads the board.
+
+    Attributes:
+        rules (tuple[MoveRule, ...]): The move rules.
+        forbidden (tuple[type, ...]): Figure types that can never be captured.
+        relative (bool): True if rank offsets are mirrored for black.
+        tables (dict[str, list[tuple]]): Per-color list indexed by square; each entry is a tuple of
+            (mode, ray) pairs, and each ray is a tuple of (name, file, rank index) targets.
+        square_index (dict[str, int]): Square indices by name for the board geometry the tables are built for.
+    """
+
+    square_index: dict[str, int] = SQUARE_INDEX
+
+    def __init__(self, *rules: MoveRule, forbidden: tuple[type, ...] = (), relative: bool = False):
+        """Initializes and compiles a PieceDefinition.
+
+        Args:
+            *rules (MoveRule): The move rules in generation order.
+            forbidden (tuple[type, ...], optional): Figure types that cannot be captured. Defaults to ().
+            relative (bool, optional): Mirror rank offsets for black. Defaults to False.
+        """
+        self.rules = rules
+        self.forbidden = tuple(forbidden)
+        self.relative = relative
+        white = self._compile(1)
+        self.tables = {"white": white, "black": self._compile(-1) if relative else white}
+
+    def _compile(self, direction: int) -> list[tuple]:
+        table = []
+        for index in range(64):
+            col, row = divmod(index, 8)
+            relative_rank = row if direction == 1 else 7 - row
+            rays = []
+            for rule in self.rules:
+                if rule.ranks is not None and relative_rank not in rule.ranks:
+                    continue
+                for dcol, drow in rule.vectors:
+                    ray = []
+                    new_col, new_row = col + dcol, row + drow * direction
+                    while 0 <= new_col <= 7 and 0 <= new_row <= 7:
+                        ray.append((f"{FILES[new_col]}{new_row + 1}", FILES[new_col], new_row))
+                        if rule.limit is not None and len(ray) == rule.limit:
+                            break
+                        new_col += dcol
+                        new_row += drow * direction
+                    if ray:
+                        rays.append((rule.mode, tuple(ray)))
+            table.append(tuple(rays))
+        return table
+
+    def rays(self, pos: str, color: Literal["black", "white"]) -> list[list[str]]:
+        """Return the precomputed rays of target squares from a position, ignoring the board.
+
+        Args:
+            pos (str): The position in algebraic notation (e.g., 'a1').
+            color (Literal["black", "white"]): The color of the figure.
+
+        Returns:
+            list[list[str]]: The target squares grouped by ray.
+        """
+        return [[target[0] for target in ray] for _, ray in self.tables[color][self.square_index[pos.lower()]]]
+
+    def generate(self, pos: str, color: Literal["black", "white"], data: dict) -> list[str]:
+        """Generate the available moves of a figure from a position.
+
+        Args:
+            pos (str): The position in algebraic notation (e.g., 'a1').
+            color (Literal["black", "white"]): The color of the moving figure.
+            data (dict): The board data, columns 'a' to 'h' mapped to lists of figures.
+
+        Returns:
+            list[str]: The available target squares.
+        """
+        return list(self.iter_generate(pos, color, data))
+
+    def iter_generate(self, pos: str, color: Literal["black", "white"], data: dict) -> Iterator[str]:
+        """Lazily generate the available moves of a figure from a position.
+
+        Args:
+            pos (str): The position in algebraic notation (e.g., 'a1').
+            color (Literal["black", "white"]): The color of the moving figure.
+            data (dict): The board data, columns 'a' to 'h' mapped to lists of figures.
+
+        Yields:
+            str: The available target squares in the same order as generate returns them.
+        """
+        forbidden = self.forbidden
+        for mode, ray in self.tables[color][self.square_index[pos.lower()]]:
+            for name, col, row in ray:
+                figure = data[col][row]
+                if figure is None:
+                    if mode != CAPTURE:
+                        yield name
+                    continue
+                if mode != MOVE and figure.color != color and not isinstance(figure, forbidden):
+                    yield name
+                break
+
+
+class AttackTable:
+    """Reverse attack patterns of a set of figure types.
+
+    For every target square and attacking color the table holds reverse rays: the squares an attacker
+    could stand on, ordered outward from the target, together with the figure types that attack along
+    that ray and their range. Answering "who attacks this square" then only walks a few short rays
+    instead of generating the moves of every figure on the board.
+
+    Attributes:
+        rays (dict[str, list[tuple]]): Per attacking color, a list indexed by target square; each entry
+            is a tuple of (ray, attackers) pairs, where ray is a tuple of (name, file, rank index, distance) squares
+            and attackers maps a figure type to a tuple of (limit, rows, forbidden) options.
+    """
+
+    def __init__(self, definitions: dict[type, PieceDefinition]):
+        """Initializes and compiles an AttackTable.
+
+        Args:
+            definitions (dict[type, PieceDefinition]): Definitions of the figure types by class.
+        """
+        self.rays = {color: self._compile(definitions, color) for color in ("white", "black")}
+
+    @staticmethod
+    def _compile(definitions: dict[type, PieceDefinition], color: str) -> list[tuple]:
+        by_vector: dict[tuple[int, int], dict[type, list]] = {}
+        for figure_class, definition in definitions.items():
+            direction = -1 if definition.relative and color == "black" else 1
+            for rule in definition.rules:
+                if rule.mode == MOVE:
+                    continue
+                if rule.ranks is None:
+                    rows = None
+                else:
+                    rows = frozenset(rank if direction == 1 else 7 - rank for rank in rule.ranks)
+                for dcol, drow in rule.vectors:
+                    attackers = by_vector.setdefault((dcol, drow * direction), {})
+                    attackers.setdefault(figure_class, []).append((rule.limit or 7, rows, definition.forbidden))
+        table = []
+        for index in range(64):
+            col, row = divmod(index, 8)
+            entries = []
+            for (dcol, drow), attackers in by_vector.items():
+                length = max(limit for options in attackers.values() for limit, _, _ in options)
+                ray = []
+                new_col, new_row = col - dcol, row - drow
+                while 0 <= new_col <= 7 and 0 <= new_row <= 7 and len(ray) < length:
+                    ray.append((f"{FILES[new_col]}{new_row + 1}", FILES[new_col], new_row, len(ray) + 1))
+                    new_col -= dcol
+                    new_row -= drow
+                if ray:
+                    entries.append((tuple(ray), {cls: tuple(options) for cls, options in attackers.items()}))
+            table.append(tuple(entries))
+        return table
+
+    def attackers(self, pos: str, color: Literal["black", "white"], data: dict, target=None,
+                  first: bool = False) -> list[str]:
+        """Return the squares of figures of a color that can capture on a square.
+
+        Args:
+            pos (str): The target square in algebraic notation (e.g., 'e4').
+            color (Literal["black", "white"]): The color of the attacking figures.
+            data (dict): The board data, columns 'a' to 'h' mapped to lists of figures.
+            target (Figure, optional): The figure assumed to stand on the target square; figure types
+                it cannot be captured by are skipped. Defaults to None.
+            first (bool, optional): Stop after the first attacker is found. Defaults to False.
+
+        Returns:
+            list[str]: The squares of the attacking figures.
+        """
+        result = []
+        for ray, attackers in self.rays[color][SQUARE_INDEX[pos.lower()]]:
+            for name, col, row, distance in ray:
+                figure = data[col][row]
+                if figure is None:
+                    continue
+                if figure.color == color:
+                    options = attackers.get(figure.__class__)
+                    if options is not None:
+                        for limit, rows, forbidden in options:
+                            if (distance <= limit and (rows is None or row in rows)
+                                    and not isinstance(target, forbidden)):
+                                result.append(name)
+                                if first:
+                                    return result
+                                break
+                break
+        return result
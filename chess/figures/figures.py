@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Literal, TYPE_CHECKING
+from typing import Iterator, Literal, TYPE_CHECKING
 
 from abc import ABC, abstractmethod
 
+from .definitions import PieceDefinition, Leaper, Slider, MOVE, CAPTURE
+
 if TYPE_CHECKING:
     from ..field import GameField
 
@@ -45,359 +47,185 @@ class Figure(ABC):
         """
         pass
 
+    def iter_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        """Lazily yield the available moves of the figure from a given position.
 
-class Rook(Figure):
-    def __str__(self):
-        """Return the Unicode symbol for the rook."""
-        return "♖" if self.color == "white" else "♜"
-
-    def _get_moves(self, pos: str) -> list[list[str]]:
-        """Calculate potential moves for the rook in each cardinal direction.
-
-        Iterates in each direction until the edge of the board is reached.
+        Figures that can generate moves one by one override this method; the default
+        implementation falls back to get_available_moves.
 
         Args:
-            pos (str): The starting position of the rook in algebraic notation (e.g., 'a1').
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
 
-        Returns:
-            list[list[str]]: A list of lists, where each sublist contains moves in one direction.
+        Yields:
+            str: The available moves in generation order.
         """
-        moves = []
-        col = pos[0]
-        row = int(pos[1]) - 1
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        for dcol, drow in directions:
-            moves_vector = []
-            i = 1
-            while True:
-                new_col = ord(col) + dcol * i
-                new_row = row + drow * i
-                if new_col < ord('a') or new_col > ord('h') or new_row < 0 or new_row > 7:
-                    break
-                moves_vector.append(f"{chr(new_col)}{new_row + 1}")
-                i += 1
-            moves.append(moves_vector)
-        return moves
+        yield from self.get_available_moves(pos, board)
 
-    def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Determine legal moves for the rook by checking for obstructions and potential captures.
+    def has_any_move(self, pos: str, board: GameField) -> bool:
+        """Check whether the figure has at least one available move, stopping at the first one found.
 
         Args:
-            pos (str): The starting position of the rook in algebraic notation.
-            board (GameField): The game board used to validate moves.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
 
         Returns:
-            list: A list of legal moves available to the rook.
+            bool: True if the figure can move.
         """
-        moves = self._get_moves(pos)
-        result = []
-        for vector in moves:
-            for move in vector:
-                figure = board.get_figure(move)
-                if figure is None:
-                    result.append(move)
-                    continue
-                elif figure.color != self.color:
-                    result.append(move)
-                    break
-                else:
-                    break
-        return result
-
-
-class Knight(Figure):
-    def __str__(self):
-        """Return the Unicode symbol for the knight."""
-        return "♘" if self.color == "white" else "♞"
-
-    def _get_moves(self, pos: str) -> list:
-        """Compute all potential moves for the knight from a given position.
+        return next(self.iter_moves(pos, board), None) is not None
 
-        The knight moves in an L-shape pattern.
+    def first_capture(self, pos: str, board: GameField) -> str | None:
+        """Return the first available move that captures an opponent's figure.
 
         Args:
-            pos (str): The starting position of the knight in algebraic notation.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
 
         Returns:
-            list: A list of potential positions the knight can move to.
+            str | None: The target square of the capture, or None if the figure cannot capture.
         """
-        moves = []
-        col = pos[0]
-        row = int(pos[1]) - 1
-        knight_moves = [(2, 1), (2, -1), (-2, 1), (-2, -1),
-                        (1, 2), (1, -2), (-1, 2), (-1, -2)]
-        for dcol, drow in knight_moves:
-            new_col = ord(col) + dcol
-            new_row = row + drow
-            if ord('a') <= new_col <= ord('h') and 0 <= new_row <= 7:
-                moves.append(f"{chr(new_col)}{new_row + 1}")
-        return moves
-
-    def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Return legal moves for the knight considering board constraints.
+        for move in self.iter_moves(pos, board):
+            figure = board.get_figure(move)
+            if figure is not None and figure.color != self.color:
+                return move
+        return None
 
-        Checks moves for validity and ensures that moves do not capture pieces of the same color.
+    def count_moves(self, pos: str, board: GameField, limit: int | None = None) -> int:
+        """Count the available moves of the figure, stopping once the limit is reached.
 
         Args:
-            pos (str): The starting position of the knight in algebraic notation.
-            board (GameField): The game board to evaluate move legality.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
+            limit (int | None, optional): Stop counting at this number. Defaults to None (count all).
 
         Returns:
-            list: A list of legal moves available to the knight.
+            int: The number of available moves, at most limit.
         """
-        moves = self._get_moves(pos)
-        result = []
-        for move in moves:
-            figure = board.get_figure(move)
-            if figure is None or figure.color != self.color:
-                result.append(move)
-        return result
+        count = 0
+        for _ in self.iter_moves(pos, board):
+            count += 1
+            if count == limit:
+                break
+        return count
 
 
-class Bishop(Figure):
-    def __str__(self):
-        """Return the Unicode symbol for the bishop."""
-        return "♗" if self.color == "white" else "♝"
+class DefinedFigure(Figure):
+    """A figure whose moves are described declaratively by a PieceDefinition.
 
-    def _get_moves(self, pos: str) -> list[list[str]]:
-        """Compute diagonal moves for the bishop from a given position.
+    Subclasses only set the 'definition' class attribute; the move tables are compiled once
+    when the class is created and the generic generator below is shared by all of them.
 
-        Iterates diagonally until the edge of the board is reached.
+    Attributes:
+        definition (PieceDefinition): The compiled move description of the figure type.
+    """
+
+    definition: PieceDefinition
+
+    def _get_moves(self, pos: str) -> list[list[str]]:
+        """Return the precomputed target squares grouped by ray, ignoring the board.
 
         Args:
-            pos (str): The bishop's starting position in algebraic notation.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
 
         Returns:
-            list[list[str]]: A list of lists, each containing potential diagonal moves.
+            list[list[str]]: A list of rays, each containing potential moves in order of distance.
         """
-        moves = []
-        col = pos[0]
-        row = int(pos[1]) - 1
-        directions = [(1, 1), (-1, -1), (1, -1), (-1, 1)]
-        for dcol, drow in directions:
-            moves_vector = []
-            i = 1
-            while True:
-                new_col = ord(col) + dcol * i
-                new_row = row + drow * i
-                if new_col < ord('a') or new_col > ord('h') or new_row < 0 or new_row > 7:
-                    break
-                moves_vector.append(f"{chr(new_col)}{new_row + 1}")
-                i += 1
-            moves.append(moves_vector)
-        return moves
+        return self.definition.rays(pos, self.color)
 
     def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Determine legal diagonal moves for the bishop by filtering based on obstructions and captures.
+        """Return legal moves for the figure by walking its precomputed move tables.
 
         Args:
-            pos (str): The bishop's starting position in algebraic notation.
-            board (GameField): The game board to validate moves.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
 
         Returns:
-            list: A list of legal moves available to the bishop.
+            list: A list of legal moves for the figure.
         """
-        moves = self._get_moves(pos)
-        result = []
-        for vector in moves:
-            for move in vector:
-                figure = board.get_figure(move)
-                if figure is None:
-                    result.append(move)
-                    continue
-                elif figure.color != self.color:
-                    result.append(move)
-                    break
-                else:
-                    break
-        return result
-
-
-class Queen(Figure):
-    def __str__(self):
-        """Return the Unicode symbol for the queen."""
-        return "♕" if self.color == "white" else "♛"
-
-    def _get_moves(self, pos: str) -> list[list[str]]:
-        """Compute all potential moves for the queen from a given position.
+        return self.definition.generate(pos, self.color, board.data)
 
-        Combines the moves of the rook and bishop.
+    def iter_moves(self, pos: str, board: GameField) -> Iterator[str]:
+        """Lazily yield legal moves for the figure by walking its precomputed move tables.
 
         Args:
-            pos (str): The queen's starting position in algebraic notation.
+            pos (str): The current position in algebraic notation (e.g., 'a1').
+            board (GameField): The game board containing the positions of all figures.
 
-        Returns:
-            list[list[str]]: A list of lists, each containing potential moves.
+        Yields:
+            str: The available moves in generation order.
         """
-        moves = []
-        col = pos[0]
-        row = int(pos[1]) - 1
-        directions = [
-            (1, 0), (-1, 0), (0, 1), (0, -1),
-            (1, 1), (-1, -1), (1, -1), (-1, 1)
-        ]
-        for dcol, drow in directions:
-            moves_vector = []
-            i = 1
-            while True:
-                new_col = ord(col) + dcol * i
-                new_row = row + drow * i
-                if new_col < ord('a') or new_col > ord('h') or new_row < 0 or new_row > 7:
-                    break
-                moves_vector.append(f"{chr(new_col)}{new_row + 1}")
-                i += 1
-            moves.append(moves_vector)
-        return moves
+        return self.definition.iter_generate(pos, self.color, board.data)
 
-    def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Determine legal moves for the queen by filtering moves based on board obstructions and captures.
 
-        Args:
-            pos (str): The queen's starting position in algebraic notation.
-            board (GameField): The game board to validate moves.
+ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (-1, -1), (1, -1), (-1, 1))
+KNIGHT_JUMPS = ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2))
+
+
+class Rook(DefinedFigure):
+    """Rook Figure. Slides any number of squares along ranks and files."""
+
+    definition = PieceDefinition(Slider(ORTHOGONAL))
 
-        Returns:
-            list: A list of legal moves available to the queen.
-        """
-        moves = self._get_moves(pos)
-        result = []
-        for vector in moves:
-            for move in vector:
-                figure = board.get_figure(move)
-                if figure is None:
-                    result.append(move)
-                    continue
-                elif figure.color != self.color:
-                    result.append(move)
-                    break
-                else:
-                    break
-        return result
-
-
-class King(Figure):
     def __str__(self):
-        """Return the Unicode symbol for the king."""
-        return "♔" if self.color == "white" else "♚"
+        """Return the Unicode symbol for the rook."""
+        return "♖" if self.color == "white" else "♜"
 
-    def _get_moves(self, pos: str) -> list:
-        """Compute potential moves for the king from a given position.
 
-        The king can move one square in any direction.
+class Knight(DefinedFigure):
+    """Knight Figure. Jumps in an L-shape pattern over other figures."""
 
-        Args:
-            pos (str): The king's starting position in algebraic notation.
+    definition = PieceDefinition(Leaper(KNIGHT_JUMPS))
 
-        Returns:
-            list: A list of positions the king can move to.
-        """
-        moves = []
-        col = pos[0]
-        row = int(pos[1]) - 1
-        directions = [
-            (0, 1), (0, -1), (1, 0), (1, 1),
-            (1, -1), (-1, 0), (-1, 1), (-1, -1)
-        ]
-        for dcol, drow in directions:
-            new_col = ord(col) + dcol
-            new_row = row + drow
-            if new_col < ord('a') or new_col > ord('h') or new_row < 0 or new_row > 7:
-                continue
-            moves.append(f"{chr(new_col)}{new_row + 1}")
-        return moves
+    def __str__(self):
+        """Return the Unicode symbol for the knight."""
+        return "♘" if self.color == "white" else "♞"
 
-    def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Determine legal moves for the king by filtering out moves blocked by same-colored pieces.
 
-        Args:
-            pos (str): The king's starting position in algebraic notation.
-            board (GameField): The game board used to validate moves.
+class Bishop(DefinedFigure):
+    """Bishop Figure. Slides any number of squares diagonally."""
+
+    definition = PieceDefinition(Slider(DIAGONAL))
+
+    def __str__(self):
+        """Return the Unicode symbol for the bishop."""
+        return "♗" if self.color == "white" else "♝"
 
-        Returns:
-            list: A list of legal moves available to the king.
-        """
-        moves = self._get_moves(pos)
-        result = []
-        for move in moves:
-            figure = board.get_figure(move)
-            if figure is None:
-                result.append(move)
-            elif figure.color != self.color:
-                result.append(move)
-        return result
 
+class Queen(DefinedFigure):
+    """Queen Figure. Combines the moves of the rook and the bishop."""
+
+    definition = PieceDefinition(Slider(ORTHOGONAL + DIAGONAL))
 
-class Pawn(Figure):
     def __str__(self):
-        """Return the Unicode symbol for the pawn."""
-        return "♙" if self.color == "white" else "♟"
+        """Return the Unicode symbol for the queen."""
+        return "♕" if self.color == "white" else "♛"
 
-    def _get_moves(self, pos: str) -> list:
-        """Compute forward moves for the pawn from a given position.
 
-        Accounts for single-step and initial double-step moves based on the pawn's color.
+class King(DefinedFigure):
+    """King Figure. Moves one square in any direction."""
 
-        Args:
-            pos (str): The pawn's starting position in algebraic notation.
+    definition = PieceDefinition(Leaper(((0, 1), (0, -1), (1, 0), (1, 1), (1, -1), (-1, 0), (-1, 1), (-1, -1))))
 
-        Returns:
-            list: A list of potential forward moves for the pawn.
-        """
-        row = int(pos[1]) - 1
-        col = pos[0].lower()
-        moves = []
-        if self.color == "white":
-            direction = 1
-            start_row = 1
-        else:
-            direction = -1
-            start_row = 6
-        next_row = row + direction
-        if 0 <= next_row <= 7:
-            moves.append(f"{col}{next_row + 1}")
-            if row == start_row:
-                next_row2 = row + 2 * direction
-                if 0 <= next_row2 <= 7:
-                    moves.append(f"{col}{next_row2 + 1}")
-        return moves
+    def __str__(self):
+        """Return the Unicode symbol for the king."""
+        return "♔" if self.color == "white" else "♚"
 
-    def get_available_moves(self, pos: str, board: GameField) -> list:
-        """Determine legal moves for the pawn, including diagonal captures.
 
-        Evaluates forward moves and adds diagonal moves if an opponent's piece is present.
+class Pawn(DefinedFigure):
+    """Pawn Figure.
 
-        Args:
-            pos (str): The pawn's starting position in algebraic notation.
-            board (GameField): The game board used to validate moves.
+    Moves one square forward, or two squares from its initial rank if both squares are empty,
+    and captures one square diagonally forward.
+    """
 
-        Returns:
-            list: A list of legal moves available to the pawn.
-        """
-        moves = self._get_moves(pos)
-        result = []
-        for i in range(len(moves)):
-            move = moves[i]
-            move_col = move[0]
-            move_row = move[1]
-            if i == 0:
-                diag_moves = []
-                for num in (-1, 1):
-                    if "a" <= chr(ord(move_col) + num) <= "h":
-                        diag_moves.append(f"{chr(ord(move_col) + num)}{move_row}")
-
-                figure = board.get_figure(move)
-                if figure is None:
-                    result.append(move)
-
-                for diag_move in diag_moves:
-                    figure = board.get_figure(diag_move)
-                    if figure is None:
-                        continue
-                    elif figure.color != self.color:
-                        result.append(diag_move)
-            if i == 1:
-                figure = board.get_figure(move)
-                if figure is None:
-                    result.append(move)
-
-        return result
+    definition = PieceDefinition(
+        Leaper(((0, 1),), MOVE, ranks=(0, 2, 3, 4, 5, 6, 7)),
+        Slider(((0, 1),), MOVE, limit=2, ranks=(1,)),
+        Leaper(((-1, 1), (1, 1)), CAPTURE),
+        relative=True
+    )
+
+    def __str__(self):
+        """Return the Unicode symbol for the pawn."""
+        return "♙" if self.color == "white" else "♟"
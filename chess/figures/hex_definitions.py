@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from .definitions import PieceDefinition
+
+# Glinski's board is a hexagon of 91 cells with 11 files 'a' to 'l' (there is no 'j' file). Files 'a' to 'f'
+# grow from 6 to 11 cells and files 'g' to 'l' shrink back to 6; f1 is the bottom corner and f11 the top one.
+# Cells are addressed by axial coordinates (q, r) with q = file index - 5 and max(|q|, |r|, |q + r|) <= 5;
+# r grows upwards along a file, so 'one rank up' is (0, 1) everywhere on the board.
+
+#: Files of the hexagonal board in order.
+HEX_FILES = "abcdefghikl"
+
+#: The number of cells in every file.
+FILE_LENGTHS = {col: 11 - abs(q - 5) for q, col in enumerate(HEX_FILES)}
+
+#: Cell names by index; cells are numbered file by file from the bottom (a1 = 0, ..., a6 = 5, b1 = 6, ..., l6 = 90).
+CELLS = [f"{col}{row + 1}" for col in HEX_FILES for row in range(FILE_LENGTHS[col])]
+
+#: Cell indices by name.
+CELL_INDEX = {name: index for index, name in enumerate(CELLS)}
+
+#: Axial coordinates by cell index.
+AXIAL = [(HEX_FILES.index(name[0]) - 5, int(name[1:]) - 1 - 5 - min(HEX_FILES.index(name[0]) - 5, 0))
+         for name in CELLS]
+
+#: Cell indices by axial coordinates.
+AXIAL_INDEX = {coords: index for index, coords in enumerate(AXIAL)}
+
+#: The six directions to edge-adjacent cells ('orthogonal' moves of the rook).
+HEX_ORTHOGONAL = ((0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1))
+
+#: The six directions to the nearest cells sharing only a vertex ('diagonal' moves of the bishop).
+HEX_DIAGONAL = ((1, 1), (2, -1), (1, -2), (-1, -1), (-2, 1), (-1, 2))
+
+#: The twelve knight jumps: one orthogonal step followed by one diagonal step away from the start.
+HEX_KNIGHT_JUMPS = ((1, 2), (2, 1), (3, -1), (3, -2), (2, -3), (1, -3),
+                    (-1, -2), (-2, -1), (-3, 1), (-3, 2), (-2, 3), (-1, 3))
+
+
+def mirror(vector: tuple[int, int]) -> tuple[int, int]:
+    """Return a vector reflected across the horizontal axis of the board, i.e. as seen from black's side.
+
+    Args:
+        vector (tuple[int, int]): An axial vector.
+
+    Returns:
+        tuple[int, int]: The mirrored vector.
+    """
+    dq, dr = vector
+    return dq, -dq - dr
+
+
+def _walk(index: int, vector: tuple[int, int]) -> tuple[int, ...]:
+    q, r = AXIAL[index]
+    dq, dr = vector
+    ray = []
+    target = AXIAL_INDEX.get((q + dq, r + dr))
+    while target is not None:
+        ray.append(target)
+        q, r = q + dq, r + dr
+        target = AXIAL_INDEX.get((q + dq, r + dr))
+    return tuple(ray)
+
+
+#: Full rays of cell indices by direction and start cell, for every orthogonal, diagonal and knight vector
+#: in both orientations.
+RAYS: dict[tuple[int, int], list[tuple[int, ...]]] = {
+    vector: [_walk(index, vector) for index in range(len(CELLS))]
+    for vector in {*HEX_ORTHOGONAL, *HEX_DIAGONAL, *HEX_KNIGHT_JUMPS}
+}
+
+#: Edge-adjacent cell indices by cell, in HEX_ORTHOGONAL order; None where the direction leaves the board.
+NEIGHBORS = [tuple(RAYS[vector][index][0] if RAYS[vector][index] else None for vector in HEX_ORTHOGONAL)
+             for index in range(len(CELLS))]
+
+#: Knight jump targets by cell.
+KNIGHT_TARGETS = [tuple(RAYS[vector][index][0] for vector in HEX_KNIGHT_JUMPS if RAYS[vector][index])
+                  for index in range(len(CELLS))]
+
+
+class HexPieceDefinition(PieceDefinition):
+    """A PieceDefinition compiled for the hexagonal board.
+
+    Rule vectors are axial (q, r) offsets; color-relative definitions are mirrored for black with mirror().
+    A hex board has no straight ranks, so a rule's 'ranks' holds the names of the cells it applies on,
+    from white's point of view (mirrored for black as well).
+
+    The tables have the same layout as PieceDefinition.tables, so the shared generator of DefinedFigure
+    works on them unchanged, with columns of different lengths in the board data.
+    """
+
+    square_index = CELL_INDEX
+
+    def _compile(self, direction: int) -> list[tuple]:
+        table = []
+        for index, (q, r) in enumerate(AXIAL):
+            name = CELLS[index] if direction == 1 else CELLS[AXIAL_INDEX[mirror((q, r))]]
+            rays = []
+            for rule in self.rules:
+                if rule.ranks is not None and name not in rule.ranks:
+                    continue
+                for vector in rule.vectors:
+                    if direction == -1:
+                        vector = mirror(vector)
+                    ray = RAYS.get(vector)
+                    ray = ray[index] if ray is not None else _walk(index, vector)
+                    if rule.limit is not None:
+                        ray = ray[:rule.limit]
+                    if ray:
+                        rays.append((rule.mode, tuple((CELLS[target], CELLS[target][0], int(CELLS[target][1:]) - 1)
+                                                      for target in ray)))
+            table.append(tuple(rays))
+        return table
+
@@ -0,0 +1,75 @@
+from .figures import *
+from .hex_definitions import HexPieceDefinition, CELLS, HEX_ORTHOGONAL, HEX_DIAGONAL, HEX_KNIGHT_JUMPS
+
+
+class HexRook(Rook):
+    """Hexagonal Rook Figure. Slides any number of cells towards any of the six adjacent cells."""
+
+    definition = HexPieceDefinition(Slider(HEX_ORTHOGONAL))
+
+    def __str__(self):
+        """Return the Unicode symbol for the rook."""
+        return "♖" if self.color == "white" else "♜"
+
+
+class HexKnight(Knight):
+    """Hexagonal Knight Figure. Jumps one cell orthogonally and then one cell diagonally outwards."""
+
+    definition = HexPieceDefinition(Leaper(HEX_KNIGHT_JUMPS))
+
+    def __str__(self):
+        """Return the Unicode symbol for the knight."""
+        return "♘" if self.color == "white" else "♞"
+
+
+class HexBishop(Bishop):
+    """Hexagonal Bishop Figure. Slides diagonally, always staying on cells of its own color."""
+
+    definition = HexPieceDefinition(Slider(HEX_DIAGONAL))
+
+    def __str__(self):
+        """Return the Unicode symbol for the bishop."""
+        return "♗" if self.color == "white" else "♝"
+
+
+class HexQueen(Queen):
+    """Hexagonal Queen Figure. Combines the moves of the rook and the bishop."""
+
+    definition = HexPieceDefinition(Slider(HEX_ORTHOGONAL + HEX_DIAGONAL))
+
+    def __str__(self):
+        """Return the Unicode symbol for the queen."""
+        return "♕" if self.color == "white" else "♛"
+
+
+class HexKing(King):
+    """Hexagonal King Figure. Moves one cell orthogonally or diagonally."""
+
+    definition = HexPieceDefinition(Leaper(HEX_ORTHOGONAL + HEX_DIAGONAL))
+
+    def __str__(self):
+        """Return the Unicode symbol for the king."""
+        return "♔" if self.color == "white" else "♚"
+
+
+#: Initial cells of white pawns; black pawns start on the mirrored cells.
+HEX_PAWN_CELLS = ("b1", "c2", "d3", "e4", "f5", "g4", "h3", "i2", "k1")
+
+
+class HexPawn(Pawn):
+    """Hexagonal Pawn Figure.
+
+    Moves one cell straight forward, or two cells from its initial cell if both cells are empty,
+    and captures on the two cells adjacent obliquely forward.
+    """
+
+    definition = HexPieceDefinition(
+        Leaper(((0, 1),), MOVE, ranks=[cell for cell in CELLS if cell not in HEX_PAWN_CELLS]),
+        Slider(((0, 1),), MOVE, limit=2, ranks=HEX_PAWN_CELLS),
+        Leaper(((-1, 1), (1, 0)), CAPTURE),
+        relative=True
+    )
+
+    def __str__(self):
+        """Return the Unicode symbol for the pawn."""
+        return "♙" if self.color == "white" else "♟"
@@ -0,0 +1,601 @@
+from __future__ import annotations
+
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterable, Iterator, Literal
+
+from field import GameField
+from figures import *
+from figures.definitions import FILES, SQUARE_INDEX
+from opening_tree import VARIANTS, game_variant
+from pgn import SAN_LETTERS, read_games, replay
+from snapshot import BoardSnapshot
+from training_data import history_outcome
+
+# A compact archive of finished games.
+#
+# A move is stored as its index in the sorted list of moves available to the side to move, which takes one
+# byte (indices from 255 on take two: 255, then index - 255). The moves of standard games that the rules of
+# the game do not have, castling, promotion and en passant, follow the available moves in the list (see
+# special_moves), so PGN games are archived with them. The move streams of block_size consecutive games
+# are concatenated and compressed together as one block; the metadata is kept column by column (white and
+# black player, variant, result, length in plies, size of the move stream in bytes), each column compressed
+# as a whole. File layout:
+#   header          magic and version
+#   blocks          the compressed move blocks, in game order
+#   columns         the compressed metadata columns and block offsets
+#   footer          JSON: compression, block size, game count, variant names, column locations
+#   footer offset   64-bit big-endian offset of the footer
+# Opening an archive loads the metadata columns only. Reading a game decompresses its block, so random access
+# costs one block and a sequential scan reads every block once; move indices are turned into squares only
+# when the moves of a game are replayed.
+
+_MAGIC = b"GARC"
+_VERSION = 1
+_HEADER = struct.Struct(">4sH")
+_FOOTER_OFFSET = struct.Struct(">Q")
+#: Metadata columns with their array type codes; None marks a string column.
+_COLUMNS = {"white": None, "black": None, "variant": "B", "result": "b", "length": "H", "size": "H"}
+#: Move index from which two bytes are used.
+_ESCAPE = 255
+#: Promotion figures by SAN letter, in the order of special_moves.
+PROMOTIONS = "QRBNLTX"
+#: A move of the archive: start and end square, for special moves followed by 'O-O' or 'O-O-O' for castling,
+#: 'ep' for en passant or the SAN letter of the new figure for promotion.
+ArchiveMove = tuple[str, str] | tuple[str, str, str]
+#: Compression codecs by name: compress, decompress. LZMA is raw LZMA2, without the per-block container.
+_LZMA_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 9}]
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, lzma.FORMAT_RAW, filters=_LZMA_FILTERS),
+             lambda data: lzma.decompress(data, lzma.FORMAT_RAW, filters=_LZMA_FILTERS)),
+}
+
+
+def move_list(field: GameField, color: Literal["black", "white"]) -> list[ArchiveMove]:
+    """Return the moves available to a side in the order of the archive move indices.
+
+    Args:
+        field (GameField): The game board.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        list[ArchiveMove]: The moves, sorted by start and end square index.
+    """
+    moves = [(SQUARE_INDEX[pos] * 64 + SQUARE_INDEX[end], pos, end) for pos, figure in field.iter_figures(color)
+             for end in figure.get_available_moves(pos, field)]
+    moves.sort()
+    return [(start, end) for _, start, end in moves]
+
+
+def special_moves(field: GameField, color: Literal["black", "white"]) -> list[ArchiveMove]:
+    """Return the castling, promotion and en passant moves of a side, which follow move_list in the archive.
+
+    The moves are listed whenever the figures stand in place, as apply_san plays them: castling if the King is
+    on the e-file and a Rook in the corner, promotion for every move of a pawn to the last rank, en passant for
+    every pawn beside an opposing pawn with the square behind it empty.
+
+    Args:
+        field (GameField): The game board.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        list[ArchiveMove]: The special moves in a fixed order.
+    """
+    row = 1 if color == "white" else 8
+    step = 1 if color == "white" else -1
+    moves = []
+    king = field.get_figure(f"e{row}")
+    if isinstance(king, King) and king.color == color:
+        for rook_file, king_file, castling in (("h", "g", "O-O"), ("a", "c", "O-O-O")):
+            rook = field.get_figure(f"{rook_file}{row}")
+            if isinstance(rook, Rook) and rook.color == color:
+                moves.append((f"e{row}", f"{king_file}{row}", castling))
+    pawns = sorted((SQUARE_INDEX[pos], pos, figure) for pos, figure in field.iter_figures(color)
+                   if isinstance(figure, Pawn))
+    for _, pos, pawn in pawns:
+        rank = int(pos[1]) + step
+        if not 1 <= rank <= 8:
+            continue
+        if rank == 9 - row:
+            for end in sorted(pawn.get_available_moves(pos, field), key=SQUARE_INDEX.get):
+                moves.extend((pos, end, letter) for letter in PROMOTIONS)
+        for side in (-1, 1):
+            file_index = FILES.index(pos[0]) + side
+            if not 0 <= file_index < 8:
+                continue
+            end = f"{FILES[file_index]}{rank}"
+            passed = field.get_figure(f"{FILES[file_index]}{pos[1]}")
+            if field.get_figure(end) is None and isinstance(passed, Pawn) and passed.color != color:
+                moves.append((pos, end, "ep"))
+    return moves
+
+
+def encode_moves(moves: Iterable[ArchiveMove], start: dict = None) -> bytes:
+    """Packs the moves of a game as a move index stream.
+
+    Args:
+        moves (Iterable[ArchiveMove]): The moves in order, white first.
+        start (dict, optional): The initial board data. Defaults to the standard one.
+
+    Returns:
+        bytes: The move index stream.
+
+    Raises:
+        ValueError: If a move is not available.
+    """
+    field = GameField(start)
+    stream = bytearray()
+    color = "white"
+    for move in moves:
+        move = tuple(move)
+        try:
+            available = move_list(field, color)
+            if len(move) == 2:
+                index = available.index(move)
+            else:
+                index = len(available) + special_moves(field, color).index(move)
+        except ValueError:
+            raise ValueError(f"Move {''.join(move)} is not possible") from None
+        if index < _ESCAPE:
+            stream.append(index)
+        elif index - _ESCAPE < 256:
+            stream += bytes((_ESCAPE, index - _ESCAPE))
+        else:
+            raise ValueError(f"Move index {index} cannot be encoded")
+        _play(field, move)
+        color = "black" if color == "white" else "white"
+    return bytes(stream)
+
+
+def decode_indices(stream: bytes) -> list[int]:
+    """Unpacks a move index stream into move indices.
+
+    Args:
+        stream (bytes): The move index stream.
+
+    Returns:
+        list[int]: The move indices.
+    """
+    indices = []
+    escaped = False
+    for value in stream:
+        if escaped:
+            indices.append(_ESCAPE + value)
+            escaped = False
+        elif value == _ESCAPE:
+            escaped = True
+        else:
+            indices.append(value)
+    return indices
+
+
+def _play(field: GameField, move: ArchiveMove):
+    start, end = move[0], move[1]
+    special = move[2] if len(move) == 3 else ""
+    figure = field.get_figure(start)
+    if special in ("O-O", "O-O-O"):
+        rook_start, rook_end = ("h", "f") if special == "O-O" else ("a", "d")
+        rook = field.get_figure(f"{rook_start}{start[1]}")
+        field.remove_figure(f"{rook_start}{start[1]}")
+        field.set_figure(f"{rook_end}{start[1]}", rook)
+    elif special == "ep":
+        field.remove_figure(f"{end[0]}{start[1]}")
+    elif special:
+        figure = SAN_LETTERS[special](figure.color)
+    field.remove_figure(start)
+    field.set_figure(end, figure)
+
+
+def _pgn_move(san: str, position: BoardSnapshot, start: str, end: str) -> ArchiveMove:
+    # Recovers the special move of a SAN move played by apply_san from the position before it.
+    san = san.rstrip("+#")
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        return start, end, "O-O" if len(san) == 3 else "O-O-O"
+    if san[0] in FILES and san[-1] in PROMOTIONS:
+        return start, end, san[-1]
+    if start[0] != end[0] and isinstance(position.get_figure(start), Pawn) and position.get_figure(end) is None:
+        return start, end, "ep"
+    return start, end
+
+
+def _pack(typecode: str, values: list) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack(typecode: str, data: bytes) -> list:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+class ArchivedGame:
+    """A game read from an archive.
+
+    Attributes:
+        white (str): The white player.
+        black (str): The black player.
+        variant (str): The variant, a key of VARIANTS.
+        result (int): 1 if white won, -1 if black won, 0 for a draw.
+        length (int): The number of plies.
+        stream (bytes): The move index stream.
+    """
+
+    def __init__(self, white: str, black: str, variant: str, result: int, length: int, stream: bytes):
+        """Initializes an ArchivedGame.
+
+        Args:
+            white (str): The white player.
+            black (str): The black player.
+            variant (str): The variant.
+            result (int): The result from white's point of view.
+            length (int): The number of plies.
+            stream (bytes): The move index stream.
+        """
+        self.white = white
+        self.black = black
+        self.variant = variant
+        self.result = result
+        self.length = length
+        self.stream = stream
+
+    def replay(self, field: GameField = None) -> Iterator[tuple[BoardSnapshot, str, str, str]]:
+        """Replays the game, yielding every position before a move together with the move, like pgn.replay.
+
+        Args:
+            field (GameField, optional): The board to play on. Defaults to the initial board of the variant.
+
+        Yields:
+            tuple[BoardSnapshot, str, str, str]: The position, the side to move, and the start and end squares.
+
+        Raises:
+            ValueError: If the stream does not fit the board.
+        """
+        for position, color, move in self._play_through(field):
+            yield position, color, move[0], move[1]
+
+    def moves(self) -> list[ArchiveMove]:
+        """Return the moves of the game, special moves with their kind (see ArchiveMove)."""
+        return [move for _, _, move in self._play_through()]
+
+    def _play_through(self, field: GameField = None) -> Iterator[tuple[BoardSnapshot, str, ArchiveMove]]:
+        if field is None:
+            field = GameField(VARIANTS[self.variant]())
+        color = "white"
+        for index in decode_indices(self.stream):
+            moves = move_list(field, color)
+            if index >= len(moves):
+                moves += special_moves(field, color)
+                if index >= len(moves):
+                    raise ValueError(f"Move index {index} is out of range")
+            move = moves[index]
+            position = field.snapshot()
+            _play(field, move)
+            yield position, color, move
+            color = "black" if color == "white" else "white"
+
+
+class GameArchiveWriter:
+    """Writes games to an archive file.
+
+    Move blocks are written as soon as they are full; the metadata is kept in memory until close(). Use as a
+    context manager or call close() to write the last block, the columns and the footer.
+
+    Attributes:
+        path (str): The archive file.
+        compression (str): The codec name, a key of CODECS.
+        block_size (int): The number of games per move block.
+        count (int): The number of games written so far.
+    """
+
+    def __init__(self, path: str, compression: Literal["zlib", "lzma"] = "lzma", block_size: int = 1024):
+        """Creates an archive file.
+
+        Args:
+            path (str): The archive file; an existing file is replaced.
+            compression (Literal["zlib", "lzma"], optional): The codec. Defaults to "lzma".
+            block_size (int, optional): Games per move block; larger blocks compress better, smaller ones make
+                random access cheaper. Defaults to 1024.
+        """
+        if compression not in CODECS:
+            raise ValueError(f"Unknown compression {compression!r}")
+        self.path = path
+        self.compression = compression
+        self.block_size = block_size
+        self.count = 0
+        self._compress = CODECS[compression][0]
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+        self._columns: dict[str, list] = {name: [] for name in _COLUMNS}
+        self._variants: list[str] = []
+        self._block = bytearray()
+        self._block_offsets: list[int] = []
+
+    def __enter__(self) -> GameArchiveWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_game(self, moves: Iterable[ArchiveMove], result: int, white: str = "", black: str = "",
+                 variant: str = "standard"):
+        """Appends a finished game.
+
+        Args:
+            moves (Iterable[ArchiveMove]): The moves in order, white first.
+            result (int): The result from white's point of view: 1, 0 or -1.
+            white (str, optional): The white player. Defaults to "".
+            black (str, optional): The black player. Defaults to "".
+            variant (str, optional): The variant, a key of VARIANTS. Defaults to "standard".
+
+        Raises:
+            ValueError: If the variant is unknown, the result is invalid or a move is not possible.
+        """
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant {variant!r}")
+        if result not in (1, 0, -1):
+            raise ValueError(f"Invalid result {result!r}")
+        moves = list(moves)
+        stream = encode_moves(moves, VARIANTS[variant]())
+        if variant not in self._variants:
+            self._variants.append(variant)
+        columns = self._columns
+        columns["white"].append(white)
+        columns["black"].append(black)
+        columns["variant"].append(self._variants.index(variant))
+        columns["result"].append(result)
+        columns["length"].append(len(moves))
+        columns["size"].append(len(stream))
+        self._block += stream
+        self.count += 1
+        if self.count % self.block_size == 0:
+            self._flush()
+
+    def add_history(self, history, result: int = None, white: str = "", black: str = "",
+                    variant: str = "standard"):
+        """Appends a finished game given as a MoveHistory.
+
+        Args:
+            history (MoveHistory): The game history; it must start from the initial board of the variant.
+            result (int, optional): The result from white's point of view. Defaults to the side that captured
+                the King, or a draw.
+            white (str, optional): The white player. Defaults to "".
+            black (str, optional): The black player. Defaults to "".
+            variant (str, optional): The variant. Defaults to "standard".
+
+        Raises:
+            ValueError: If the history does not start from the initial board of the variant.
+        """
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant {variant!r}")
+        if history.position(0).to_bytes() != GameField(VARIANTS[variant]()).snapshot().to_bytes():
+            raise ValueError(f"The game does not start from the {variant} position")
+        if result is None:
+            result = history_outcome(history)
+        self.add_game([(move.start_pos, move.end_pos) for move in history], result, white, black, variant)
+
+    def add_pgn(self, path: str) -> tuple[int, int]:
+        """Streams the finished games of a PGN archive into the archive, castling, promotion and en passant included.
+
+        Games without a result, of an unknown variant or that cannot be replayed are skipped.
+
+        Args:
+            path (str): The PGN archive.
+
+        Returns:
+            tuple[int, int]: The number of games added and the number of games skipped.
+        """
+        added = skipped = 0
+        with open(path, encoding="utf-8") as archive:
+            for game in read_games(archive):
+                variant = game_variant(game.tags)
+                if variant is None or game.result is None:
+                    skipped += 1
+                    continue
+                try:
+                    positions = replay(game, GameField(VARIANTS[variant]()))
+                    moves = [_pgn_move(san, position, start, end)
+                             for san, (position, _, start, end) in zip(game.moves, positions)]
+                    self.add_game(moves, game.result, game.tags.get("White", ""), game.tags.get("Black", ""),
+                                  variant)
+                except ValueError:
+                    skipped += 1
+                    continue
+                added += 1
+        return added, skipped
+
+    def close(self):
+        """Writes the last block, the columns and the footer, and closes the file."""
+        if self._file.closed:
+            return
+        if self._block or not self._block_offsets:
+            self._flush()
+        file = self._file
+        self._block_offsets.append(file.tell())
+        locations = {}
+        for name, typecode in {**_COLUMNS, "blocks": "Q"}.items():
+            values = self._block_offsets if name == "blocks" else self._columns[name]
+            if typecode is None:
+                data = "\0".join(values).encode("utf-8")
+            else:
+                data = _pack(typecode, values)
+            locations[name] = [file.tell(), file.write(self._compress(data))]
+        footer = {
+            "compression": self.compression,
+            "block_size": self.block_size,
+            "count": self.count,
+            "variants": self._variants,
+            "columns": locations,
+        }
+        footer_offset = file.tell()
+        file.write(json.dumps(footer).encode("utf-8"))
+        file.write(_FOOTER_OFFSET.pack(footer_offset))
+        file.close()
+
+    def _flush(self):
+        self._block_offsets.append(self._file.tell())
+        self._file.write(self._compress(bytes(self._block)))
+        self._block.clear()
+
+
+class GameArchive:
+    """Read access to an archive file: games by number and sequential scans.
+
+    Attributes:
+        path (str): The archive file.
+        compression (str): The codec name.
+        block_size (int): The number of games per move block.
+        variants (list[str]): The variants of the archive, by variant code.
+    """
+
+    def __init__(self, path: str):
+        """Opens an archive file and loads its metadata columns.
+
+        Args:
+            path (str): A file written by GameArchiveWriter.
+
+        Raises:
+            ValueError: If the file is not an archive.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        magic, version = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a game archive")
+        self._file.seek(-_FOOTER_OFFSET.size, os.SEEK_END)
+        end = self._file.tell()
+        footer_offset, = _FOOTER_OFFSET.unpack(self._file.read(_FOOTER_OFFSET.size))
+        self._file.seek(footer_offset)
+        footer = json.loads(self._file.read(end - footer_offset))
+        self.compression = footer["compression"]
+        self.block_size = footer["block_size"]
+        self.variants = footer["variants"]
+        self._count = footer["count"]
+        self._decompress = CODECS[self.compression][1]
+        self._columns: dict[str, list] = {}
+        for name, typecode in {**_COLUMNS, "blocks": "Q"}.items():
+            offset, size = footer["columns"][name]
+            self._file.seek(offset)
+            data = self._decompress(self._file.read(size))
+            if typecode is None:
+                self._columns[name] = data.decode("utf-8").split("\0") if self._count else []
+            else:
+                self._columns[name] = _unpack(typecode, data)
+        self._cached_block = -1
+        self._cached_data = b""
+        self._cached_offsets: list[int] = []
+
+    def __enter__(self) -> GameArchive:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of games."""
+        return self._count
+
+    def __getitem__(self, index: int) -> ArchivedGame:
+        """Return a game by number; decompresses its block unless it is the last one read."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        block, row = divmod(index, self.block_size)
+        if block != self._cached_block:
+            self._cached_data, self._cached_offsets = self._read_block(block)
+            self._cached_block = block
+        offsets = self._cached_offsets
+        return self._game(index, self._cached_data[offsets[row]:offsets[row + 1]])
+
+    def __iter__(self) -> Iterator[ArchivedGame]:
+        """Yields the games in order, reading every block once."""
+        for block in range((self._count + self.block_size - 1) // self.block_size):
+            data, offsets = self._read_block(block)
+            first = block * self.block_size
+            for row in range(len(offsets) - 1):
+                yield self._game(first + row, data[offsets[row]:offsets[row + 1]])
+
+    def column(self, name: str) -> list:
+        """Return a metadata column without reading any moves.
+
+        Args:
+            name (str): 'white', 'black', 'variant', 'result' or 'length'.
+
+        Returns:
+            list: The values of every game, in game order; variants as names.
+        """
+        if name == "variant":
+            return [self.variants[code] for code in self._columns[name]]
+        if name not in _COLUMNS or name == "size":
+            raise KeyError(name)
+        return list(self._columns[name])
+
+    def close(self):
+        """Releases the file."""
+        self._file.close()
+
+    def _read_block(self, block: int) -> tuple[bytes, list[int]]:
+        start, end = self._columns["blocks"][block:block + 2]
+        self._file.seek(start)
+        data = self._decompress(self._file.read(end - start))
+        offsets = [0]
+        for size in self._columns["size"][block * self.block_size:(block + 1) * self.block_size]:
+            offsets.append(offsets[-1] + size)
+        return data, offsets
+
+    def _game(self, index: int, stream: bytes) -> ArchivedGame:
+        columns = self._columns
+        return ArchivedGame(columns["white"][index], columns["black"][index],
+                            self.variants[columns["variant"][index]], columns["result"][index],
+                            columns["length"][index], stream)
+
+
+if __name__ == "__main__":
+    import argparse
+    import copy
+    import time
+
+    from training_data import self_play
+
+    parser = argparse.ArgumentParser(description="Write and read compact archives of finished games.")
+    parser.add_argument("archive", help="archive file")
+    parser.add_argument("--pgn", action="append", default=[], metavar="PATH", help="PGN archive to convert")
+    parser.add_argument("--self-play", type=int, default=0, metavar="N", help="random self-play games to add")
+    parser.add_argument("--author", action="store_true", help="self-play from the author figures position")
+    parser.add_argument("--compression", default="lzma", choices=sorted(CODECS), help="codec")
+    parser.add_argument("--block-size", type=int, default=1024, help="games per move block")
+    parser.add_argument("--game", type=int, help="print the moves of this game")
+    args = parser.parse_args()
+
+    if args.pgn or args.self_play:
+        with GameArchiveWriter(args.archive, args.compression, args.block_size) as writer:
+            for pgn_path in args.pgn:
+                added_games, skipped_games = writer.add_pgn(pgn_path)
+                print(f"{added_games} games added from {pgn_path}, {skipped_games} skipped")
+            for _ in range(args.self_play):
+                samples, outcome = self_play(start=copy.deepcopy(AUTHOR_FIELD) if args.author else None)
+                writer.add_game([(start, end) for _, _, start, end in samples], outcome,
+                                variant="author" if args.author else "standard")
+    with GameArchive(args.archive) as archive:
+        started = time.perf_counter()
+        plies = sum(game.length for game in archive)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(args.archive)
+        print(f"{len(archive)} games, {plies} plies, {size} bytes ({size / max(len(archive), 1):.1f} per game), "
+              f"read in {elapsed:.3f} s")
+        if args.game is not None:
+            found = archive[args.game]
+            notation = " ".join(move[0] + move[1] + "".join(f"({kind})" for kind in move[2:]) for move in found.moves())
+            print(f"{found.white or '?'} - {found.black or '?'} ({found.variant}, {found.result}): {notation}")
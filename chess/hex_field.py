@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from typing import Iterator, Literal
+
+from figures import HexPawn, HexRook, HexKnight, HexBishop, HexQueen, HexKing, Figure
+from figures.hex_definitions import AXIAL, CELL_INDEX, CELLS, FILE_LENGTHS, HEX_FILES
+from snapshot import BoardSnapshot
+
+
+class HexBoardSnapshot(BoardSnapshot):
+    """An immutable position of the hexagonal board.
+
+    The byte format of BoardSnapshot describes the 8x8 board only, so hexagonal snapshots cannot be serialized;
+    equality and hashing compare the figure type and color of every cell instead.
+    """
+
+    __slots__ = ()
+
+    def to_bytes(self) -> bytes:
+        """Raises ValueError: hexagonal snapshots have no byte format."""
+        raise ValueError("Snapshots of the hexagonal board cannot be serialized")
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> HexBoardSnapshot:
+        """Raises ValueError: hexagonal snapshots have no byte format."""
+        raise ValueError("Snapshots of the hexagonal board cannot be serialized")
+
+    def _cells(self) -> tuple:
+        # The comparison key, cached in the slot that holds the byte string of 8x8 snapshots.
+        if self._key is None:
+            self._key = tuple((col, tuple(None if figure is None else (type(figure), figure.color)
+                                          for figure in column))
+                              for col, column in self.data.items())
+        return self._key
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardSnapshot):
+            return NotImplemented
+        return isinstance(other, HexBoardSnapshot) and self._cells() == other._cells()
+
+    def __hash__(self) -> int:
+        return hash(self._cells())
+
+
+class HexGameField:
+    """Represents the board of Glinski's hexagonal chess.
+
+    The board data has the same layout as GameField.data, columns 'a' to 'l' (without 'j') mapped to lists
+    of figures or None, but the columns have 6 to 11 cells. Cell geometry lives in figures.hex_definitions,
+    where all neighbor, ray and knight tables are computed once at import.
+    """
+
+    def __init__(self, data=None):
+        """Initializes the HexGameField.
+
+        Args:
+            data (Optional[dict]): A dictionary representing the board state, where keys are
+                column letters and values are lists of cells. Defaults to None (the starting position).
+        """
+        if data is None:
+            self.data = self.initialize_field()
+        else:
+            self.data = data
+
+    @staticmethod
+    def initialize_field():
+        """Initializes the game field with Glinski's starting position.
+
+        Returns:
+            dict: A dictionary mapping columns 'a' to 'l' to lists of pieces or None.
+        """
+        field = {col: [None] * length for col, length in FILE_LENGTHS.items()}
+        white = {
+            "g1": HexKing, "e1": HexQueen, "c1": HexRook, "i1": HexRook, "d1": HexKnight, "h1": HexKnight,
+            "f1": HexBishop, "f2": HexBishop, "f3": HexBishop,
+            "b1": HexPawn, "c2": HexPawn, "d3": HexPawn, "e4": HexPawn, "f5": HexPawn,
+            "g4": HexPawn, "h3": HexPawn, "i2": HexPawn, "k1": HexPawn,
+        }
+        for cell, figure_class in white.items():
+            col, row = cell[0], int(cell[1:]) - 1
+            field[col][row] = figure_class("white")
+            field[col][FILE_LENGTHS[col] - 1 - row] = figure_class("black")
+        return field
+
+    @classmethod
+    def from_snapshot(cls, snapshot: BoardSnapshot) -> HexGameField:
+        """Creates a mutable board from a snapshot.
+
+        Args:
+            snapshot (BoardSnapshot): The position to start from, taken with snapshot().
+
+        Returns:
+            HexGameField: A new board with its own copy of the snapshot data.
+        """
+        return cls(snapshot.to_data())
+
+    def snapshot(self) -> HexBoardSnapshot:
+        """Returns an immutable snapshot of the current position, e.g. for MoveHistory.
+
+        Returns:
+            HexBoardSnapshot: The snapshot of the board.
+        """
+        return HexBoardSnapshot({col: tuple(column) for col, column in self.data.items()})
+
+    def get_figure(self, move: str) -> Figure | None:
+        """Retrieves the figure at the specified cell.
+
+        Args:
+            move (str): The cell in Glinski notation (e.g., 'f10').
+
+        Returns:
+            Figure or None: The figure at the given cell, or None if the cell is empty.
+        """
+        return self.data[move[0].lower()][int(move[1:]) - 1]
+
+    def remove_figure(self, move: str):
+        """Removes the figure from the specified cell.
+
+        Args:
+            move (str): The cell in Glinski notation.
+        """
+        self.data[move[0].lower()][int(move[1:]) - 1] = None
+
+    def set_figure(self, move: str, figure: Figure):
+        """Places a figure at the specified cell.
+
+        Args:
+            move (str): The cell in Glinski notation.
+            figure (Figure): The figure to place.
+        """
+        self.data[move[0].lower()][int(move[1:]) - 1] = figure
+
+    def iter_figures(self, color: Literal["black", "white"] = None) -> Iterator[tuple[str, Figure]]:
+        """Lazily yields the figures on the board with their cells.
+
+        Args:
+            color (Literal["black", "white"], optional): Yield only figures of this color. Defaults to None (all).
+
+        Yields:
+            tuple[str, Figure]: The cell in Glinski notation and the figure standing on it.
+        """
+        for col, column in self.data.items():
+            for row, figure in enumerate(column):
+                if figure is not None and (color is None or figure.color == color):
+                    yield f"{col}{row + 1}", figure
+
+    @staticmethod
+    def is_cell(move: str) -> bool:
+        """Checks whether a string names a cell of the board.
+
+        Args:
+            move (str): The string to check (e.g., 'F10').
+
+        Returns:
+            bool: True if the string is a valid cell name.
+        """
+        return move.lower() in CELL_INDEX
+
+    def print_field(self, marked: list[str] = (), mark: str = "*"):
+        """Prints the board as a hexagon, white at the bottom.
+
+        Every file is a column; neighboring files are shifted by half a cell, so each text line
+        holds every other file.
+
+        Args:
+            marked (list[str], optional): Cells to print as the mark instead of their content. Defaults to ().
+            mark (str, optional): The mark symbol. Defaults to '*'.
+        """
+        lines = {}
+        for index, (q, r) in enumerate(AXIAL):
+            cell = CELLS[index]
+            figure = self.get_figure(cell)
+            if cell in marked:
+                symbol = mark
+            else:
+                symbol = "." if figure is None else str(figure)
+            lines.setdefault(2 * r + q, {})[q] = symbol
+        header = " ".join(HEX_FILES.upper())
+        print(f"   {header}")
+        for y in range(10, -11, -1):
+            print("   " + " ".join(lines[y].get(q, " ") for q in range(-5, 6)))
+        print(f"   {header}")
+
+    def print_field_with_hints(self, figure: Figure, position: str):
+        """Prints the board with the available moves of a figure marked with an asterisk (*).
+
+        Args:
+            figure (Figure): The figure whose moves are shown.
+            position (str): The cell of the figure in Glinski notation.
+        """
+        self.print_field(figure.get_available_moves(position, self))
+
+    def print_dangered_field(self, dangered_positions: list[str]):
+        """Prints the board with the cells of threatened figures marked with a danger symbol (❗).
+
+        Args:
+            dangered_positions (list[str]): The cells considered dangered.
+        """
+        self.print_field(dangered_positions, "❗")
@@ -0,0 +1,47 @@
+from hex_field import HexGameField
+from main import GameController, Player
+
+
+class HexGameController(GameController):
+    """Controls the flow of a game of Glinski's hexagonal chess.
+
+    The game flow of GameController is reused as is, history included; only the board and the cell notation differ.
+    """
+
+    def __init__(self, game_field: HexGameField = None, players: tuple[Player] = None):
+        """Initializes a HexGameController instance.
+
+        Args:
+            game_field (HexGameField, optional): The game board. Defaults to the starting position.
+            players (tuple[Player], optional): The tuple of players. Defaults to None.
+        """
+        super().__init__(HexGameField() if game_field is None else game_field, players)
+
+    @staticmethod
+    def _check_position_syntax(pos: str) -> bool:
+        """Checks if a position entered by the user names a cell of the hexagonal board."""
+        return HexGameField.is_cell(pos)
+
+    def find_dangered_figures(self, player: Player) -> list[str]:
+        """Find cells where the player's figures can be captured by an enemy figure.
+
+        Args:
+            player (Player): The player whose figures are being assessed for threats.
+
+        Returns:
+            list[str]: The cells of the threatened figures.
+        """
+        result = set()
+        for pos, figure in self.game_field.iter_figures():
+            if figure.color == player.color:
+                continue
+            for move in figure.iter_moves(pos, self.game_field):
+                target = self.game_field.get_figure(move)
+                if target is not None and target.color == player.color:
+                    result.add(move)
+        return list(result)
+
+
+if __name__ == "__main__":
+    game = HexGameController()
+    game.start_game()
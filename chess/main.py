@@ -1,9 +1,15 @@
 import os
 
+from itertools import islice
 from typing import Literal
 
+from analysis import annotate_game
+from engine import ChessEngine, Ponderer
+from evaluation import static_exchange
 from field import GameField
 from figures import *
+from profiler import PROFILER
+from snapshot import BoardSnapshot
 
 
 class Player:
@@ -25,13 +31,38 @@ class Player:
         self.color: Literal["black", "white"] = color
 
 
+class ComputerPlayer(Player):
+    """Represents a player whose moves are chosen by a ChessEngine.
+
+    While the opponent is choosing a move, the engine ponders on the expected reply. Any engine with the
+    same search() method can be used instead, e.g. mcts.MCTSEngine with ponder=False.
+
+    Attributes:
+        engine (ChessEngine): The engine searching the player's moves.
+        ponderer (Ponderer | None): The background search, or None if pondering is off.
+    """
+
+    def __init__(self, name, color: Literal["black", "white"], engine: ChessEngine = None, ponder: bool = True):
+        """Initializes a new ComputerPlayer instance.
+
+        Args:
+            name (str): The name of the player.
+            color (Literal["black", "white"]): The color assigned to the player.
+            engine (ChessEngine, optional): The engine to use. Defaults to a new ChessEngine.
+            ponder (bool, optional): Search while the opponent thinks. Defaults to True.
+        """
+        super().__init__(name, color)
+        self.engine = engine or ChessEngine()
+        self.ponderer = Ponderer(self.engine) if ponder else None
+
+
 class GameController:
     """Controls the flow of the chess game.
 
     Attributes:
         game_field (GameField): The game board.
         players (tuple[Player]): Tuple containing the players.
-        move_history (list): History of moves made during the game.
+        move_history (MoveHistory): History of moves made during the game.
         king_killed (bool): Flag indicating if the king has been captured.
     """
 
@@ -46,7 +77,7 @@ class GameController:
             game_field = GameField()
         self.game_field = game_field
         self.players = players
-        self.move_history = []
+        self.move_history = MoveHistory(self.game_field.snapshot())
         self.king_killed = False
 
     @staticmethod
@@ -61,19 +92,30 @@ class GameController:
         """Creates players by prompting the user for their names.
 
         This method asks the user to input names for both white and black players and assigns their respective colors.
+        On the 8x8 board the black side can be played by the computer instead.
         """
         players = []
         name = input("1 игрок (белые) – назовите ваше имя: ")
         players.append(Player(name, color="white"))
-        name = input("2 игрок (чёрные) – назовите ваше имя: ")
-        players.append(Player(name, color="black"))
+        answer = input("Играть против компьютера? (да/нет): ") if self._engine_available() else ""
+        if answer.strip().lower() in ("да", "д", "y", "yes"):
+            players.append(ComputerPlayer("Компьютер", color="black"))
+        else:
+            name = input("2 игрок (чёрные) – назовите ваше имя: ")
+            players.append(Player(name, color="black"))
         self.players = players
 
+    def _engine_available(self) -> bool:
+        """Checks whether ChessEngine can play on the board; it handles the 8x8 GameField only."""
+        return isinstance(self.game_field, GameField)
+
     def find_dangered_figures(self, player: Player) -> list[str]:
         """Find board positions where the player's figures are under threat.
 
         This method scans the entire board to determine all potential moves available to enemy pieces.
-        It then checks which of these moves target squares occupied by the player's figures, indicating that those pieces are in danger of being captured.
+        It then checks which of these moves target squares occupied by the player's figures, and keeps only
+        the figures that would actually lose material: the exchange on their square is resolved with
+        static_exchange, so a defended figure attacked by a more valuable piece is not in danger.
 
         Args:
             player (Player): The player whose figures are being assessed for threats.
@@ -96,17 +138,24 @@ class GameController:
                         if len(available_moves) > 0:
                             enemy_possible_moves.update(available_moves)
 
+        enemy_color = "black" if player.color == "white" else "white"
         result = set()
         for enemy_move in enemy_possible_moves:
             targeted_figure = self.game_field.get_figure(enemy_move)
             if targeted_figure is None:
                 continue
             else:
-                if targeted_figure.color == player.color:
+                if (targeted_figure.color == player.color
+                        and static_exchange(self.game_field, enemy_move, enemy_color) > 0):
                     result.add(enemy_move)
 
         return list(result)
 
+    @staticmethod
+    def _check_position_syntax(pos: str) -> bool:
+        """Checks if a position entered by the user names a square of the board."""
+        return Move.check_first_move_syntax(pos)
+
     def choose_figure(self, player: Player) -> tuple[Figure, str]:
         """Prompts the user to select a figure to move.
 
@@ -123,7 +172,7 @@ class GameController:
         print("Выберите пешку (D2)")
         start_pos = input().lower()
         result = None
-        if not Move.check_first_move_syntax(start_pos):
+        if not self._check_position_syntax(start_pos):
             print("Некорректный ввод.")
             result, start_pos = self.choose_figure(player)
 
@@ -137,8 +186,7 @@ class GameController:
                     print("В выбранной клетка пешка противника, выберите другую клетку.")
                     result, start_pos = self.choose_figure(player)
                 else:
-                    available_moves = chosen_figure.get_available_moves(start_pos, self.game_field)
-                    if len(available_moves) == 0:
+                    if not chosen_figure.has_any_move(start_pos, self.game_field):
                         print("Данная фигура не может ходить, выберите другую фигуру.")
                         result, start_pos = self.choose_figure(player)
                     else:
@@ -173,25 +221,91 @@ class GameController:
         This method orchestrates the process of selecting a figure and its target position, updates the game board,
         checks if a king has been captured, and records the move in the move history.
 
+        A computer player's move is chosen by its engine instead of prompting.
+
         Args:
             player (Player): The player making the move.
         """
-        chosen_figure, start_pos = self.choose_figure(player)
-        self.game_field.print_field_with_hints(chosen_figure, start_pos)
-        end_pos = self.choose_end_pos(chosen_figure, start_pos)
+        if isinstance(player, ComputerPlayer):
+            start_pos, end_pos = self._computer_move(player)
+            chosen_figure = self.game_field.get_figure(start_pos)
+            print(f"Компьютер ходит {start_pos}{end_pos}")
+        else:
+            chosen_figure, start_pos = self.choose_figure(player)
+            self.game_field.print_field_with_hints(chosen_figure, start_pos)
+            end_pos = self.choose_end_pos(chosen_figure, start_pos)
 
         end_pos_figure = self.game_field.get_figure(end_pos)
         self.game_field.remove_figure(start_pos)
         if isinstance(end_pos_figure, King):
             self.king_killed = True
         self.game_field.set_figure(end_pos, chosen_figure)
-        self.move_history.append(Move(start_pos, end_pos, chosen_figure))
+        self.move_history.append(Move(start_pos, end_pos, chosen_figure, end_pos_figure))
+
+    def _computer_move(self, player: ComputerPlayer) -> tuple[str, str]:
+        """Searches the move of a computer player and starts pondering on the expected reply.
+
+        If the engine was pondering and the opponent played the expected reply, the ponder search
+        becomes the search of this move; otherwise it is cancelled and a new search is started.
+
+        Args:
+            player (ComputerPlayer): The player to move.
+
+        Returns:
+            tuple[str, str]: The start and end positions of the chosen move.
+        """
+        result = None
+        if player.ponderer is not None and player.ponderer.active and len(self.move_history):
+            last = self.move_history[-1]
+            result = player.ponderer.finish((last.start_pos, last.end_pos))
+        if result is None:
+            result = player.engine.search(self.game_field, player.color)
+        start_pos, end_pos = result.move
+        reply = result.ponder
+        captures_king = isinstance(self.game_field.get_figure(end_pos), King)
+        if player.ponderer is not None and reply is not None and not captures_king:
+            player.ponderer.start(self.game_field.snapshot().move_figure(start_pos, end_pos), reply, player.color)
+        return start_pos, end_pos
+
+    def undo_moves(self, n: int = 1):
+        """Takes back the last n moves.
+
+        Args:
+            n (int, optional): The number of moves to take back. Defaults to 1.
+        """
+        self._restore(self.move_history.undo(n))
+
+    def redo_moves(self, n: int = 1):
+        """Replays n moves that were taken back.
+
+        Args:
+            n (int, optional): The number of moves to replay. Defaults to 1.
+        """
+        self._restore(self.move_history.redo(n))
+
+    def go_to_ply(self, ply: int):
+        """Sets the board to the position after the given number of moves.
+
+        Args:
+            ply (int): The number of moves from the start of the game.
+        """
+        self._restore(self.move_history.seek(ply))
+
+    def _stop_pondering(self):
+        for player in self.players or ():
+            if isinstance(player, ComputerPlayer) and player.ponderer is not None:
+                player.ponderer.stop()
+
+    def _restore(self, snapshot: BoardSnapshot):
+        self._stop_pondering()
+        self.game_field = type(self.game_field).from_snapshot(snapshot)
+        self.king_killed = False
 
     def start_game(self):
         """Starts and runs the chess game until a king is captured.
 
         This method handles the game loop, alternating moves between players, updating the board,
-        and declaring the winner when the game ends.
+        and declaring the winner when the game ends. On the 8x8 board the game can then be analyzed.
         """
         print("Привет! Это игра в шахматы, правила игры: Белые начинают первыми. Удачи!")
         if self.players is None:
@@ -207,8 +321,31 @@ class GameController:
                 if self.king_killed:
                     winner = player
                     break
+        self._stop_pondering()
         print(f"Победил {winner.name}! Пешки цвета {winner.color} оказались сильнее!")
         print(f"Всего сделано: {len(self.move_history)} ходов")
+        if not self._engine_available():
+            return
+        if input("Проанализировать партию? (да/нет): ").strip().lower() in ("да", "д", "y", "yes"):
+            self.analyze_game()
+
+    def analyze_game(self, depth: int = 3, workers: int = None):
+        """Replays the game and prints every move; blunders, mistakes and inaccuracies get the better move.
+
+        The positions are searched in parallel, see analysis.annotate_game.
+
+        Args:
+            depth (int, optional): The search depth of every position. Defaults to 3.
+            workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+        Raises:
+            ValueError: If the game is not played on the 8x8 board, which the engine cannot search.
+        """
+        if not self._engine_available():
+            raise ValueError("Game analysis supports the 8x8 board only")
+        print("Анализ партии...")
+        for annotation in annotate_game(self.move_history, depth, workers):
+            print(annotation)
 
 
 class Move:
@@ -218,19 +355,22 @@ class Move:
         start_pos (str): The starting position of the move.
         end_pos (str): The ending position of the move.
         moving_figure (Figure): The chess figure that is moved.
+        captured_figure (Figure | None): The figure taken by the move, if any.
     """
 
-    def __init__(self, start_pos, end_pos, moving_figure: Figure):
+    def __init__(self, start_pos, end_pos, moving_figure: Figure, captured_figure: Figure = None):
         """Initializes a Move instance.
 
         Args:
             start_pos (str): The starting position of the move.
             end_pos (str): The ending position of the move.
             moving_figure (Figure): The figure that is moved.
+            captured_figure (Figure, optional): The figure taken by the move. Defaults to None.
         """
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.moving_figure = moving_figure
+        self.captured_figure = captured_figure
 
     @staticmethod
     def check_syntax(move: str):
@@ -279,20 +419,148 @@ class Move:
         pass
 
 
-# class MoveHistory:
-#     """WIP"""
-#     def __init__(self):
-#         self.history = []
-#
-#     def undo(self, n):
-#         for _ in range(n):
-#             self.history.pop()
-#         print("Done!")
+class MoveHistory:
+    """History of a game that can jump to any ply.
+
+    Besides the list of moves, the board position is stored as a snapshot every checkpoint_interval plies,
+    so reaching any ply costs at most checkpoint_interval move applications. The last reached position is
+    cached as well, so stepping through a replay costs one move application per step.
+
+    Moves that were undone are kept until a new move is appended, so they can be redone.
+
+    Attributes:
+        moves (list[Move]): All recorded moves, including the undone ones.
+        checkpoints (list[BoardSnapshot]): The position after every checkpoint_interval plies, starting with ply 0.
+        checkpoint_interval (int): The number of plies between checkpoints.
+        ply (int): The number of moves played to reach the current position.
+    """
+
+    def __init__(self, initial: BoardSnapshot, checkpoint_interval: int = 16):
+        """Initializes a MoveHistory.
+
+        Args:
+            initial (BoardSnapshot): The position at the start of the game.
+            checkpoint_interval (int, optional): The number of plies between checkpoints. Defaults to 16.
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be positive")
+        self.moves: list[Move] = []
+        self.checkpoints: list[BoardSnapshot] = [initial]
+        self.checkpoint_interval = checkpoint_interval
+        self.ply = 0
+        self._cursor_ply = 0
+        self._cursor = initial
+
+    def __len__(self) -> int:
+        """Return the number of moves played to reach the current position."""
+        return self.ply
+
+    def __iter__(self):
+        """Iterate over the moves played to reach the current position."""
+        return islice(self.moves, self.ply)
+
+    def __getitem__(self, index):
+        """Return a move played to reach the current position; negative indices count back from the current ply."""
+        if isinstance(index, slice):
+            return self.moves[:self.ply][index]
+        if index < 0:
+            index += self.ply
+        if not 0 <= index < self.ply:
+            raise IndexError("MoveHistory index out of range")
+        return self.moves[index]
+
+    def append(self, move: Move):
+        """Records a move played from the current position; undone moves are discarded.
+
+        Args:
+            move (Move): The move that was played.
+        """
+        if self.ply < len(self.moves):
+            del self.moves[self.ply:]
+            del self.checkpoints[self.ply // self.checkpoint_interval + 1:]
+        position = self.position(self.ply)
+        self.moves.append(move)
+        self.ply += 1
+        self._cursor = position.move_figure(move.start_pos, move.end_pos)
+        self._cursor_ply = self.ply
+        if self.ply % self.checkpoint_interval == 0:
+            self.checkpoints.append(self._cursor)
+
+    def position(self, ply: int) -> BoardSnapshot:
+        """Return the position after the given number of recorded moves without changing the current ply.
+
+        Args:
+            ply (int): The number of moves from the start of the game.
+
+        Returns:
+            BoardSnapshot: The position at that ply.
+
+        Raises:
+            IndexError: If the ply is outside the recorded game.
+        """
+        if not 0 <= ply <= len(self.moves):
+            raise IndexError(f"Ply {ply} is outside the game (0-{len(self.moves)})")
+        start_ply = ply // self.checkpoint_interval * self.checkpoint_interval
+        position = self.checkpoints[ply // self.checkpoint_interval]
+        if start_ply <= self._cursor_ply <= ply:
+            start_ply = self._cursor_ply
+            position = self._cursor
+        for move in self.moves[start_ply:ply]:
+            position = position.move_figure(move.start_pos, move.end_pos)
+        self._cursor_ply = ply
+        self._cursor = position
+        return position
+
+    def seek(self, ply: int) -> BoardSnapshot:
+        """Moves the current position to the given ply.
+
+        Args:
+            ply (int): The number of moves from the start of the game.
+
+        Returns:
+            BoardSnapshot: The position at that ply.
+        """
+        position = self.position(ply)
+        self.ply = ply
+        return position
+
+    def undo(self, n: int = 1) -> BoardSnapshot:
+        """Takes back n moves, but not past the start of the game.
+
+        Args:
+            n (int, optional): The number of moves. Defaults to 1.
+
+        Returns:
+            BoardSnapshot: The new current position.
+        """
+        return self.seek(max(0, self.ply - n))
+
+    def redo(self, n: int = 1) -> BoardSnapshot:
+        """Replays n undone moves, but not past the last recorded move.
+
+        Args:
+            n (int, optional): The number of moves. Defaults to 1.
+
+        Returns:
+            BoardSnapshot: The new current position.
+        """
+        return self.seek(min(len(self.moves), self.ply + n))
 
 
 if __name__ == "__main__":
+    # CHESS_PROFILE=<path> enables instrumentation and writes collapsed stacks to <path> on exit.
+    profile_path = os.environ.get("CHESS_PROFILE")
+    if profile_path:
+        PROFILER.enable(GameController, GameField, Figure)
+        PROFILER.start_periodic_dump(float(os.environ.get("CHESS_PROFILE_INTERVAL", "30")))
     game = GameController()
-    game.start_game()
+    try:
+        game.start_game()
+    finally:
+        if profile_path:
+            PROFILER.stop_periodic_dump()
+            PROFILER.dump()
+            PROFILER.write_collapsed(profile_path)
     # custom_game_field = GameField(AUTHOR_FIELD)
     # custom_game = GameController(custom_game_field)
     # custom_game.start_game()
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Literal
+
+from engine import ChessMove, SearchResult
+from evaluation import type_value
+from field import GameField
+from figures import *
+from profiler import PROFILER
+from snapshot import BoardSnapshot
+
+# Monte Carlo tree search. The tree lives in the calling process; leaves are scored by random playouts
+# ("rollouts") that run in a pool of worker processes, so they scale past the interpreter lock. While a
+# rollout is in flight its path carries a virtual loss, which steers the following selections to other
+# leaves, so the workers explore different lines instead of waiting on the same one.
+#
+# Values are stored from the point of view of the side that made the move leading to a node, in [-1, 1].
+
+#: Centipawns of static evaluation that map to a value of tanh(1) when a rollout is cut off.
+VALUE_SCALE = 400
+
+
+def _other(color: str) -> str:
+    return "black" if color == "white" else "white"
+
+
+def _legal_moves(field: GameField, color: str) -> list[ChessMove]:
+    return [(pos, end) for pos, figure in field.iter_figures(color) for end in figure.get_available_moves(pos, field)]
+
+
+def rollout(position: bytes, color: str, max_plies: int, seed: int) -> float:
+    """Plays a random game from a position; runs in a worker process.
+
+    A King capture is always played when available, and captures are preferred over quiet moves, which keeps
+    the playouts from walking past free material. A game still running after max_plies is scored statically.
+
+    Args:
+        position (bytes): The position, serialized with BoardSnapshot.to_bytes.
+        color (str): The side to move.
+        max_plies (int): The playout length.
+        seed (int): The random seed of the playout.
+
+    Returns:
+        float: The result from white's point of view, in [-1, 1].
+    """
+    generator = random.Random(seed)
+    field = GameField.from_snapshot(BoardSnapshot.from_bytes(position))
+    for _ in range(max_plies):
+        moves = _legal_moves(field, color)
+        if not moves:
+            return 0.0
+        captures = [move for move in moves if field.get_figure(move[1]) is not None]
+        for move in captures:
+            if isinstance(field.get_figure(move[1]), King):
+                return 1.0 if color == "white" else -1.0
+        if captures and generator.random() < 0.7:
+            start, end = generator.choice(captures)
+        else:
+            start, end = generator.choice(moves)
+        figure = field.get_figure(start)
+        field.remove_figure(start)
+        field.set_figure(end, figure)
+        color = _other(color)
+    return math.tanh(field.score / VALUE_SCALE)
+
+
+class Node:
+    """A node of the search tree: the position after a move.
+
+    Attributes:
+        position (BoardSnapshot): The position.
+        color (str): The side to move in the position.
+        move (ChessMove | None): The move leading to the node; None at the root.
+        parent (Node | None): The parent node.
+        prior (float): The policy probability of the move (used by PUCT).
+        children (list[Node] | None): The expanded children, or None before expansion.
+        visits (int): The number of finished playouts through the node.
+        value (float): The summed results of those playouts for the side that made the move.
+        virtual (int): The number of playouts through the node that are still running.
+        terminal (float | None): The exact value if the move ended the game, else None.
+    """
+
+    __slots__ = ("position", "color", "move", "parent", "prior", "children", "visits", "value", "virtual",
+                 "terminal")
+
+    def __init__(self, position: BoardSnapshot, color: str, move: ChessMove = None, parent: Node = None,
+                 prior: float = 1.0, terminal: float = None):
+        """Initializes a Node.
+
+        Args:
+            position (BoardSnapshot): The position.
+            color (str): The side to move.
+            move (ChessMove, optional): The move leading here. Defaults to None.
+            parent (Node, optional): The parent node. Defaults to None.
+            prior (float, optional): The policy probability of the move. Defaults to 1.
+            terminal (float, optional): The exact value of a finished game. Defaults to None.
+        """
+        self.position = position
+        self.color = color
+        self.move = move
+        self.parent = parent
+        self.prior = prior
+        self.children: list[Node] | None = None
+        self.visits = 0
+        self.value = 0.0
+        self.virtual = 0
+        self.terminal = terminal
+
+    def mean(self, virtual_loss: float) -> float:
+        """Return the average result with every running playout counted as a loss."""
+        visits = self.visits + self.virtual
+        if not visits:
+            return 0.0
+        return (self.value - virtual_loss * self.virtual) / visits
+
+
+class MCTSEngine:
+    """Monte Carlo tree search player with parallel rollouts and tree reuse.
+
+    It relies on playouts rather than on piece values, so it copes with variants whose figures (like Balloon)
+    are not well described by a static evaluation. Close the engine, or use it as a context manager, to stop
+    the worker processes.
+
+    Attributes:
+        time_limit (float): The time budget of one search in seconds.
+        max_playouts (int | None): Stop after this many playouts even if time remains.
+        exploration (float): The exploration constant c of UCT or PUCT.
+        puct (bool): Select with PUCT and capture-aware priors instead of plain UCT.
+        workers (int): The number of rollout processes; 0 runs the rollouts in the calling process.
+        rollout_plies (int): The playout length before the static evaluation decides.
+        virtual_loss (float): The loss counted per running playout during selection.
+    """
+
+    def __init__(self, time_limit: float = 1.0, max_playouts: int = None, exploration: float = 1.4,
+                 puct: bool = False, workers: int = 4, rollout_plies: int = 40, virtual_loss: float = 1.0,
+                 seed: int = None):
+        """Initializes an MCTSEngine.
+
+        Args:
+            time_limit (float, optional): The time budget of one search in seconds. Defaults to 1.
+            max_playouts (int, optional): The playout limit of one search. Defaults to None (time only).
+            exploration (float, optional): The exploration constant. Defaults to 1.4.
+            puct (bool, optional): Use PUCT instead of UCT. Defaults to False.
+            workers (int, optional): The number of rollout processes. Defaults to 4.
+            rollout_plies (int, optional): The playout length. Defaults to 40.
+            virtual_loss (float, optional): The loss per running playout. Defaults to 1.
+            seed (int, optional): The seed of the playouts. Defaults to None (random).
+        """
+        self.time_limit = time_limit
+        self.max_playouts = max_playouts
+        self.exploration = exploration
+        self.puct = puct
+        self.workers = workers
+        self.rollout_plies = rollout_plies
+        self.virtual_loss = virtual_loss
+        self._random = random.Random(seed)
+        self._pool: ProcessPoolExecutor | None = None
+        self._root: Node | None = None
+
+    def __enter__(self) -> MCTSEngine:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the worker processes; they are restarted by the next search."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def choose_move(self, board: GameField, color: Literal["black", "white"]) -> ChessMove | None:
+        """Search the position on the board and return the best move.
+
+        Args:
+            board (GameField): The game board.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            ChessMove | None: The best move, or None if the side cannot move.
+        """
+        return self.search(board, color).move
+
+    def search(self, board: GameField, color: Literal["black", "white"], time_limit: float = None) -> SearchResult:
+        """Grows the tree of the position until the budget runs out.
+
+        If the position was reached from the previous search's root by moves the tree already holds,
+        that subtree and its statistics are kept.
+
+        Args:
+            board (GameField): The game board; it is not modified.
+            color (Literal["black", "white"]): The side to move.
+            time_limit (float, optional): The budget in seconds. Defaults to time_limit.
+
+        Returns:
+            SearchResult: The most visited move; nodes is the number of playouts and score the value of
+                the move scaled to centipawns.
+        """
+        start = time.perf_counter()
+        deadline = start + (self.time_limit if time_limit is None else time_limit)
+        root = self._reuse(board.snapshot(), color)
+        self._root = root
+        self._expand(root)
+        playouts = 0
+        if len(root.children) > 1:
+            playouts = self._run(root, deadline)
+        result = self._result(root, playouts, time.perf_counter() - start)
+        PROFILER.record_search("MCTSEngine.search", result.nodes, result.elapsed)
+        return result
+
+    def _reuse(self, position: BoardSnapshot, color: str) -> Node:
+        key = position.to_bytes()
+        # The new position is usually two plies below the old root: our move and the opponent's reply.
+        frontier = [self._root] if self._root is not None else []
+        for _ in range(3):
+            for node in frontier:
+                if node.color == color and node.position.to_bytes() == key:
+                    node.parent = None
+                    node.move = None
+                    return node
+            frontier = [child for node in frontier for child in node.children or ()]
+        return Node(position, color)
+
+    def _run(self, root: Node, deadline: float) -> int:
+        pending: dict[Future, list[Node]] = {}
+        playouts = 0
+        started = 0
+        limit = self.max_playouts
+        while True:
+            while (len(pending) < max(self.workers, 1) and time.perf_counter() < deadline
+                   and (limit is None or started < limit)):
+                path, leaf = self._select(root)
+                started += 1
+                if leaf.terminal is not None:
+                    self._backpropagate(path, leaf.terminal)
+                    playouts += 1
+                    continue
+                for node in path:
+                    node.virtual += 1
+                pending[self._submit(leaf)] = path
+            if not pending:
+                return playouts
+            # Running playouts are finished even after the deadline: their work is already paid for.
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                for node in path:
+                    node.virtual -= 1
+                white_value = future.result()
+                mover = _other(path[-1].color)
+                self._backpropagate(path, white_value if mover == "white" else -white_value)
+                playouts += 1
+
+    def _submit(self, leaf: Node) -> Future:
+        args = (leaf.position.to_bytes(), leaf.color, self.rollout_plies, self._random.getrandbits(32))
+        if self.workers <= 0:
+            future = Future()
+            future.set_result(rollout(*args))
+            return future
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool.submit(rollout, *args)
+
+    def _select(self, root: Node) -> tuple[list[Node], Node]:
+        node = root
+        path = [root]
+        while node.children:
+            node = max(node.children, key=self._score_function(node))
+            path.append(node)
+        if node.children is None and node.terminal is None and node.visits + node.virtual > 0:
+            # Expand a leaf on its second visit, so single playouts do not allocate whole move lists.
+            self._expand(node)
+            if node.children:
+                node = self._random.choice(node.children)
+                path.append(node)
+        return path, node
+
+    def _score_function(self, parent: Node):
+        parent_visits = parent.visits + parent.virtual
+        c = self.exploration
+        virtual_loss = self.virtual_loss
+        if self.puct:
+            scale = c * math.sqrt(parent_visits + 1)
+
+            def score(child: Node) -> float:
+                return child.mean(virtual_loss) + scale * child.prior / (1 + child.visits + child.virtual)
+        else:
+            log_visits = math.log(parent_visits + 1)
+
+            def score(child: Node) -> float:
+                visits = child.visits + child.virtual
+                if not visits:
+                    return math.inf
+                return child.mean(virtual_loss) + c * math.sqrt(log_visits / visits)
+        return score
+
+    def _expand(self, node: Node):
+        if node.children is not None:
+            return
+        field = GameField.from_snapshot(node.position)
+        moves = _legal_moves(field, node.color)
+        king_captures = [move for move in moves if isinstance(field.get_figure(move[1]), King)]
+        if king_captures:
+            # Capturing the King ends the game, so no other move needs to be looked at.
+            moves = king_captures
+        weights = [self._prior_weight(field, move) for move in moves]
+        total = sum(weights) or 1.0
+        opponent = _other(node.color)
+        children = []
+        for move, weight in zip(moves, weights):
+            captured = field.get_figure(move[1])
+            terminal = 1.0 if isinstance(captured, King) else None
+            children.append(Node(node.position.move_figure(*move), opponent, move, node, weight / total, terminal))
+        node.children = children
+
+    @staticmethod
+    def _prior_weight(field: GameField, move: ChessMove) -> float:
+        captured = field.get_figure(move[1])
+        if captured is None:
+            return 1.0
+        if isinstance(captured, King):
+            return 100.0
+        # Captures of valuable figures by cheap ones look most promising.
+        gain = type_value(type(captured)) - type_value(type(field.get_figure(move[0]))) / 10
+        return 1.0 + max(gain, 0) / 100
+
+    @staticmethod
+    def _backpropagate(path: list[Node], value: float):
+        # value is for the side that made the move into the last node; it alternates sign up the path.
+        for node in reversed(path):
+            node.visits += 1
+            node.value += value
+            value = -value
+
+    def _result(self, root: Node, playouts: int, elapsed: float) -> SearchResult:
+        if not root.children:
+            return SearchResult(None, 0, 0, playouts, elapsed)
+        pv = []
+        node = root
+        best = None
+        while node.children:
+            child = max(node.children, key=lambda item: (item.visits, item.terminal is not None))
+            if not child.visits and child.terminal is None:
+                break
+            pv.append(child.move)
+            best = best or child
+            node = child
+        if best is None:
+            best = max(root.children, key=lambda item: item.prior)
+            pv = [best.move]
+        mean = best.mean(0.0) if best.terminal is None else best.terminal
+        mean = max(min(mean, 0.999), -0.999)
+        score = int(VALUE_SCALE * math.atanh(mean))
+        return SearchResult(best.move, score, len(pv), playouts, elapsed, pv)
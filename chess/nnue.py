@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Literal, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from snapshot import FIGURE_TYPES, BoardSnapshot, register_figure_type
+
+if TYPE_CHECKING:
+    from field import GameField
+    from figures import Figure
+
+# Optional neural-network (NNUE-style) evaluation of chess positions.
+#
+# Requires NumPy. The network has a wide sparse first layer whose output (the accumulator) is kept up to date
+# incrementally: placing or removing a figure adds or subtracts one row of the first-layer weights, so evaluating
+# a position reached by a move costs a few vector additions plus the small dense layers.
+#
+# Input features are (figure type, own/opponent, square) triples seen from each side's perspective; black sees
+# the board mirrored vertically. Figure types are numbered by their snapshot codes (see snapshot.FIGURE_TYPES),
+# so the author figures have their own features.
+
+MAGIC = b"NNUE"
+VERSION = 1
+#: Size of the file header; the weight arrays start at this offset.
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sIIIIf")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The NNUE evaluator requires NumPy")
+
+
+def feature_index(type_code: int, own: bool, square: int) -> int:
+    """Return the input feature of a figure.
+
+    Args:
+        type_code (int): The snapshot code of the figure type (1-based).
+        own (bool): True if the figure belongs to the perspective side.
+        square (int): The square index from the perspective side's point of view.
+
+    Returns:
+        int: The feature index.
+    """
+    return ((type_code - 1) * 2 + (0 if own else 1)) * 64 + square
+
+
+def perspective_features(figure: Figure, index: int) -> tuple[int, int]:
+    """Return the features of a figure on a square from white's and black's perspective.
+
+    Args:
+        figure (Figure): The figure.
+        index (int): The square index (file * 8 + rank).
+
+    Returns:
+        tuple[int, int]: The white-perspective and the black-perspective feature.
+    """
+    code = register_figure_type(type(figure))
+    white = figure.color == "white"
+    # Black sees the board mirrored: the rank of the index is flipped, the file is kept.
+    return feature_index(code, white, index), feature_index(code, not white, index ^ 7)
+
+
+class NNUEWeights:
+    """The parameters of the network.
+
+    Layers: feature_count -> hidden (accumulator, per perspective), clipped ReLU on both perspectives
+    concatenated (side to move first) -> l2, clipped ReLU -> 1, multiplied by scale to give centipawns.
+
+    Attributes:
+        w1 (np.ndarray): First layer weights, shape (feature_count, hidden).
+        b1 (np.ndarray): First layer biases, shape (hidden,).
+        w2 (np.ndarray): Second layer weights, shape (2 * hidden, l2).
+        b2 (np.ndarray): Second layer biases, shape (l2,).
+        w3 (np.ndarray): Output weights, shape (l2,).
+        b3 (np.ndarray): Output bias, shape (1,).
+        scale (float): Output scale in centipawns.
+    """
+
+    def __init__(self, w1, b1, w2, b2, w3, b3, scale: float = 600.0):
+        """Initializes NNUEWeights from arrays.
+
+        Args:
+            w1, b1, w2, b2, w3, b3 (np.ndarray): The layer parameters, see the class attributes.
+            scale (float, optional): Output scale in centipawns. Defaults to 600.
+        """
+        _require_numpy()
+        self.w1, self.b1, self.w2, self.b2, self.w3, self.b3 = w1, b1, w2, b2, w3, b3
+        self.scale = scale
+        hidden = w1.shape[1]
+        if b1.shape != (hidden,) or w2.shape[0] != 2 * hidden or b2.shape != (w2.shape[1],) \
+                or w3.shape != (w2.shape[1],) or b3.shape != (1,):
+            raise ValueError("Inconsistent NNUE layer shapes")
+
+    @property
+    def feature_count(self) -> int:
+        """Return the number of input features."""
+        return self.w1.shape[0]
+
+    @property
+    def hidden(self) -> int:
+        """Return the accumulator width."""
+        return self.w1.shape[1]
+
+    @classmethod
+    def random(cls, hidden: int = 256, l2: int = 32, type_count: int = None, seed: int = 0) -> NNUEWeights:
+        """Creates randomly initialized weights, e.g. as a starting point for training.
+
+        Args:
+            hidden (int, optional): The accumulator width. Defaults to 256.
+            l2 (int, optional): The second layer width. Defaults to 32.
+            type_count (int, optional): The number of figure types. Defaults to the registered types.
+            seed (int, optional): The random seed. Defaults to 0.
+
+        Returns:
+            NNUEWeights: The new weights.
+        """
+        _require_numpy()
+        rng = np.random.default_rng(seed)
+        features = (type_count or len(FIGURE_TYPES)) * 2 * 64
+        return cls(
+            (rng.standard_normal((features, hidden)) * 0.1).astype(np.float32),
+            np.zeros(hidden, np.float32),
+            (rng.standard_normal((2 * hidden, l2)) / np.sqrt(2 * hidden)).astype(np.float32),
+            np.zeros(l2, np.float32),
+            (rng.standard_normal(l2) / np.sqrt(l2)).astype(np.float32),
+            np.zeros(1, np.float32),
+        )
+
+    def save(self, path: str):
+        """Writes the weights to a file.
+
+        The file has a 64-byte header (magic b'NNUE', version, feature count, hidden width, second layer width,
+        scale; little-endian) followed by the little-endian float32 arrays w1, b1, w2, b2, w3, b3 in C order.
+
+        Args:
+            path (str): The file path.
+        """
+        header = _HEADER.pack(MAGIC, VERSION, self.feature_count, self.hidden, self.w2.shape[1], self.scale)
+        with open(path, "wb") as file:
+            file.write(header.ljust(HEADER_SIZE, b"\0"))
+            for array in (self.w1, self.b1, self.w2, self.b2, self.w3, self.b3):
+                file.write(np.ascontiguousarray(array, dtype="<f4").tobytes())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> NNUEWeights:
+        """Reads weights written by save.
+
+        Args:
+            path (str): The file path.
+            mmap (bool, optional): Map the file into memory instead of reading it, so processes loading the same
+                file share its pages and nothing is copied. Defaults to True.
+
+        Returns:
+            NNUEWeights: The weights; the arrays are read-only views of the file when mapped.
+
+        Raises:
+            ValueError: If the file is not a weights file of a supported version.
+        """
+        _require_numpy()
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) < _HEADER.size:
+            raise ValueError("NNUE weights file is too short")
+        magic, version, features, hidden, l2, scale = _HEADER.unpack_from(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an NNUE weights file of a supported version")
+        shapes = [(features, hidden), (hidden,), (2 * hidden, l2), (l2,), (l2,), (1,)]
+        total = sum(int(np.prod(shape)) for shape in shapes)
+        if mmap:
+            flat = np.memmap(path, dtype="<f4", mode="r", offset=HEADER_SIZE, shape=(total,))
+        else:
+            flat = np.fromfile(path, dtype="<f4", offset=HEADER_SIZE, count=total)
+            if flat.size != total:
+                raise ValueError("NNUE weights file is truncated")
+        arrays = []
+        offset = 0
+        for shape in shapes:
+            size = int(np.prod(shape))
+            arrays.append(flat[offset:offset + size].reshape(shape))
+            offset += size
+        return cls(*arrays, scale=scale)
+
+
+class Accumulator:
+    """The first-layer output of both perspectives, updated incrementally from GameField notifications.
+
+    Attributes:
+        weights (NNUEWeights): The network parameters.
+        values (dict[str, np.ndarray]): The accumulator of each perspective color.
+    """
+
+    def __init__(self, weights: NNUEWeights):
+        """Initializes an empty-board Accumulator.
+
+        Args:
+            weights (NNUEWeights): The network parameters.
+        """
+        self.weights = weights
+        self.values = {"white": weights.b1.astype(np.float32), "black": weights.b1.astype(np.float32)}
+
+    def refresh(self, field: GameField):
+        """Recomputes the accumulator from all figures on the board.
+
+        Args:
+            field (GameField): The game board.
+        """
+        white, black = [], []
+        for pos, figure in field.iter_figures():
+            index = (ord(pos[0]) - 97) * 8 + int(pos[1]) - 1
+            white_feature, black_feature = self._features(figure, index)
+            white.append(white_feature)
+            black.append(black_feature)
+        w1 = self.weights.w1
+        self.values = {
+            "white": self.weights.b1 + w1[white].sum(axis=0, dtype=np.float32),
+            "black": self.weights.b1 + w1[black].sum(axis=0, dtype=np.float32),
+        }
+
+    def figure_added(self, figure: Figure, index: int):
+        """Adds the features of a figure placed on a square."""
+        white_feature, black_feature = self._features(figure, index)
+        self.values["white"] += self.weights.w1[white_feature]
+        self.values["black"] += self.weights.w1[black_feature]
+
+    def figure_removed(self, figure: Figure, index: int):
+        """Subtracts the features of a figure removed from a square."""
+        white_feature, black_feature = self._features(figure, index)
+        self.values["white"] -= self.weights.w1[white_feature]
+        self.values["black"] -= self.weights.w1[black_feature]
+
+    def _features(self, figure: Figure, index: int) -> tuple[int, int]:
+        features = perspective_features(figure, index)
+        if features[0] >= self.weights.feature_count or features[1] >= self.weights.feature_count:
+            raise ValueError(f"The network has no features for {type(figure).__name__}")
+        return features
+
+
+class NNUEEvaluator:
+    """Evaluates positions with the network.
+
+    A board is evaluated incrementally after attach(): its accumulator follows every set_figure/remove_figure.
+    Positions stored as snapshots can be scored in batches with evaluate_batch.
+
+    Attributes:
+        weights (NNUEWeights): The network parameters.
+    """
+
+    def __init__(self, weights: NNUEWeights):
+        """Initializes an NNUEEvaluator.
+
+        Args:
+            weights (NNUEWeights): The network parameters.
+        """
+        _require_numpy()
+        self.weights = weights
+        self._accumulators: dict[int, Accumulator] = {}
+
+    def attach(self, field: GameField) -> Accumulator:
+        """Starts following a board incrementally.
+
+        Args:
+            field (GameField): The game board.
+
+        Returns:
+            Accumulator: The accumulator of the board.
+        """
+        accumulator = Accumulator(self.weights)
+        accumulator.refresh(field)
+        field.attach(accumulator)
+        self._accumulators[id(field)] = accumulator
+        return accumulator
+
+    def detach(self, field: GameField):
+        """Stops following a board.
+
+        Args:
+            field (GameField): A board passed to attach.
+        """
+        field.detach(self._accumulators.pop(id(field)))
+
+    def evaluate(self, field: GameField, color: Literal["black", "white"]) -> int:
+        """Evaluates an attached board from the point of view of the side to move.
+
+        Args:
+            field (GameField): A board passed to attach.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            int: The score in centipawns; positive is good for the color.
+        """
+        values = self._accumulators[id(field)].values
+        opponent = "black" if color == "white" else "white"
+        return int(self._forward(values[color][np.newaxis], values[opponent][np.newaxis])[0])
+
+    def evaluate_batch(self, snapshots: Iterable[BoardSnapshot], colors: Iterable[str]):
+        """Evaluates many positions at once, e.g. for offline scoring of game archives.
+
+        Args:
+            snapshots (Iterable[BoardSnapshot]): The positions.
+            colors (Iterable[str]): The side to move in every position.
+
+        Returns:
+            np.ndarray: The scores in centipawns from the point of view of the side to move, as float32.
+        """
+        snapshots = list(snapshots)
+        colors = list(colors)
+        if len(snapshots) != len(colors):
+            raise ValueError("Every position needs a side to move")
+        rows, own, other = [], [], []
+        for row, (snapshot, color) in enumerate(zip(snapshots, colors)):
+            for pos, figure in snapshot.iter_figures():
+                index = (ord(pos[0]) - 97) * 8 + int(pos[1]) - 1
+                white_feature, black_feature = perspective_features(figure, index)
+                rows.append(row)
+                if color == "white":
+                    own.append(white_feature)
+                    other.append(black_feature)
+                else:
+                    own.append(black_feature)
+                    other.append(white_feature)
+        count = len(snapshots)
+        w1 = self.weights.w1
+        own_values = np.broadcast_to(self.weights.b1, (count, self.weights.hidden)).copy()
+        other_values = own_values.copy()
+        rows = np.asarray(rows, dtype=np.intp)
+        # Sparse first layer: scatter-add the weight rows of the active features of every position.
+        np.add.at(own_values, rows, w1[np.asarray(own, dtype=np.intp)])
+        np.add.at(other_values, rows, w1[np.asarray(other, dtype=np.intp)])
+        return self._forward(own_values, other_values)
+
+    def _forward(self, own_values, other_values):
+        weights = self.weights
+        hidden = np.concatenate((np.clip(own_values, 0.0, 1.0), np.clip(other_values, 0.0, 1.0)), axis=1)
+        hidden = np.clip(hidden @ weights.w2 + weights.b2, 0.0, 1.0)
+        return (hidden @ weights.w3 + weights.b3[0]) * np.float32(weights.scale)
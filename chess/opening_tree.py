@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import copy
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Literal
+
+from engine import ChessMove, zobrist_hash
+from field import GameField
+from figures import *
+from figures.definitions import SQUARE_INDEX, FILES
+from pgn import read_games, replay
+from snapshot import BoardSnapshot
+
+# Opening explorer statistics: for every position of the first plies of the archived games, how often each
+# move was played and how those games ended. The trees are built with a map-reduce: every archive shard is
+# counted in a worker process, the counts are summed, and each variant's tree is written as a sorted file of
+# fixed-size records that queries binary-search through mmap.
+
+#: PGN tag naming the variant of a game; games without it use the standard setup.
+VARIANT_TAG = "Variant"
+#: Variants by tag value, with the function creating their initial board data.
+VARIANTS = {
+    "standard": GameField.initialize_field,
+    "author": lambda: copy.deepcopy(AUTHOR_FIELD),
+}
+
+_MAGIC = b"OPTR"
+_VERSION = 1
+#: Header: magic, version, number of records, plies counted.
+_HEADER = struct.Struct(">4sIII")
+#: Record: position hash, move (start index * 64 + end index), white wins, draws, black wins.
+_RECORD = struct.Struct(">QHIII")
+
+#: Counts by (position hash, move code): [white wins, draws, black wins].
+Counts = dict[tuple[int, int], list[int]]
+
+
+def _move_code(move: ChessMove) -> int:
+    return SQUARE_INDEX[move[0]] * 64 + SQUARE_INDEX[move[1]]
+
+
+def _decode_move(code: int) -> ChessMove:
+    start, end = divmod(code, 64)
+    return f"{FILES[start // 8]}{start % 8 + 1}", f"{FILES[end // 8]}{end % 8 + 1}"
+
+
+def game_variant(tags: dict[str, str]) -> str | None:
+    """Return the variant of a PGN game, or None if it is not a known one.
+
+    Args:
+        tags (dict[str, str]): The tag pairs of the game.
+    """
+    if "FEN" in tags:
+        return None
+    variant = tags.get(VARIANT_TAG, "standard").strip().lower()
+    return variant if variant in VARIANTS else None
+
+
+def count_shard(path: str, plies: int) -> dict[str, Counts]:
+    """Counts the opening moves and results of one archive shard (the map step); runs in a worker process.
+
+    Args:
+        path (str): A PGN archive.
+        plies (int): The number of plies counted per game.
+
+    Returns:
+        dict[str, Counts]: The counts by variant. Games without a result or that cannot be replayed are skipped.
+    """
+    counts: dict[str, Counts] = {variant: {} for variant in VARIANTS}
+    column = {1: 0, 0: 1, -1: 2}
+    with open(path, encoding="utf-8") as archive:
+        for game in read_games(archive):
+            variant = game_variant(game.tags)
+            if variant is None or game.result is None:
+                continue
+            field = GameField(VARIANTS[variant]())
+            moves = []
+            try:
+                for snapshot, color, start, end in islice(replay(game, field), plies):
+                    moves.append((zobrist_hash(snapshot, color), _move_code((start, end))))
+            except ValueError:
+                continue
+            variant_counts = counts[variant]
+            for key in moves:
+                entry = variant_counts.get(key)
+                if entry is None:
+                    entry = variant_counts[key] = [0, 0, 0]
+                entry[column[game.result]] += 1
+    return counts
+
+
+def merge_counts(total: Counts, counts: Counts):
+    """Adds the counts of one shard to a total (the reduce step).
+
+    Args:
+        total (Counts): The accumulated counts; updated in place.
+        counts (Counts): The counts to add.
+    """
+    for key, entry in counts.items():
+        accumulated = total.get(key)
+        if accumulated is None:
+            total[key] = list(entry)
+        else:
+            for index in range(3):
+                accumulated[index] += entry[index]
+
+
+def write_tree(path: str, counts: Counts, plies: int):
+    """Writes counts as a tree file.
+
+    Args:
+        path (str): The output file.
+        counts (Counts): The counts.
+        plies (int): The number of plies counted per game.
+    """
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(counts), plies))
+        for (key, move), (white, draw, black) in sorted(counts.items()):
+            file.write(_RECORD.pack(key, move, white, draw, black))
+
+
+def build_opening_trees(shards: Iterable[str], directory: str, plies: int = 12,
+                        workers: int = None) -> dict[str, str]:
+    """Builds the opening trees of all variants from archive shards in parallel.
+
+    Args:
+        shards (Iterable[str]): The PGN archives; each is counted by one task.
+        directory (str): The output directory; the tree of a variant is written to '<variant>.tree'.
+        plies (int, optional): The number of plies counted per game. Defaults to 12.
+        workers (int, optional): The number of processes; 0 counts in the calling process.
+            Defaults to the number of CPUs.
+
+    Returns:
+        dict[str, str]: The tree file of every variant.
+    """
+    shards = list(shards)
+    totals: dict[str, Counts] = {variant: {} for variant in VARIANTS}
+    if workers == 0 or len(shards) < 2:
+        for counts in (count_shard(shard, plies) for shard in shards):
+            for variant, variant_counts in counts.items():
+                merge_counts(totals[variant], variant_counts)
+    else:
+        with ProcessPoolExecutor(min(workers or os.cpu_count() or 1, len(shards))) as pool:
+            for counts in pool.map(count_shard, shards, [plies] * len(shards)):
+                for variant, variant_counts in counts.items():
+                    merge_counts(totals[variant], variant_counts)
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for variant, counts in totals.items():
+        paths[variant] = os.path.join(directory, f"{variant}.tree")
+        write_tree(paths[variant], counts, plies)
+    return paths
+
+
+class MoveStats:
+    """How often a move was played in a position and how the games ended.
+
+    Attributes:
+        move (ChessMove): The move.
+        white (int): Games won by white.
+        draws (int): Drawn games.
+        black (int): Games won by black.
+    """
+
+    def __init__(self, move: ChessMove, white: int, draws: int, black: int):
+        """Initializes MoveStats.
+
+        Args:
+            move (ChessMove): The move.
+            white (int): White wins.
+            draws (int): Draws.
+            black (int): Black wins.
+        """
+        self.move = move
+        self.white = white
+        self.draws = draws
+        self.black = black
+
+    @property
+    def games(self) -> int:
+        """Return the number of games with the move."""
+        return self.white + self.draws + self.black
+
+
+class OpeningTree:
+    """Read access to a tree file; the file is memory-mapped, so opening it costs nothing.
+
+    Attributes:
+        path (str): The tree file.
+        plies (int): The number of plies counted per game.
+        count (int): The number of (position, move) records.
+    """
+
+    def __init__(self, path: str):
+        """Opens a tree file written by build_opening_trees.
+
+        Args:
+            path (str): The tree file.
+
+        Raises:
+            ValueError: If the file is not a tree file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.plies = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an opening tree file")
+
+    def __enter__(self) -> OpeningTree:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def moves(self, position: GameField | BoardSnapshot, color: Literal["black", "white"]) -> list[MoveStats]:
+        """Return the statistics of the moves played in a position, the most frequent first.
+
+        Args:
+            position (GameField | BoardSnapshot): The position.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            list[MoveStats]: The moves; empty if the position was not reached in the counted plies.
+        """
+        key = zobrist_hash(position, color)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if _RECORD.unpack_from(self._map, _HEADER.size + middle * _RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        result = []
+        while low < self.count:
+            record_key, move, white, draws, black = _RECORD.unpack_from(self._map,
+                                                                        _HEADER.size + low * _RECORD.size)
+            if record_key != key:
+                break
+            result.append(MoveStats(_decode_move(move), white, draws, black))
+            low += 1
+        result.sort(key=lambda stats: -stats.games)
+        return result
+
+    def close(self):
+        """Releases the file."""
+        self._map.close()
+        self._file.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from fen import parse_fen
+
+    parser = argparse.ArgumentParser(description="Build and query opening trees of PGN archive shards.")
+    parser.add_argument("directory", help="tree directory")
+    parser.add_argument("--pgn", action="append", default=[], metavar="PATH", help="archive shard to count")
+    parser.add_argument("--plies", type=int, default=12, help="plies counted per game")
+    parser.add_argument("--variant", default="standard", choices=sorted(VARIANTS), help="tree to query")
+    parser.add_argument("--fen", help="print the moves played in this position")
+    args = parser.parse_args()
+
+    if args.pgn:
+        for name, tree_path in build_opening_trees(args.pgn, args.directory, args.plies).items():
+            print(f"{name}: {tree_path}")
+    if args.fen:
+        board, side = parse_fen(args.fen)
+        with OpeningTree(os.path.join(args.directory, f"{args.variant}.tree")) as tree:
+            for stats in tree.moves(board, side):
+                print(f"{''.join(stats.move)}: {stats.games} games, +{stats.white} ={stats.draws} -{stats.black}")
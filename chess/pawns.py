@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import random
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from figures import *
+from figures.definitions import FILES
+
+if TYPE_CHECKING:
+    from field import GameField
+
+#: Pawn-like figure types: they move forward only, so their structure changes rarely and is cached.
+PAWN_TYPES = (Pawn, Tank, PEKKA)
+
+_random = random.Random(0x9A7)
+#: Random 64-bit keys of pawn-like figures by type, color and square index; GameField.pawn_key xors them.
+PAWN_KEYS: dict[type, dict[str, list[int]]] = {
+    figure_type: {color: [_random.getrandbits(64) for _ in range(64)] for color in ("white", "black")}
+    for figure_type in PAWN_TYPES
+}
+
+
+class StructureWeights:
+    """Pawn structure terms of one pawn-like figure type in centipawns.
+
+    Attributes:
+        doubled (int): Added for every extra figure of the type on a file.
+        isolated (int): Added for a figure with no figure of its type on the neighboring files.
+        passed (tuple[int, ...]): Added for a figure with no enemy pawn-like figure ahead of it on its own or the
+            neighboring files, by relative rank (0 is the own back rank).
+    """
+
+    def __init__(self, doubled: int, isolated: int, passed):
+        """Initializes StructureWeights.
+
+        Args:
+            doubled (int): The doubled figure term.
+            isolated (int): The isolated figure term.
+            passed (Iterable[int]): The passed figure bonus by relative rank, 8 values.
+        """
+        self.doubled = doubled
+        self.isolated = isolated
+        self.passed = tuple(passed)
+
+
+#: Structure weights by pawn-like type; configure before filling a PawnHashTable.
+STRUCTURE_WEIGHTS: dict[type, StructureWeights] = {
+    Pawn: StructureWeights(-15, -12, (0, 5, 10, 20, 35, 60, 100, 0)),
+    Tank: StructureWeights(-10, -8, (0, 5, 10, 15, 25, 40, 60, 0)),
+    PEKKA: StructureWeights(-10, -8, (0, 5, 10, 15, 25, 40, 60, 0)),
+}
+
+
+def evaluate_pawn_structure(data: dict) -> int:
+    """Evaluates the doubled, isolated and passed pawn-like figures of a position.
+
+    Only figures of PAWN_TYPES are looked at, so the result depends on nothing but the pawn key.
+
+    Args:
+        data (dict): The board data, columns 'a' to 'h' mapped to lists of figures.
+
+    Returns:
+        int: The score in centipawns from white's point of view.
+    """
+    # Relative ranks of the pawn-like figures by color, type and file index.
+    ranks = {"white": {}, "black": {}}
+    for file_index, col in enumerate(FILES):
+        for row, figure in enumerate(data[col]):
+            if figure is not None and figure.__class__ in STRUCTURE_WEIGHTS:
+                relative = row if figure.color == "white" else 7 - row
+                by_file = ranks[figure.color].setdefault(figure.__class__, [[] for _ in range(8)])
+                by_file[file_index].append(relative)
+
+    score = 0
+    for color, sign in (("white", 1), ("black", -1)):
+        enemy = ranks["black" if color == "white" else "white"]
+        # Enemy pawn-like figures by file, converted to this color's relative ranks.
+        enemy_ranks = [[7 - rank for by_file in enemy.values() for rank in by_file[file_index]]
+                       for file_index in range(8)]
+        for figure_type, by_file in ranks[color].items():
+            weights = STRUCTURE_WEIGHTS[figure_type]
+            for file_index, file_ranks in enumerate(by_file):
+                if not file_ranks:
+                    continue
+                term = weights.doubled * (len(file_ranks) - 1)
+                neighbors = [index for index in (file_index - 1, file_index + 1) if 0 <= index < 8]
+                if not any(by_file[index] for index in neighbors):
+                    term += weights.isolated * len(file_ranks)
+                for rank in file_ranks:
+                    if all(enemy_rank <= rank for index in (file_index, *neighbors)
+                           for enemy_rank in enemy_ranks[index]):
+                        term += weights.passed[rank]
+                score += sign * term
+    return score
+
+
+class PawnHashTable:
+    """A bounded cache of pawn structure scores keyed by the pawn key of the position.
+
+    Neighboring positions in a search almost always share the pawn-like figures, so the structure
+    evaluation runs only when they actually change. The least recently used entry is evicted when
+    the table is full.
+
+    Attributes:
+        max_entries (int): The maximal number of cached positions.
+        hits (int): The number of probes answered from the cache.
+        misses (int): The number of probes that evaluated the structure.
+        evictions (int): The number of entries dropped to make room.
+    """
+
+    def __init__(self, max_entries: int = 1 << 16):
+        """Initializes a PawnHashTable.
+
+        Args:
+            max_entries (int, optional): The maximal number of cached positions. Defaults to 65536.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached positions."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the share of probes answered from the cache."""
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def probe(self, field: GameField) -> int:
+        """Return the pawn structure score of a board, evaluating it only on a cache miss.
+
+        Args:
+            field (GameField): The game board.
+
+        Returns:
+            int: The score in centipawns from white's point of view.
+        """
+        key = field.pawn_key
+        entries = self._entries
+        score = entries.get(key)
+        if score is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return score
+        self.misses += 1
+        score = entries[key] = evaluate_pawn_structure(field.data)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return score
+
+    def clear(self):
+        """Drops all entries and resets the statistics, e.g. after STRUCTURE_WEIGHTS changed."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> str:
+        """Return a one-line summary of the cache statistics."""
+        return (f"pawn hash: {len(self)}/{self.max_entries} entries, {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions, hit rate {self.hit_rate:.1%}")
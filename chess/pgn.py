@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, Literal, TextIO
+
+from field import GameField
+from figures import *
+from snapshot import BoardSnapshot
+
+#: Figure classes by SAN letter. The author figures use the letters of the benchmark layouts.
+SAN_LETTERS = {"K": King, "Q": Queen, "R": Rook, "B": Bishop, "N": Knight, "L": Balloon, "T": Tank, "X": PEKKA}
+
+#: Game results by PGN result token, from white's point of view.
+RESULTS = {"1-0": 1, "0-1": -1, "1/2-1/2": 0, "*": None}
+
+_TAG = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*$')
+_SAN = re.compile(r"^([KQRBNLTX])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([QRBNLTX]))?$")
+_NOISE = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+|\d+\.(?:\.\.)?|[?!]+")
+
+
+class PgnGame:
+    """A game read from a PGN archive.
+
+    Attributes:
+        tags (dict[str, str]): The tag pairs, e.g. 'White', 'Black', 'Result'.
+        moves (list[str]): The moves in SAN, without move numbers, comments and variations.
+        result (int | None): 1 if white won, -1 if black won, 0 for a draw, None if unknown.
+    """
+
+    def __init__(self, tags: dict[str, str], moves: list[str], result: int | None):
+        """Initializes a PgnGame.
+
+        Args:
+            tags (dict[str, str]): The tag pairs.
+            moves (list[str]): The moves in SAN.
+            result (int | None): The result from white's point of view.
+        """
+        self.tags = tags
+        self.moves = moves
+        self.result = result
+
+
+def read_games(stream: TextIO | Iterable[str]) -> Iterator[PgnGame]:
+    """Lazily reads the games of a PGN archive, one game in memory at a time.
+
+    Args:
+        stream (TextIO | Iterable[str]): The archive lines.
+
+    Yields:
+        PgnGame: The games in archive order.
+    """
+    tags: dict[str, str] = {}
+    movetext: list[str] = []
+    for line in stream:
+        line = line.strip()
+        if line.startswith("%"):
+            continue
+        match = _TAG.match(line)
+        if match:
+            if movetext:
+                yield _make_game(tags, movetext)
+                tags, movetext = {}, []
+            tags[match.group(1)] = match.group(2).replace('\\"', '"')
+        elif line:
+            movetext.append(line)
+    if tags or movetext:
+        yield _make_game(tags, movetext)
+
+
+def _make_game(tags: dict[str, str], movetext: list[str]) -> PgnGame:
+    text = _NOISE.sub(" ", " ".join(movetext))
+    # Drop variations, which may be nested.
+    depth = 0
+    main_line = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            main_line.append(char)
+    moves = []
+    result = RESULTS.get(tags.get("Result", "*"))
+    for token in "".join(main_line).split():
+        if token in RESULTS:
+            result = RESULTS[token]
+        else:
+            moves.append(token.rstrip("+#"))
+    return PgnGame(tags, moves, result)
+
+
+def apply_san(field: GameField, san: str, color: Literal["black", "white"]) -> tuple[str, str]:
+    """Plays a move given in SAN on the board.
+
+    Castling moves the rook as well, promotion replaces the pawn, and an en passant capture removes
+    the passed pawn, so standard games replay faithfully on a board without those rules.
+
+    Args:
+        field (GameField): The game board.
+        san (str): The move in SAN, e.g. 'Nbd7', 'exd5', 'e8=Q' or 'O-O'.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        tuple[str, str]: The start and end squares of the moving figure (the king for castling).
+
+    Raises:
+        ValueError: If the move cannot be read or is not possible in the position.
+    """
+    san = san.rstrip("+#")
+    row = 1 if color == "white" else 8
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king_end, rook_start, rook_end = ("g", "h", "f") if len(san) == 3 else ("c", "a", "d")
+        king = field.get_figure(f"e{row}")
+        rook = field.get_figure(f"{rook_start}{row}")
+        if not isinstance(king, King) or not isinstance(rook, Rook):
+            raise ValueError(f"Castling {san} is not possible")
+        field.remove_figure(f"e{row}")
+        field.remove_figure(f"{rook_start}{row}")
+        field.set_figure(f"{king_end}{row}", king)
+        field.set_figure(f"{rook_end}{row}", rook)
+        return f"e{row}", f"{king_end}{row}"
+
+    match = _SAN.match(san)
+    if match is None:
+        raise ValueError(f"Cannot read move {san!r}")
+    letter, from_file, from_rank, capture, end, promotion = match.groups()
+    figure_class = SAN_LETTERS[letter] if letter else Pawn
+    if figure_class is Pawn:
+        start = _pawn_start(field, color, end, from_file, bool(capture))
+    else:
+        candidates = [pos for pos, figure in field.iter_figures(color)
+                      if type(figure) is figure_class
+                      and (from_file is None or pos[0] == from_file)
+                      and (from_rank is None or pos[1] == from_rank)
+                      and end in figure.get_available_moves(pos, field)]
+        if len(candidates) > 1:
+            # SAN does not disambiguate from pinned figures, which cannot legally move.
+            candidates = [pos for pos in candidates if not _exposes_king(field, pos, end, color)]
+        if len(candidates) != 1:
+            raise ValueError(f"Move {san!r} matches {len(candidates)} figures")
+        start = candidates[0]
+
+    figure = field.get_figure(start)
+    if figure_class is Pawn and capture and field.get_figure(end) is None:
+        # En passant: the captured pawn stands beside the start square.
+        field.remove_figure(f"{end[0]}{start[1]}")
+    if promotion:
+        figure = SAN_LETTERS[promotion](color)
+    field.remove_figure(start)
+    field.set_figure(end, figure)
+    return start, end
+
+
+def _exposes_king(field: GameField, start: str, end: str, color: str) -> bool:
+    figure = field.get_figure(start)
+    captured = field.get_figure(end)
+    field.remove_figure(start)
+    field.set_figure(end, figure)
+    try:
+        opponent = "black" if color == "white" else "white"
+        return any(isinstance(king, King) and field.is_attacked(pos, opponent)
+                   for pos, king in field.iter_figures(color))
+    finally:
+        field.set_figure(end, captured)
+        field.set_figure(start, figure)
+
+
+def _pawn_start(field: GameField, color: str, end: str, from_file: str | None, capture: bool) -> str:
+    step = -1 if color == "white" else 1
+    end_row = int(end[1])
+    if capture:
+        if from_file is None:
+            raise ValueError(f"Pawn capture to {end} needs the start file")
+        candidates = [f"{from_file}{end_row + step}"]
+    else:
+        candidates = [f"{end[0]}{end_row + step}", f"{end[0]}{end_row + 2 * step}"]
+    for pos in candidates:
+        if not 1 <= int(pos[1:]) <= 8:
+            continue
+        figure = field.get_figure(pos)
+        if isinstance(figure, Pawn) and figure.color == color:
+            return pos
+        if figure is not None:
+            break
+    raise ValueError(f"No {color} pawn can move to {end}")
+
+
+def replay(game: PgnGame, field: GameField = None) -> Iterator[tuple[BoardSnapshot, str, str, str]]:
+    """Replays a game, yielding every position before a move together with the move.
+
+    Args:
+        game (PgnGame): The game.
+        field (GameField, optional): The board to play on. Defaults to the standard starting position.
+
+    Yields:
+        tuple[BoardSnapshot, str, str, str]: The position, the side to move, and the start and end squares.
+
+    Raises:
+        ValueError: If a move of the game is not possible.
+    """
+    if field is None:
+        field = GameField()
+    color = "white"
+    for san in game.moves:
+        position = field.snapshot()
+        start, end = apply_san(field, san, color)
+        yield position, color, start, end
+        color = "black" if color == "white" else "white"
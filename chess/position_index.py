@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Literal
+
+from engine import zobrist_hash
+from field import GameField
+from pgn import read_games, replay
+from snapshot import BoardSnapshot
+
+# An on-disk index from positions to the games that reached them.
+#
+# The index directory holds sorted segment files of fixed-size records (position hash, game id, ply), a
+# catalog of the indexed games (one JSON object per line, the line number is the game id), the byte offset of
+# every catalog line, and a manifest. New games are buffered and written as a new segment, so finished games
+# can be appended without rewriting the index; probes binary-search every segment through mmap, and
+# compact() merges the segments into one with a streaming k-way merge. The position hash is the Zobrist hash
+# of engine.py, side to move included.
+
+MANIFEST = "manifest.json"
+CATALOG = "games.jsonl"
+OFFSETS = "games.offsets"
+#: Record layout: 64-bit position hash, 32-bit game id, 32-bit ply; big-endian so byte order is sort order.
+RECORD = struct.Struct(">QII")
+_OFFSET = struct.Struct(">Q")
+
+
+def position_key(position: GameField | BoardSnapshot, color: Literal["black", "white"]) -> int:
+    """Return the index key of a position.
+
+    Args:
+        position (GameField | BoardSnapshot): The position.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        int: The 64-bit Zobrist hash of the position.
+    """
+    return zobrist_hash(position, color)
+
+
+class _Segment:
+    """A sorted record file mapped into memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = size // RECORD.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def key_at(self, index: int) -> int:
+        return RECORD.unpack_from(self._map, index * RECORD.size)[0]
+
+    def lookup(self, key: int) -> Iterator[tuple[int, int]]:
+        # Lower bound binary search, then a scan over the records of the key.
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        while low < self.count:
+            record_key, game_id, ply = RECORD.unpack_from(self._map, low * RECORD.size)
+            if record_key != key:
+                break
+            yield game_id, ply
+            low += 1
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        for index in range(self.count):
+            yield RECORD.unpack_from(self._map, index * RECORD.size)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class PositionIndex:
+    """Finds the indexed games that reached a position.
+
+    Use as a context manager, or call close(), so that buffered games are written out. Games added after the last
+    flush of an index that was not closed are dropped when it is opened again.
+
+    Attributes:
+        directory (str): The index directory.
+        buffer_size (int): The number of buffered records that triggers writing a segment.
+        games (int): The number of indexed games, buffered ones included.
+    """
+
+    def __init__(self, directory: str, buffer_size: int = 1 << 20):
+        """Opens an index, creating it if the directory has none.
+
+        Args:
+            directory (str): The index directory.
+            buffer_size (int, optional): Records kept in memory before a segment is written. Defaults to 2**20.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.buffer_size = buffer_size
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+        else:
+            manifest = {"segments": [], "games": 0, "next_segment": 0}
+        self._segment_names: list[str] = manifest["segments"]
+        self._next_segment: int = manifest["next_segment"]
+        self.games: int = manifest["games"]
+        self._segments = [_Segment(os.path.join(directory, name)) for name in self._segment_names]
+        self._buffer: list[tuple[int, int, int]] = []
+        self._discard_unflushed()
+        self._catalog = open(os.path.join(directory, CATALOG), "ab")
+        self._offsets = open(os.path.join(directory, OFFSETS), "ab")
+
+    def __enter__(self) -> PositionIndex:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_game(self, positions: Iterable[tuple[GameField | BoardSnapshot, str]], info: dict = None) -> int:
+        """Appends a game to the index.
+
+        Args:
+            positions (Iterable[tuple[GameField | BoardSnapshot, str]]): Every position of the game in order,
+                with the side to move.
+            info (dict, optional): JSON-serializable data stored in the catalog, e.g. the source and the tags.
+
+        Returns:
+            int: The id of the game.
+        """
+        game_id = self.games
+        for ply, (position, color) in enumerate(positions):
+            self._buffer.append((position_key(position, color), game_id, ply))
+        self._offsets.write(_OFFSET.pack(self._catalog.tell()))
+        self._catalog.write(json.dumps(info or {}, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.games += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        return game_id
+
+    def add_history(self, history, info: dict = None) -> int:
+        """Appends a finished game given as a MoveHistory.
+
+        Args:
+            history (MoveHistory): The game history.
+            info (dict, optional): Data stored in the catalog. Defaults to None.
+
+        Returns:
+            int: The id of the game.
+        """
+        def positions():
+            color = "white"
+            for ply in range(len(history) + 1):
+                yield history.position(ply), color
+                color = "black" if color == "white" else "white"
+
+        return self.add_game(positions(), info)
+
+    def add_pgn(self, path: str) -> int:
+        """Streams the games of a PGN archive into the index; games that cannot be replayed are skipped.
+
+        Args:
+            path (str): The archive.
+
+        Returns:
+            int: The number of games added.
+        """
+        added = 0
+        with open(path, encoding="utf-8") as archive:
+            for number, game in enumerate(read_games(archive)):
+                board = GameField()
+                color = "white"
+                try:
+                    positions = [(snapshot, color) for snapshot, color, _, _ in replay(game, board)]
+                except ValueError:
+                    continue
+                if positions:
+                    color = "black" if positions[-1][1] == "white" else "white"
+                positions.append((board.snapshot(), color))
+                self.add_game(positions, {"source": path, "number": number, "tags": game.tags})
+                added += 1
+        return added
+
+    def flush(self):
+        """Writes the buffered records as a new sorted segment and makes them visible to probe()."""
+        if self._buffer:
+            self._buffer.sort()
+            name = f"segment-{self._next_segment}.idx"
+            self._next_segment += 1
+            with open(os.path.join(self.directory, name), "wb") as file:
+                for record in self._buffer:
+                    file.write(RECORD.pack(*record))
+            self._buffer.clear()
+            self._segment_names.append(name)
+            self._segments.append(_Segment(os.path.join(self.directory, name)))
+        self._catalog.flush()
+        self._offsets.flush()
+        self._write_manifest()
+
+    def probe(self, position: GameField | BoardSnapshot, color: Literal["black", "white"]) -> list[tuple[int, int]]:
+        """Finds the games that reached a position.
+
+        Buffered games are not searched; call flush() first to include them.
+
+        Args:
+            position (GameField | BoardSnapshot): The position.
+            color (Literal["black", "white"]): The side to move.
+
+        Returns:
+            list[tuple[int, int]]: The game ids and plies at which the position occurred, sorted.
+        """
+        return self.probe_key(position_key(position, color))
+
+    def probe_key(self, key: int) -> list[tuple[int, int]]:
+        """Finds the games that reached a position given by its key (see position_key).
+
+        Args:
+            key (int): The position key.
+
+        Returns:
+            list[tuple[int, int]]: The game ids and plies, sorted.
+        """
+        return sorted(hit for segment in self._segments for hit in segment.lookup(key))
+
+    def game(self, game_id: int) -> dict:
+        """Return the catalog data of a game.
+
+        Args:
+            game_id (int): The id of the game.
+
+        Raises:
+            IndexError: If there is no such game.
+        """
+        if not 0 <= game_id < self.games:
+            raise IndexError(game_id)
+        self._catalog.flush()
+        self._offsets.flush()
+        with open(os.path.join(self.directory, OFFSETS), "rb") as file:
+            file.seek(game_id * _OFFSET.size)
+            offset, = _OFFSET.unpack(file.read(_OFFSET.size))
+        with open(os.path.join(self.directory, CATALOG), "rb") as file:
+            file.seek(offset)
+            return json.loads(file.readline())
+
+    def compact(self):
+        """Merges all segments into one, keeping memory use constant; probes then search a single file."""
+        self.flush()
+        if len(self._segments) < 2:
+            return
+        name = f"segment-{self._next_segment}.idx"
+        self._next_segment += 1
+        with open(os.path.join(self.directory, name), "wb") as file:
+            for record in heapq.merge(*self._segments):
+                file.write(RECORD.pack(*record))
+        old = self._segments
+        self._segments = [_Segment(os.path.join(self.directory, name))]
+        self._segment_names = [name]
+        self._write_manifest()
+        for segment in old:
+            segment.close()
+            os.remove(segment.path)
+
+    def close(self):
+        """Writes the buffered games and releases the files."""
+        self.flush()
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+        self._catalog.close()
+        self._offsets.close()
+
+    def _discard_unflushed(self):
+        # Games added after the last flush are in the catalog but not in the manifest or the segments, e.g. when
+        # the process was killed; drop them so that new game ids line up with their catalog entries again.
+        offsets_path = os.path.join(self.directory, OFFSETS)
+        catalog_path = os.path.join(self.directory, CATALOG)
+        end = 0
+        if self.games:
+            with open(offsets_path, "rb") as file:
+                file.seek((self.games - 1) * _OFFSET.size)
+                offset, = _OFFSET.unpack(file.read(_OFFSET.size))
+            with open(catalog_path, "rb") as file:
+                file.seek(offset)
+                end = offset + len(file.readline())
+        for path, size in ((offsets_path, self.games * _OFFSET.size), (catalog_path, end)):
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def _write_manifest(self):
+        manifest = {"segments": self._segment_names, "games": self.games, "next_segment": self._next_segment}
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(path + ".tmp", path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from fen import parse_fen
+
+    parser = argparse.ArgumentParser(description="Build and query an index of the positions of game archives.")
+    parser.add_argument("directory", help="index directory")
+    parser.add_argument("--pgn", action="append", default=[], metavar="PATH", help="PGN archive to add")
+    parser.add_argument("--compact", action="store_true", help="merge the index segments")
+    parser.add_argument("--fen", help="print the games that reached this position")
+    args = parser.parse_args()
+
+    with PositionIndex(args.directory) as index:
+        for archive_path in args.pgn:
+            print(f"{index.add_pgn(archive_path)} games added from {archive_path}")
+        if args.compact:
+            index.compact()
+        if args.fen:
+            index.flush()
+            board, side = parse_fen(args.fen)
+            for found_id, found_ply in index.probe(board, side):
+                tags = index.game(found_id).get("tags", {})
+                print(f"game {found_id} ply {found_ply}: {tags.get('White', '?')} - {tags.get('Black', '?')}")
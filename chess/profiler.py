@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from typing import Callable, TextIO
+
+
+class PhaseStats:
+    """Accumulated timings of a single instrumented phase.
+
+    Attributes:
+        calls (int): How many times the phase was entered.
+        total_time (float): Cumulative wall time spent in the phase, in seconds.
+    """
+
+    def __init__(self):
+        """Initializes empty phase statistics."""
+        self.calls = 0
+        self.total_time = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """Return the average duration of one call in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class SearchStats:
+    """Accumulated node counts of a search routine.
+
+    Attributes:
+        searches (int): How many searches were recorded.
+        nodes (int): Total number of visited nodes.
+        total_time (float): Cumulative search time in seconds.
+    """
+
+    def __init__(self):
+        """Initializes empty search statistics."""
+        self.searches = 0
+        self.nodes = 0
+        self.total_time = 0.0
+
+    @property
+    def nps(self) -> float:
+        """Return the number of nodes searched per second."""
+        return self.nodes / self.total_time if self.total_time else 0.0
+
+
+class ProfileStats:
+    """In-process statistics collected by the Profiler.
+
+    Attributes:
+        phases (dict[str, PhaseStats]): Statistics per instrumented method (e.g. 'GameField.get_figure').
+        figures (dict[str, PhaseStats]): Move generation statistics per figure type (e.g. 'Rook').
+        searches (dict[str, SearchStats]): Node statistics per search routine.
+        stacks (dict[str, float]): Self time in seconds per collapsed call stack ('a;b;c').
+    """
+
+    def __init__(self):
+        """Initializes empty statistics."""
+        self.phases: dict[str, PhaseStats] = {}
+        self.figures: dict[str, PhaseStats] = {}
+        self.searches: dict[str, SearchStats] = {}
+        self.stacks: dict[str, float] = {}
+
+    def format(self) -> str:
+        """Return a human-readable report of the collected statistics.
+
+        Returns:
+            str: A multi-line table of phases, figure types and searches sorted by cumulative time.
+        """
+        lines = [f"{'phase':<45}{'calls':>10}{'total, s':>12}{'mean, us':>12}"]
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].total_time):
+            lines.append(f"{name:<45}{stats.calls:>10}{stats.total_time:>12.4f}{stats.mean_time * 1e6:>12.2f}")
+        if self.figures:
+            lines.append("")
+            lines.append(f"{'figure':<45}{'calls':>10}{'total, s':>12}{'mean, us':>12}")
+            for name, stats in sorted(self.figures.items(), key=lambda item: -item[1].total_time):
+                lines.append(
+                    f"{name:<45}{stats.calls:>10}{stats.total_time:>12.4f}{stats.mean_time * 1e6:>12.2f}")
+        if self.searches:
+            lines.append("")
+            lines.append(f"{'search':<45}{'nodes':>10}{'total, s':>12}{'nps':>12}")
+            for name, stats in sorted(self.searches.items()):
+                lines.append(f"{name:<45}{stats.nodes:>10}{stats.total_time:>12.4f}{stats.nps:>12.0f}")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> str:
+        """Return the call stacks in the collapsed format understood by flamegraph tools.
+
+        Each line has the form 'outer;inner;innermost <microseconds>', where the value is the self time
+        spent in the innermost frame of that stack.
+
+        Returns:
+            str: The collapsed stacks, one per line.
+        """
+        return "\n".join(f"{stack} {round(self_time * 1e6)}" for stack, self_time in sorted(self.stacks.items()))
+
+
+class Profiler:
+    """Optional instrumentation of the game hot paths.
+
+    Instrumentation is installed by replacing methods of the given classes with timing wrappers,
+    so a disabled profiler costs nothing: the original methods are called directly.
+
+    Attributes:
+        stats (ProfileStats): The statistics collected so far.
+        enabled (bool): True while the wrappers are installed.
+    """
+
+    def __init__(self):
+        """Initializes a disabled Profiler with empty statistics."""
+        self.stats = ProfileStats()
+        self.enabled = False
+        self._patched: list[tuple[type, str, Callable]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dump_thread: threading.Thread | None = None
+        self._dump_stop = threading.Event()
+
+    def enable(self, *classes: type):
+        """Installs the timing wrappers into the given classes.
+
+        Every public method defined in a class is instrumented. For classes with a
+        'get_available_moves' method (figures) all subclasses are instrumented as well,
+        and move generation time is additionally attributed to the concrete figure type.
+
+        Args:
+            *classes (type): Classes to instrument, e.g. GameController, GameField, Figure.
+        """
+        for cls in classes:
+            for target in self._with_subclasses(cls):
+                for name, attr in list(target.__dict__.items()):
+                    if name.startswith("_") or not inspect.isfunction(attr):
+                        continue
+                    if any(patched_cls is target and patched_name == name
+                           for patched_cls, patched_name, _ in self._patched):
+                        continue
+                    setattr(target, name, self._wrap(f"{target.__name__}.{name}", attr,
+                                                     per_figure=name == "get_available_moves"))
+                    self._patched.append((target, name, attr))
+        self.enabled = True
+
+    def disable(self):
+        """Restores the original methods. The collected statistics are kept."""
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+        self.enabled = False
+
+    def reset(self):
+        """Discards all collected statistics."""
+        with self._lock:
+            self.stats = ProfileStats()
+
+    def record_search(self, name: str, nodes: int, elapsed: float):
+        """Records the result of one search so that nodes per second can be reported.
+
+        Search routines call this once per search, which keeps the overhead negligible.
+
+        Args:
+            name (str): The name of the search routine (e.g. 'alphabeta').
+            nodes (int): The number of nodes visited.
+            elapsed (float): The search duration in seconds.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.stats.searches.get(name)
+            if stats is None:
+                stats = self.stats.searches[name] = SearchStats()
+            stats.searches += 1
+            stats.nodes += nodes
+            stats.total_time += elapsed
+
+    def dump(self, stream: TextIO = None):
+        """Writes the current statistics report to a stream.
+
+        Args:
+            stream (TextIO, optional): The output stream. Defaults to sys.stderr.
+        """
+        if stream is None:
+            stream = sys.stderr
+        with self._lock:
+            report = self.stats.format()
+        print(report, file=stream, flush=True)
+
+    def write_collapsed(self, path: str):
+        """Writes the collapsed call stacks to a file for flamegraph tools.
+
+        Args:
+            path (str): The output file path.
+        """
+        with self._lock:
+            data = self.stats.collapsed_stacks()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(data + "\n")
+
+    def start_periodic_dump(self, interval: float = 10.0, stream: TextIO = None):
+        """Starts a background thread that dumps the statistics every interval seconds.
+
+        Args:
+            interval (float, optional): Seconds between dumps. Defaults to 10.
+            stream (TextIO, optional): The output stream. Defaults to sys.stderr.
+        """
+        self.stop_periodic_dump()
+        self._dump_stop.clear()
+
+        def run():
+            while not self._dump_stop.wait(interval):
+                self.dump(stream)
+
+        self._dump_thread = threading.Thread(target=run, name="profiler-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self):
+        """Stops the periodic dump thread if it is running."""
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_thread = None
+
+    @staticmethod
+    def _with_subclasses(cls: type) -> list[type]:
+        result = [cls]
+        for subclass in cls.__subclasses__():
+            result.extend(Profiler._with_subclasses(subclass))
+        return result
+
+    def _wrap(self, phase: str, function: Callable, per_figure: bool) -> Callable:
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            local = profiler._local
+            stack = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+            frame = [phase, 0.0]
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                profiler._record(phase, stack, elapsed, frame[1],
+                                 type(args[0]).__name__ if per_figure else None)
+
+        return wrapper
+
+    def _record(self, phase: str, stack: list, elapsed: float, children_time: float, figure: str | None):
+        key = ";".join([frame[0] for frame in stack] + [phase])
+        with self._lock:
+            stats = self.stats.phases.get(phase)
+            if stats is None:
+                stats = self.stats.phases[phase] = PhaseStats()
+            stats.calls += 1
+            stats.total_time += elapsed
+            if figure is not None:
+                figure_stats = self.stats.figures.get(figure)
+                if figure_stats is None:
+                    figure_stats = self.stats.figures[figure] = PhaseStats()
+                figure_stats.calls += 1
+                figure_stats.total_time += elapsed
+            self.stats.stacks[key] = self.stats.stacks.get(key, 0.0) + elapsed - children_time
+
+
+#: Process-wide profiler shared by the game and search modules.
+PROFILER = Profiler()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+from typing import Literal
+
+from figures import *
+from figures.definitions import FILES
+
+#: Figure types with a stable one-byte code for serialization; the code of a type is its index + 1.
+FIGURE_TYPES: list[type] = [Pawn, Knight, Bishop, Rook, Queen, King, Balloon, Tank, PEKKA]
+
+_BLACK = 0x80
+_instances: dict[tuple[type, str], Figure] = {}
+
+
+def register_figure_type(figure_type: type) -> int:
+    """Registers a figure type for snapshot serialization.
+
+    Types are also registered on first serialization. Codes of types registered at runtime depend on
+    the registration order, so processes exchanging snapshots must register them in the same order.
+
+    Args:
+        figure_type (type): The figure class; it must be constructible from a color alone.
+
+    Returns:
+        int: The code assigned to the type.
+    """
+    if figure_type not in FIGURE_TYPES:
+        if len(FIGURE_TYPES) >= _BLACK - 1:
+            raise ValueError("Too many figure types registered")
+        FIGURE_TYPES.append(figure_type)
+    return FIGURE_TYPES.index(figure_type) + 1
+
+
+def _figure_instance(figure_type: type, color: str) -> Figure:
+    figure = _instances.get((figure_type, color))
+    if figure is None:
+        figure = _instances[(figure_type, color)] = figure_type(color)
+    return figure
+
+
+class BoardSnapshot:
+    """An immutable board position that shares unchanged columns with the snapshot it was derived from.
+
+    Columns are tuples, so a snapshot can be cloned in O(1) (the clone is the snapshot itself), and
+    changing a square copies only the affected column. The 'data' mapping has the same layout as
+    GameField.data, so figures can generate moves on a snapshot directly. Snapshots of a HexGameField
+    are HexBoardSnapshots (see hex_field), which hold the columns of the hexagonal board.
+
+    Attributes:
+        data (dict[str, tuple]): Columns 'a' to 'h' mapped to tuples of figures or None. Must not be modified.
+    """
+
+    __slots__ = ("data", "_key")
+
+    def __init__(self, data: dict[str, tuple]):
+        """Initializes a BoardSnapshot.
+
+        Args:
+            data (dict[str, tuple]): Columns 'a' to 'h' mapped to tuples of 8 figures or None.
+        """
+        self.data = data
+        self._key: bytes | None = None
+
+    @classmethod
+    def from_data(cls, data: dict[str, list]) -> BoardSnapshot:
+        """Creates a snapshot from mutable board data.
+
+        Args:
+            data (dict[str, list]): Columns 'a' to 'h' mapped to lists of figures or None.
+
+        Returns:
+            BoardSnapshot: The snapshot of the data.
+        """
+        return cls({col: tuple(data[col]) for col in FILES})
+
+    def to_data(self) -> dict[str, list]:
+        """Return a mutable copy of the board data, suitable for GameField."""
+        return {col: list(column) for col, column in self.data.items()}
+
+    def copy(self) -> BoardSnapshot:
+        """Return a clone of the snapshot in O(1). Snapshots are immutable, so this is the snapshot itself."""
+        return self
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> BoardSnapshot:
+        return self
+
+    def get_figure(self, move: str) -> Figure | None:
+        """Retrieves the figure at the specified board position.
+
+        Args:
+            move (str): The board position in algebraic notation (e.g., 'e2').
+
+        Returns:
+            Figure or None: The figure at the given position, or None if the square is empty.
+        """
+        return self.data[move[0].lower()][int(move[1:]) - 1]
+
+    def set_figure(self, move: str, figure: Figure | None) -> BoardSnapshot:
+        """Return a new snapshot with a figure placed at the specified position.
+
+        Only the affected column is copied; all other columns are shared with this snapshot.
+
+        Args:
+            move (str): The board position in algebraic notation (e.g., 'e2').
+            figure (Figure | None): The figure to place, or None to empty the square.
+
+        Returns:
+            BoardSnapshot: The derived snapshot.
+        """
+        col = move[0].lower()
+        row = int(move[1:]) - 1
+        column = self.data[col]
+        data = self.data.copy()
+        data[col] = column[:row] + (figure,) + column[row + 1:]
+        return type(self)(data)
+
+    def remove_figure(self, move: str) -> BoardSnapshot:
+        """Return a new snapshot with the specified position emptied.
+
+        Args:
+            move (str): The board position in algebraic notation (e.g., 'e2').
+
+        Returns:
+            BoardSnapshot: The derived snapshot.
+        """
+        return self.set_figure(move, None)
+
+    def move_figure(self, start_pos: str, end_pos: str) -> BoardSnapshot:
+        """Return a new snapshot with the figure moved from one position to another.
+
+        A figure on the end position is captured. At most two columns are copied.
+
+        Args:
+            start_pos (str): The starting position in algebraic notation.
+            end_pos (str): The ending position in algebraic notation.
+
+        Returns:
+            BoardSnapshot: The derived snapshot.
+        """
+        start_col, start_row = start_pos[0].lower(), int(start_pos[1:]) - 1
+        end_col, end_row = end_pos[0].lower(), int(end_pos[1:]) - 1
+        figure = self.data[start_col][start_row]
+        data = self.data.copy()
+        column = data[start_col]
+        data[start_col] = column[:start_row] + (None,) + column[start_row + 1:]
+        column = data[end_col]
+        data[end_col] = column[:end_row] + (figure,) + column[end_row + 1:]
+        return type(self)(data)
+
+    def iter_figures(self, color: Literal["black", "white"] = None):
+        """Lazily yields the figures of the snapshot with their positions.
+
+        Args:
+            color (Literal["black", "white"], optional): Yield only figures of this color. Defaults to None (all).
+
+        Yields:
+            tuple[str, Figure]: The position in algebraic notation and the figure standing on it.
+        """
+        for col, column in self.data.items():
+            for row, figure in enumerate(column):
+                if figure is not None and (color is None or figure.color == color):
+                    yield f"{col}{row + 1}", figure
+
+    def to_bytes(self) -> bytes:
+        """Serializes the snapshot into a compact byte string.
+
+        The format is an 8-byte big-endian occupancy mask (bit i set for square index i, see SQUARE_INDEX)
+        followed by one byte per occupied square in index order (a1, a2, ..., h8): the figure type code,
+        with the high bit set for black figures. The standard starting position takes 40 bytes.
+
+        Returns:
+            bytes: The serialized snapshot.
+        """
+        if self._key is None:
+            mask = 0
+            codes = bytearray()
+            index = 0
+            for col in FILES:
+                for figure in self.data[col]:
+                    if figure is not None:
+                        mask |= 1 << index
+                        code = register_figure_type(type(figure))
+                        codes.append(code | _BLACK if figure.color == "black" else code)
+                    index += 1
+            self._key = mask.to_bytes(8, "big") + bytes(codes)
+        return self._key
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> BoardSnapshot:
+        """Restores a snapshot serialized by to_bytes.
+
+        Figures are shared immutable instances, one per figure type and color.
+
+        Args:
+            raw (bytes): The serialized snapshot.
+
+        Returns:
+            BoardSnapshot: The restored snapshot.
+
+        Raises:
+            ValueError: If the byte string is malformed.
+        """
+        if len(raw) < 8:
+            raise ValueError("Snapshot data is too short")
+        mask = int.from_bytes(raw[:8], "big")
+        if mask.bit_count() != len(raw) - 8:
+            raise ValueError("Snapshot occupancy mask does not match the figure count")
+        cells = [None] * 64
+        position = 8
+        for index in range(64):
+            if mask >> index & 1:
+                code = raw[position]
+                position += 1
+                type_index = (code & ~_BLACK) - 1
+                if not 0 <= type_index < len(FIGURE_TYPES):
+                    raise ValueError(f"Unknown figure code: {code}")
+                color = "black" if code & _BLACK else "white"
+                cells[index] = _figure_instance(FIGURE_TYPES[type_index], color)
+        snapshot = cls({col: tuple(cells[i * 8:i * 8 + 8]) for i, col in enumerate(FILES)})
+        snapshot._key = bytes(raw)
+        return snapshot
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardSnapshot):
+            return NotImplemented
+        return self.to_bytes() == other.to_bytes()
+
+    def __hash__(self) -> int:
+        return hash(self.to_bytes())
+
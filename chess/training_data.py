@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from typing import Callable, Iterable, Iterator, Literal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from field import GameField
+from figures import *
+from figures.definitions import SQUARE_INDEX
+from pgn import PgnGame, replay
+from snapshot import FIGURE_TYPES, BoardSnapshot, register_figure_type
+
+# Training data is stored as a directory of chunks. Chunk k consists of four .npy files with the same number
+# of rows (positions):
+#   planes-k.npy   uint8 (n, planes, 8, 8): plane 2 * (type code - 1) is white figures of a type, the next one
+#                  black figures; [plane, file, rank] is 1 where such a figure stands (flat index = square index)
+#   side-k.npy     int8 (n,): 1 if white is to move, -1 if black is
+#   outcome-k.npy  int8 (n,): the game result from white's point of view: 1, 0 or -1
+#   move-k.npy     uint8 (n, 2): start and end square index of the move played
+# manifest.json lists the chunks and the figure types of the planes.
+
+MANIFEST = "manifest.json"
+_ARRAYS = ("planes", "side", "outcome", "move")
+
+#: A position with its move: (position, side to move, start square, end square).
+Sample = tuple[BoardSnapshot, str, str, str]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Training data export requires NumPy")
+
+
+def encode_planes(snapshot: BoardSnapshot, out, type_count: int):
+    """Writes the piece planes of a position into an array.
+
+    Args:
+        snapshot (BoardSnapshot): The position.
+        out (np.ndarray): A zeroed uint8 array of shape (2 * type_count, 8, 8).
+        type_count (int): The number of figure types of the layout.
+
+    Raises:
+        ValueError: If the position holds a figure type outside the layout.
+    """
+    flat = out.reshape(2 * type_count, 64)
+    for pos, figure in snapshot.iter_figures():
+        code = register_figure_type(type(figure))
+        if code > type_count:
+            raise ValueError(f"The layout has no planes for {type(figure).__name__}")
+        flat[2 * (code - 1) + (figure.color == "black"), SQUARE_INDEX[pos]] = 1
+
+
+def history_samples(history) -> Iterator[Sample]:
+    """Yields the positions of a recorded game with the moves played from them.
+
+    Args:
+        history (MoveHistory): The game history; positions are replayed from its checkpoints.
+
+    Yields:
+        Sample: Every position up to the current ply of the history.
+    """
+    color = "white"
+    for ply, move in enumerate(history):
+        yield history.position(ply), color, move.start_pos, move.end_pos
+        color = "black" if color == "white" else "white"
+
+
+def history_outcome(history) -> int:
+    """Return the result of a recorded game from white's point of view: the side that captured the King wins.
+
+    Args:
+        history (MoveHistory): The game history.
+
+    Returns:
+        int: 1, -1, or 0 if no King was captured.
+    """
+    for ply, move in enumerate(history):
+        if isinstance(move.captured_figure, King):
+            return 1 if ply % 2 == 0 else -1
+    return 0
+
+
+def random_policy(field: GameField, color: Literal["black", "white"]) -> tuple[str, str] | None:
+    """Chooses a uniformly random available move, for self-play without an engine.
+
+    Args:
+        field (GameField): The game board.
+        color (Literal["black", "white"]): The side to move.
+
+    Returns:
+        tuple[str, str] | None: The start and end squares, or None if the side cannot move.
+    """
+    moves = [(pos, move) for pos, figure in field.iter_figures(color)
+             for move in figure.get_available_moves(pos, field)]
+    return random.choice(moves) if moves else None
+
+
+def self_play(policy: Callable[[GameField, str], tuple[str, str] | None] = random_policy, start: dict = None,
+              max_plies: int = 300) -> tuple[list[Sample], int]:
+    """Plays a game of a policy against itself under the rules of the game: capturing the King wins.
+
+    Args:
+        policy (Callable, optional): Chooses a move for a board and side to move. Defaults to random_policy.
+        start (dict, optional): The initial board data, e.g. a copy of AUTHOR_FIELD. Defaults to the standard one.
+        max_plies (int, optional): Plies after which the game is a draw. Defaults to 300.
+
+    Returns:
+        tuple[list[Sample], int]: The positions with their moves and the result from white's point of view.
+    """
+    field = GameField(start)
+    samples = []
+    color = "white"
+    for _ in range(max_plies):
+        move = policy(field, color)
+        if move is None:
+            return samples, 0
+        start_pos, end_pos = move
+        samples.append((field.snapshot(), color, start_pos, end_pos))
+        figure = field.get_figure(start_pos)
+        captured = field.get_figure(end_pos)
+        field.remove_figure(start_pos)
+        field.set_figure(end_pos, figure)
+        if isinstance(captured, King):
+            return samples, 1 if color == "white" else -1
+        color = "black" if color == "white" else "white"
+    return samples, 0
+
+
+def pgn_samples(game: PgnGame) -> Iterator[Sample]:
+    """Yields the positions of a PGN game with the moves played from them.
+
+    Args:
+        game (PgnGame): The game.
+
+    Yields:
+        Sample: Every position of the game.
+    """
+    return replay(game)
+
+
+class TrainingDataWriter:
+    """Streams positions into a training data directory in fixed-size chunks.
+
+    Positions are buffered in preallocated arrays of chunk_size rows and written out as soon as the
+    buffer is full, so memory use does not depend on the number of positions. Use as a context manager
+    or call close() to write the last, partial chunk and the manifest.
+
+    Attributes:
+        directory (str): The output directory.
+        chunk_size (int): The number of positions per chunk.
+        type_count (int): The number of figure types with planes.
+        count (int): The number of positions written so far.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 1 << 16, figure_types: list[type] = None):
+        """Initializes a TrainingDataWriter.
+
+        Args:
+            directory (str): The output directory; it is created if missing.
+            chunk_size (int, optional): The number of positions per chunk. Defaults to 65536.
+            figure_types (list[type], optional): Extra figure types to register before fixing the layout.
+                Defaults to None (the registered types, which include the author figures).
+        """
+        _require_numpy()
+        for figure_type in figure_types or ():
+            register_figure_type(figure_type)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.type_count = len(FIGURE_TYPES)
+        self.count = 0
+        self._chunks: list[int] = []
+        self._fill = 0
+        self._planes = np.zeros((chunk_size, 2 * self.type_count, 8, 8), np.uint8)
+        self._side = np.zeros(chunk_size, np.int8)
+        self._outcome = np.zeros(chunk_size, np.int8)
+        self._move = np.zeros((chunk_size, 2), np.uint8)
+
+    def __enter__(self) -> TrainingDataWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_game(self, samples: Iterable[Sample], outcome: int):
+        """Appends the positions of a finished game.
+
+        Args:
+            samples (Iterable[Sample]): The positions with their moves, e.g. from history_samples or pgn_samples.
+            outcome (int): The result from white's point of view: 1, 0 or -1.
+        """
+        for snapshot, color, start, end in samples:
+            row = self._fill
+            self._planes[row] = 0
+            encode_planes(snapshot, self._planes[row], self.type_count)
+            self._side[row] = 1 if color == "white" else -1
+            self._outcome[row] = outcome
+            self._move[row] = SQUARE_INDEX[start], SQUARE_INDEX[end]
+            self._fill += 1
+            self.count += 1
+            if self._fill == self.chunk_size:
+                self._flush()
+
+    def close(self):
+        """Writes the buffered positions and the manifest."""
+        if self._fill:
+            self._flush()
+        manifest = {
+            "figure_types": [figure_type.__name__ for figure_type in FIGURE_TYPES[:self.type_count]],
+            "chunks": self._chunks,
+            "count": self.count,
+        }
+        with open(os.path.join(self.directory, MANIFEST), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+    def _flush(self):
+        index = len(self._chunks)
+        arrays = (self._planes, self._side, self._outcome, self._move)
+        for name, array in zip(_ARRAYS, arrays):
+            np.save(os.path.join(self.directory, f"{name}-{index}.npy"), array[:self._fill])
+        self._chunks.append(self._fill)
+        self._fill = 0
+
+
+class TrainingData:
+    """Read access to a training data directory without copying: every chunk is memory-mapped.
+
+    Attributes:
+        directory (str): The data directory.
+        figure_types (list[str]): The names of the figure types of the planes, in plane order.
+        chunks (list[dict[str, np.ndarray]]): The mapped arrays of every chunk by name
+            ('planes', 'side', 'outcome', 'move').
+    """
+
+    def __init__(self, directory: str):
+        """Opens a training data directory.
+
+        Args:
+            directory (str): A directory written by TrainingDataWriter.
+        """
+        _require_numpy()
+        with open(os.path.join(directory, MANIFEST)) as file:
+            manifest = json.load(file)
+        self.directory = directory
+        self.figure_types = manifest["figure_types"]
+        self.chunks = [
+            {name: np.load(os.path.join(directory, f"{name}-{index}.npy"), mmap_mode="r") for name in _ARRAYS}
+            for index in range(len(manifest["chunks"]))
+        ]
+        self._offsets = np.cumsum([0] + manifest["chunks"])
+
+    def __len__(self) -> int:
+        """Return the number of positions."""
+        return int(self._offsets[-1])
+
+    def __getitem__(self, index: int) -> dict:
+        """Return the arrays of one position as read-only views."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chunk = int(np.searchsorted(self._offsets, index, side="right")) - 1
+        row = index - int(self._offsets[chunk])
+        return {name: array[row] for name, array in self.chunks[chunk].items()}
+
+    def iter_batches(self, batch_size: int) -> Iterator[dict]:
+        """Yields the positions in order as batches of read-only views; batches do not span chunks.
+
+        Args:
+            batch_size (int): The maximal number of positions per batch.
+
+        Yields:
+            dict[str, np.ndarray]: The arrays of the batch by name.
+        """
+        for chunk in self.chunks:
+            rows = len(chunk["side"])
+            for start in range(0, rows, batch_size):
+                yield {name: array[start:start + batch_size] for name, array in chunk.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import copy
+
+    from pgn import read_games
+
+    parser = argparse.ArgumentParser(description="Export positions as training data.")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--pgn", action="append", default=[], metavar="PATH", help="PGN archive to export")
+    parser.add_argument("--self-play", type=int, default=0, metavar="N", help="random self-play games to export")
+    parser.add_argument("--author", action="store_true", help="self-play from the author figures position")
+    parser.add_argument("--chunk-size", type=int, default=1 << 16, help="positions per chunk")
+    args = parser.parse_args()
+
+    with TrainingDataWriter(args.directory, args.chunk_size) as writer:
+        for path in args.pgn:
+            with open(path) as archive:
+                for game in read_games(archive):
+                    if game.result is None:
+                        continue
+                    try:
+                        samples = list(pgn_samples(game))
+                    except ValueError as error:
+                        print(f"Skipping a game of {path}: {error}")
+                        continue
+                    writer.add_game(samples, game.result)
+        for _ in range(args.self_play):
+            writer.add_game(*self_play(start=copy.deepcopy(AUTHOR_FIELD) if args.author else None))
+    print(f"{writer.count} positions written to {args.directory}")
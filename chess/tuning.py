@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from evaluation import FIGURE_VALUES, PIECE_SQUARE_ROWS, set_figure_value, type_value
+from figures import *
+from snapshot import FIGURE_TYPES
+from training_data import TrainingData
+
+# Texel tuning: the evaluation of evaluation.py is linear in its parameters (a value per figure type and a
+# piece-square bonus per type and square), so for a batch of positions it is a matrix product X @ theta.
+# The predicted score of white is sigmoid(k * eval / 400) in base 10; the tuner minimizes the mean squared
+# difference to the game outcomes with full-dataset gradient steps, streaming the memory-mapped training data
+# chunk by chunk so every step costs a few large matrix products and no Python loop over positions.
+#
+# theta holds, for each of the T figure types of the data in plane order, the value (T entries) followed by the
+# bonuses from white's point of view as [type, file, rank] (T * 64 entries).
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Evaluation tuning requires NumPy")
+
+
+def features(planes):
+    """Builds the linear evaluation features of a batch of positions.
+
+    Args:
+        planes (np.ndarray): Piece planes of shape (n, 2 * T, 8, 8), see training_data.
+
+    Returns:
+        np.ndarray: float32 array of shape (n, T * 65): the white minus black count of every type, followed by
+            the white minus mirrored black occupancy of every type and square.
+    """
+    white = planes[:, 0::2].astype(np.float32)
+    black = planes[:, 1::2].astype(np.float32)
+    count = len(planes)
+    counts = white.sum(axis=(2, 3)) - black.sum(axis=(2, 3))
+    # Black bonuses are the white ones with ranks mirrored, so black occupancy is flipped along the rank axis.
+    squares = (white - black[:, :, :, ::-1]).reshape(count, -1)
+    return np.concatenate((counts, squares), axis=1)
+
+
+class TexelTuner:
+    """Tunes figure values and piece-square bonuses on labeled positions.
+
+    Attributes:
+        data (TrainingData): The positions with their game outcomes.
+        figure_types (list[type]): The figure types of the data in plane order.
+        frozen (set[type]): Types whose value is kept (at least one anchors the scale; the King value only
+            matters once a King is captured).
+        l2 (float): Weight of the L2 penalty on the piece-square bonuses, which keeps them centered.
+        k (float): The sigmoid scale; fitted to the data by fit_k.
+        batch_size (int): The number of positions converted to features at once.
+    """
+
+    def __init__(self, data: TrainingData, frozen: Iterable[type] = (Pawn, King), l2: float = 1e-6,
+                 batch_size: int = 1 << 15):
+        """Initializes a TexelTuner.
+
+        Args:
+            data (TrainingData): The positions with their game outcomes.
+            frozen (Iterable[type], optional): Types whose value is not tuned. Defaults to Pawn and King.
+            l2 (float, optional): The piece-square penalty weight. Defaults to 1e-6.
+            batch_size (int, optional): Positions converted to features at once. Defaults to 32768.
+        """
+        _require_numpy()
+        by_name = {figure_type.__name__: figure_type for figure_type in FIGURE_TYPES}
+        missing = [name for name in data.figure_types if name not in by_name]
+        if missing:
+            raise ValueError(f"Unknown figure types in the data: {', '.join(missing)}")
+        self.data = data
+        self.figure_types = [by_name[name] for name in data.figure_types]
+        self.frozen = set(frozen)
+        self.l2 = l2
+        self.k = 1.0
+        self.batch_size = batch_size
+
+    def initial_parameters(self):
+        """Return theta for the current values and bonuses of evaluation.py."""
+        count = len(self.figure_types)
+        theta = np.zeros(count * 65, np.float64)
+        for index, figure_type in enumerate(self.figure_types):
+            theta[index] = type_value(figure_type)
+            rows = PIECE_SQUARE_ROWS.get(figure_type)
+            if rows is not None:
+                # rows run from rank 8 down to rank 1; theta is [file, rank].
+                bonuses = np.array(rows, np.float64)[::-1].T
+                theta[count + index * 64:count + (index + 1) * 64] = bonuses.reshape(64)
+        return theta
+
+    def loss(self, theta, k: float = None) -> float:
+        """Return the mean squared prediction error of theta over the whole dataset.
+
+        Args:
+            theta (np.ndarray): The parameters.
+            k (float, optional): The sigmoid scale. Defaults to the fitted one.
+        """
+        return self._evaluate(theta, self.k if k is None else k, gradient=False)[0]
+
+    def fit_k(self, theta, low: float = 0.01, high: float = 5.0, iterations: int = 40) -> float:
+        """Finds the sigmoid scale that best fits the outcomes for fixed parameters (golden-section search).
+
+        Args:
+            theta (np.ndarray): The parameters, usually the initial ones.
+            low (float, optional): The lower search bound. Defaults to 0.01.
+            high (float, optional): The upper search bound. Defaults to 5.
+
+        Returns:
+            float: The fitted scale, also stored in k.
+        """
+        ratio = (math.sqrt(5) - 1) / 2
+        a, b = low, high
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        loss_c, loss_d = self.loss(theta, c), self.loss(theta, d)
+        for _ in range(iterations):
+            if loss_c < loss_d:
+                b, d, loss_d = d, c, loss_c
+                c = b - ratio * (b - a)
+                loss_c = self.loss(theta, c)
+            else:
+                a, c, loss_c = c, d, loss_d
+                d = a + ratio * (b - a)
+                loss_d = self.loss(theta, d)
+        self.k = (a + b) / 2
+        return self.k
+
+    def tune(self, theta=None, steps: int = 200, learning_rate: float = 2.0, report=None):
+        """Minimizes the prediction error with Adam steps on the full-dataset gradient.
+
+        Args:
+            theta (np.ndarray, optional): The starting parameters. Defaults to initial_parameters().
+            steps (int, optional): The number of gradient steps. Defaults to 200.
+            learning_rate (float, optional): The Adam step size in centipawns. Defaults to 2.
+            report (Callable[[int, float], None], optional): Called with the step and loss after every step.
+
+        Returns:
+            np.ndarray: The tuned parameters.
+        """
+        theta = self.initial_parameters() if theta is None else np.array(theta, np.float64)
+        mask = np.ones_like(theta)
+        for index, figure_type in enumerate(self.figure_types):
+            if figure_type in self.frozen:
+                mask[index] = 0.0
+        first = np.zeros_like(theta)
+        second = np.zeros_like(theta)
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        for step in range(1, steps + 1):
+            loss, gradient = self._evaluate(theta, self.k, gradient=True)
+            gradient *= mask
+            first = beta1 * first + (1 - beta1) * gradient
+            second = beta2 * second + (1 - beta2) * gradient ** 2
+            corrected = first / (1 - beta1 ** step)
+            scale = np.sqrt(second / (1 - beta2 ** step)) + epsilon
+            theta -= learning_rate * corrected / scale
+            if report is not None:
+                report(step, loss)
+        return theta
+
+    def parameters(self, theta) -> dict[type, tuple[int, tuple[tuple[int, ...], ...]]]:
+        """Converts theta to the format of evaluation.py.
+
+        Args:
+            theta (np.ndarray): The parameters.
+
+        Returns:
+            dict[type, tuple[int, tuple]]: The rounded value and piece-square rows (rank 8 first) by figure type.
+        """
+        count = len(self.figure_types)
+        result = {}
+        for index, figure_type in enumerate(self.figure_types):
+            bonuses = np.asarray(theta[count + index * 64:count + (index + 1) * 64]).reshape(8, 8)
+            rows = tuple(tuple(int(round(value)) for value in row) for row in bonuses.T[::-1])
+            result[figure_type] = int(round(theta[index])), rows
+        return result
+
+    def apply(self, theta):
+        """Configures evaluation.py with tuned parameters (see evaluation.set_figure_value).
+
+        Args:
+            theta (np.ndarray): The parameters.
+        """
+        for figure_type, (value, rows) in self.parameters(theta).items():
+            set_figure_value(figure_type, value, rows)
+
+    def save(self, theta, path: str):
+        """Writes tuned parameters as JSON for load_parameters.
+
+        Args:
+            theta (np.ndarray): The parameters.
+            path (str): The output file.
+        """
+        data = {figure_type.__name__: {"value": value, "rows": rows}
+                for figure_type, (value, rows) in self.parameters(theta).items()}
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def _evaluate(self, theta, k: float, gradient: bool):
+        count = len(self.data)
+        if not count:
+            raise ValueError("No positions to tune on")
+        penalty_slice = slice(len(self.figure_types), None)
+        total_loss = 0.0
+        total_gradient = np.zeros_like(theta) if gradient else None
+        weights = theta.astype(np.float32)
+        slope = np.float32(k * math.log(10) / 400)
+        for batch in self.data.iter_batches(self.batch_size):
+            x = features(batch["planes"])
+            target = (batch["outcome"].astype(np.float32) + 1) / 2
+            predicted = 1 / (1 + np.exp(-slope * (x @ weights)))
+            error = predicted - target
+            total_loss += float(error @ error)
+            if gradient:
+                total_gradient += x.T @ (2 * error * predicted * (1 - predicted) * slope)
+        penalty = self.l2 * float(theta[penalty_slice] @ theta[penalty_slice])
+        if gradient:
+            total_gradient /= count
+            total_gradient[penalty_slice] += 2 * self.l2 * theta[penalty_slice]
+        return total_loss / count + penalty, total_gradient
+
+
+def load_parameters(path: str):
+    """Configures evaluation.py with parameters saved by TexelTuner.save.
+
+    Like set_figure_value, this must be done before boards are created.
+
+    Args:
+        path (str): The parameter file.
+    """
+    by_name = {figure_type.__name__: figure_type for figure_type in FIGURE_TYPES}
+    with open(path) as file:
+        data = json.load(file)
+    for name, entry in data.items():
+        if name not in by_name:
+            raise ValueError(f"Unknown figure type {name!r}")
+        set_figure_value(by_name[name], entry["value"], entry["rows"])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tune evaluation parameters on exported training data.")
+    parser.add_argument("directory", help="training data directory (see training_data.py)")
+    parser.add_argument("--steps", type=int, default=200, help="gradient steps")
+    parser.add_argument("--learning-rate", type=float, default=2.0, help="Adam step size")
+    parser.add_argument("--output", help="write the tuned parameters as JSON (see load_parameters)")
+    args = parser.parse_args()
+
+    def report(step, loss):
+        if step % 20 == 0:
+            print(f"step {step}: loss {loss:.6f}")
+
+    tuner = TexelTuner(TrainingData(args.directory))
+    start = tuner.initial_parameters()
+    print(f"k = {tuner.fit_k(start):.3f}, initial loss {tuner.loss(start):.6f}")
+    tuned = tuner.tune(start, args.steps, args.learning_rate, report)
+    print(f"final loss {tuner.loss(tuned):.6f}")
+    for index, figure_type in enumerate(tuner.figure_types):
+        print(f"{figure_type.__name__:>8}: {FIGURE_VALUES.get(figure_type, type_value(figure_type)):6d} -> "
+              f"{tuned[index]:8.1f}")
+    if args.output:
+        tuner.save(tuned, args.output)
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import os
+import queue
+import subprocess
+import sys
+import threading
+from typing import Iterable, Literal, TextIO
+
+from engine import MATE_BOUND, WIN_SCORE, ChessEngine, SearchResult
+from fen import FEN_LETTERS, START_FEN, parse_fen
+from field import GameField
+from figures import *
+from main import Move
+
+# A UCI (Universal Chess Interface) front-end for ChessEngine, so the engine can be driven by chess GUIs
+# and test harnesses: `python uci.py` speaks the protocol on stdin/stdout. Searches run on a worker thread
+# and the command loop keeps reading, so 'stop' and 'isready' are answered while the engine thinks.
+
+ENGINE_NAME = "ChessEngine"
+ENGINE_AUTHOR = "chess project contributors"
+
+#: The number of moves the remaining clock time is shared between when the GUI does not send movestogo.
+DEFAULT_MOVES_TO_GO = 30
+#: Seconds kept in reserve for communication on every move.
+MOVE_OVERHEAD = 0.05
+
+
+def apply_uci_move(field: GameField, move: str, color: Literal["black", "white"]):
+    """Plays a move in UCI notation (e.g. 'e2e4', 'e7e8q') on the board.
+
+    Castling is sent as a two-square King move and moves the rook as well; a promotion letter replaces the pawn,
+    and a pawn moving diagonally to an empty square captures en passant.
+
+    Args:
+        field (GameField): The game board.
+        move (str): The move.
+        color (Literal["black", "white"]): The side to move.
+
+    Raises:
+        ValueError: If the move cannot be read or no figure of the side stands on its start square.
+    """
+    move = move.lower()
+    start, end, promotion = move[:2], move[2:4], move[4:]
+    if (len(move) not in (4, 5) or not Move.check_syntax(move[:4])
+            or promotion and promotion.upper() not in FEN_LETTERS):
+        raise ValueError(f"Cannot read move {move!r}")
+    figure = field.get_figure(start)
+    if figure is None or figure.color != color:
+        raise ValueError(f"No {color} figure on {start} for move {move!r}")
+    if isinstance(figure, King) and start[0] == "e" and end[0] in "cg" and start[1] == end[1]:
+        rook_start, rook_end = ("h", "f") if end[0] == "g" else ("a", "d")
+        rook = field.get_figure(f"{rook_start}{start[1]}")
+        if isinstance(rook, Rook) and rook.color == color:
+            field.remove_figure(f"{rook_start}{start[1]}")
+            field.set_figure(f"{rook_end}{start[1]}", rook)
+    if isinstance(figure, Pawn) and start[0] != end[0] and field.get_figure(end) is None:
+        # En passant: the captured pawn stands beside the start square.
+        field.remove_figure(f"{end[0]}{start[1]}")
+    if promotion:
+        figure = FEN_LETTERS[promotion.upper()](color)
+    field.remove_figure(start)
+    field.set_figure(end, figure)
+
+
+def format_score(score: int) -> str:
+    """Return a score in UCI notation: 'cp <centipawns>' or 'mate <moves>' for a King capture."""
+    if score > MATE_BOUND:
+        return f"mate {(WIN_SCORE - score + 1) // 2}"
+    if score < -MATE_BOUND:
+        return f"mate -{(WIN_SCORE + score) // 2}"
+    return f"cp {score}"
+
+
+class UciEngine:
+    """The UCI command loop.
+
+    Attributes:
+        engine (ChessEngine): The engine searching the positions.
+        output (TextIO): The stream the responses are written to.
+        board (GameField): The position set by the last 'position' command.
+        color (Literal["black", "white"]): The side to move in that position.
+    """
+
+    def __init__(self, engine: ChessEngine = None, output: TextIO = None):
+        """Initializes a UciEngine.
+
+        Args:
+            engine (ChessEngine, optional): The engine. Defaults to a new ChessEngine.
+            output (TextIO, optional): The response stream. Defaults to sys.stdout.
+        """
+        self.engine = engine or ChessEngine()
+        self.output = output or sys.stdout
+        self.board, self.color = parse_fen(START_FEN)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._release = threading.Event()
+        self._ponder_budget: float | None = None
+
+    def send(self, line: str):
+        """Writes one response line; safe to call from the search thread."""
+        with self._lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, stream: Iterable[str] = None):
+        """Reads commands until 'quit' or the end of the input.
+
+        Args:
+            stream (Iterable[str], optional): The command lines. Defaults to sys.stdin.
+        """
+        for line in stream or sys.stdin:
+            if not self.handle(line):
+                break
+        self._stop_search()
+
+    def handle(self, line: str) -> bool:
+        """Executes one command.
+
+        Args:
+            line (str): The command line.
+
+        Returns:
+            bool: False if the command was 'quit'.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self._stop_search()
+            self.engine.clear()
+        elif command == "position":
+            self._stop_search()
+            self._position(args)
+        elif command == "go":
+            self._stop_search()
+            self._go(args)
+        elif command == "stop":
+            self._stop_search()
+        elif command == "ponderhit":
+            self.engine.ponderhit(self._ponder_budget)
+            self._release.set()
+        elif command == "quit":
+            return False
+        else:
+            self.send(f"info string unknown command {command}")
+        return True
+
+    def _position(self, args: list[str]):
+        if "moves" in args:
+            split = args.index("moves")
+            setup, moves = args[:split], args[split + 1:]
+        else:
+            setup, moves = args, []
+        try:
+            if setup[:1] == ["startpos"]:
+                board, color = parse_fen(START_FEN)
+            elif setup[:1] == ["fen"]:
+                board, color = parse_fen(" ".join(setup[1:]))
+            else:
+                raise ValueError("position needs 'startpos' or 'fen'")
+            for move in moves:
+                apply_uci_move(board, move, color)
+                color = "black" if color == "white" else "white"
+        except ValueError as error:
+            self.send(f"info string {error}")
+            return
+        self.board, self.color = board, color
+
+    def _go(self, args: list[str]):
+        limits = {}
+        flags = set()
+        index = 0
+        while index < len(args):
+            name = args[index]
+            if name in ("infinite", "ponder"):
+                flags.add(name)
+                index += 1
+            elif index + 1 < len(args):
+                try:
+                    limits[name] = int(args[index + 1])
+                except ValueError:
+                    pass
+                index += 2
+            else:
+                index += 1
+
+        budget = self._budget(limits)
+        infinite = "infinite" in flags or "ponder" in flags or budget is None
+        self._ponder_budget = budget
+        self._release.clear()
+        if not ("infinite" in flags or "ponder" in flags):
+            self._release.set()
+        # The search gets its own board so a following 'position' command cannot disturb it.
+        board = GameField.from_snapshot(self.board.snapshot())
+        # The search state is reset here rather than on the thread, so a 'stop' or 'ponderhit' that follows
+        # immediately cannot be lost.
+        self.engine._begin(None if infinite else budget)
+        self._thread = threading.Thread(target=self._search, args=(board, self.color, limits.get("depth")),
+                                        daemon=True)
+        self._thread.start()
+
+    def _budget(self, limits: dict[str, int]) -> float | None:
+        if "movetime" in limits:
+            return max(limits["movetime"] / 1000 - MOVE_OVERHEAD, 0.01)
+        clock = limits.get("wtime" if self.color == "white" else "btime")
+        if clock is None:
+            return None if "depth" in limits else self.engine.time_limit
+        increment = limits.get("winc" if self.color == "white" else "binc", 0)
+        moves_to_go = max(limits.get("movestogo", DEFAULT_MOVES_TO_GO), 1)
+        budget = clock / 1000 / moves_to_go + increment / 1000 * 0.8
+        return max(min(budget, clock / 1000 / 2) - MOVE_OVERHEAD, 0.01)
+
+    def _search(self, board: GameField, color: str, depth: int | None):
+        result = self.engine._iterate(board, color, depth, self._info)
+        # In infinite and ponder mode the best move may only be sent after 'stop' or 'ponderhit'.
+        self._release.wait()
+        if result.move is None:
+            self.send("bestmove 0000")
+            return
+        line = f"bestmove {''.join(result.move)}"
+        if result.ponder is not None:
+            line += f" ponder {''.join(result.ponder)}"
+        self.send(line)
+
+    def _info(self, result: SearchResult):
+        millis = int(result.elapsed * 1000)
+        pv = " ".join("".join(move) for move in result.pv)
+        self.send(f"info depth {result.depth} score {format_score(result.score)} nodes {result.nodes} "
+                  f"nps {int(result.nps)} time {millis} pv {pv}")
+
+    def _stop_search(self):
+        if self._thread is not None:
+            self.engine.stop()
+            self._release.set()
+            self._thread.join()
+            self._thread = None
+
+
+class UciClient:
+    """A local harness that stands in for a GUI: it runs a UCI engine process and talks to it.
+
+    Attributes:
+        process (subprocess.Popen): The engine process.
+    """
+
+    def __init__(self, command: list[str] = None):
+        """Starts an engine process.
+
+        Args:
+            command (list[str], optional): The engine command line. Defaults to this module run by the
+                current interpreter.
+        """
+        if command is None:
+            command = [sys.executable, os.path.abspath(__file__)]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+                                        bufsize=1)
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def __enter__(self) -> UciClient:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self._lines.put(line.rstrip("\n"))
+        self._lines.put(None)
+
+    def send(self, command: str):
+        """Sends one command line to the engine."""
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def expect(self, prefix: str, timeout: float = 10.0) -> list[str]:
+        """Reads response lines until one starts with the prefix.
+
+        Args:
+            prefix (str): The awaited response, e.g. 'readyok' or 'bestmove'.
+            timeout (float, optional): Seconds to wait for each line. Defaults to 10.
+
+        Returns:
+            list[str]: All lines read, the awaited one last.
+
+        Raises:
+            TimeoutError: If no line arrives in time.
+            EOFError: If the engine exits first.
+        """
+        lines = []
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No {prefix!r} from the engine") from None
+            if line is None:
+                raise EOFError(f"The engine exited before {prefix!r}")
+            lines.append(line)
+            if line.startswith(prefix):
+                return lines
+
+    def handshake(self):
+        """Initializes the engine and waits until it is ready."""
+        self.send("uci")
+        self.expect("uciok")
+        self.send("isready")
+        self.expect("readyok")
+
+    def best_move(self, moves: list[str] = (), go: str = "movetime 500", fen: str = None) -> tuple[str, list[str]]:
+        """Sets a position and searches it.
+
+        Args:
+            moves (list[str], optional): The moves played from the position. Defaults to none.
+            go (str, optional): The arguments of the go command. Defaults to 'movetime 500'.
+            fen (str, optional): The position. Defaults to the starting position.
+
+        Returns:
+            tuple[str, list[str]]: The best move and the info lines sent during the search.
+        """
+        position = f"fen {fen}" if fen else "startpos"
+        self.send(f"position {position}" + (f" moves {' '.join(moves)}" if moves else ""))
+        self.send(f"go {go}")
+        lines = self.expect("bestmove", timeout=60)
+        return lines[-1].split()[1], [line for line in lines if line.startswith("info")]
+
+    def close(self):
+        """Asks the engine to quit and waits for the process to end."""
+        if self.process.poll() is None:
+            try:
+                self.send("quit")
+            except (BrokenPipeError, OSError):
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+if __name__ == "__main__":
+    UciEngine().run()